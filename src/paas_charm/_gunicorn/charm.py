@@ -4,10 +4,18 @@
 """The base charm class for all charms."""
 
 import logging
+import typing
 
+import ops
 from ops.pebble import ExecError, ExecProcess
 
-from paas_charm._gunicorn.webserver import GunicornWebserver, WebserverConfig, WorkerClassEnum
+from paas_charm._gunicorn.rolling_reload import RELOAD_NOTICE_KEY, RollingReload
+from paas_charm._gunicorn.webserver import (
+    WSGI_ONLY_FRAMEWORKS,
+    GunicornWebserver,
+    WebserverConfig,
+    WorkerClassEnum,
+)
 from paas_charm._gunicorn.workload_config import create_workload_config
 from paas_charm._gunicorn.wsgi_app import WsgiApp
 from paas_charm.app import App, WorkloadConfig
@@ -21,9 +29,65 @@ logger = logging.getLogger(__name__)
 class GunicornBase(PaasCharm):
     """Gunicorn-based charm service mixin."""
 
+    def __init__(self, framework: ops.Framework, framework_name: str) -> None:
+        """Initialize the instance.
+
+        Args:
+            framework: operator framework.
+            framework_name: framework name.
+        """
+        super().__init__(framework=framework, framework_name=framework_name)
+        self.framework.observe(
+            self.on[self._workload_config.container_name].pebble_custom_notice,
+            self._on_gunicorn_pebble_custom_notice,
+        )
+        self.framework.observe(self.on.update_status, self._on_gunicorn_update_status)
+
+    def restart(self, rerun_migrations: bool = False) -> None:
+        """Restart or start the service, then go on with a rolling reload in progress.
+
+        Args:
+            rerun_migrations: whether it is necessary to run the migrations again.
+        """
+        super().restart(rerun_migrations=rerun_migrations)
+        self._step_rolling_reload()
+
+    def _step_rolling_reload(self) -> None:
+        """Run the next step of a rolling reload of Gunicorn in progress.
+
+        Only the web units reload Gunicorn, the other units find no rolling reload in progress.
+        """
+        try:
+            RollingReload(self._container, self._workload_config).step()
+        except ops.pebble.ConnectionError:
+            logger.info("pebble in the %s container is not ready", self._workload_config.framework)
+
+    def _on_gunicorn_pebble_custom_notice(self, event: ops.PebbleCustomNoticeEvent) -> None:
+        """Run the next step of the rolling reload when a Gunicorn worker booted or exited.
+
+        Args:
+            event: the event that triggered this handler.
+        """
+        if event.notice.key == RELOAD_NOTICE_KEY:
+            self._step_rolling_reload()
+
+    def _on_gunicorn_update_status(self, _: ops.UpdateStatusEvent) -> None:
+        """Run the next step of a rolling reload whose notices were missed."""
+        self._step_rolling_reload()
+
     @property
     def _workload_config(self) -> WorkloadConfig:
-        """Return a WorkloadConfig instance."""
+        """Return a WorkloadConfig instance, built once per event handler."""
+        return typing.cast(
+            WorkloadConfig, self._hook_cached("workload_config", self._create_workload_config)
+        )
+
+    def _create_workload_config(self) -> WorkloadConfig:
+        """Create a new WorkloadConfig instance.
+
+        Returns:
+            New WorkloadConfig.
+        """
         paas_config = read_paas_config()
         return create_workload_config(
             framework_name=self._framework_name,
@@ -31,6 +95,12 @@ class GunicornBase(PaasCharm):
             state_dir=self._state_dir,
             tracing_enabled=bool(self._tracing and self._tracing.is_ready()),
             logging_format=paas_config.framework_logging_format,
+            services=paas_config.services,
+            environment_file=paas_config.environment_file,
+            peer_fqdns_file=paas_config.peer_fqdns_file,
+            peer_fqdns_signal=paas_config.peer_fqdns_signal,
+            unit_roles=self._unit_roles.allocation,
+            scheduler_shards=self._unit_roles.scheduler_shards,
         )
 
     def create_webserver_config(self) -> WebserverConfig:
@@ -53,17 +123,23 @@ class GunicornBase(PaasCharm):
             worker_class = WorkerClassEnum(webserver_config.worker_class)
         except ValueError as exc:
             logger.error(
-                "Only 'gevent' and 'sync' are allowed. %s",
+                "Only 'gevent', 'sync' and 'uvicorn' are allowed. %s",
                 doc_link,
             )
             raise CharmConfigInvalidError(
-                f"Only 'gevent' and 'sync' are allowed. {doc_link}"
+                f"Only 'gevent', 'sync' and 'uvicorn' are allowed. {doc_link}"
             ) from exc
 
         # If the worker_class = sync is the default.
         if worker_class is WorkerClassEnum.SYNC:
             return webserver_config
 
+        if worker_class is WorkerClassEnum.UVICORN:
+            if not self._check_uvicorn_package():
+                logger.error("uvicorn must be installed in the rock. %s", doc_link)
+                raise CharmConfigInvalidError(f"uvicorn must be installed in the rock. {doc_link}")
+            return webserver_config
+
         if not self._check_gevent_package():
             logger.error(
                 "gunicorn[gevent] must be installed in the rock. %s",
@@ -112,3 +188,24 @@ class GunicornBase(PaasCharm):
         except ExecError as cmd_error:
             logger.warning("gunicorn[gevent] install check failed: %s", cmd_error)
             return False
+
+    def _check_uvicorn_package(self) -> bool:
+        """Check that the Uvicorn worker is installed.
+
+        The frameworks serving a WSGI application also need asgiref to wrap it.
+
+        Returns:
+            True if the Uvicorn worker is installed.
+        """
+        modules = ["uvicorn.workers"]
+        if self._framework_name in WSGI_ONLY_FRAMEWORKS:
+            modules.append("asgiref.wsgi")
+        try:
+            check_uvicorn_process: ExecProcess = self._container.exec(
+                ["python3", "-c", f"import {', '.join(modules)}"]
+            )
+            check_uvicorn_process.wait_output()
+            return True
+        except ExecError as cmd_error:
+            logger.warning("uvicorn install check failed: %s", cmd_error)
+            return False
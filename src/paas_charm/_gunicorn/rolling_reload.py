@@ -0,0 +1,208 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Provide the RollingReload class to replace the Gunicorn workers in batches."""
+
+import json
+import logging
+import pathlib
+import signal
+import socket
+import time
+import typing
+
+import ops
+from ops.pebble import PathError
+
+from paas_charm._gunicorn.workload_config import STATSD_HOST
+from paas_charm.app import WorkloadConfig
+
+logger = logging.getLogger(__name__)
+
+RELOAD_NOTICE_KEY = "canonical.com/paas-charm/gunicorn-reload"
+# Path of the Pebble binary Juju mounts in the workload container.
+PEBBLE_PATH = "/charm/bin/pebble"
+# Maximum time in seconds for a batch of workers to boot or stop before Gunicorn is restarted.
+ROLLING_RELOAD_TIMEOUT = 120
+# Gunicorn queues at most 5 signals, keep one for the other senders.
+MAX_QUEUED_SIGNALS = 4
+RELOAD_DURATION_METRIC = "gunicorn.reload.duration"
+
+
+class RollingReload:
+    """Replace the workers of a reloaded Gunicorn in batches, one batch per hook.
+
+    The reload configuration only spawns a first batch of new workers next to the booted
+    ones. Each step then stops the oldest workers with TTOU or spawns a batch of new ones with
+    TTIN, and returns without waiting for them. The Gunicorn hooks mark the booted workers in
+    the booted workers directory and, during a rolling reload, record a Pebble notice when a
+    worker boots or exits, so the next step runs in the hook of the notice. The update-status
+    event and every reconcile also run a step, in case a notice is missed.
+
+    The progress is stored in the booted workers directory, so a reload interrupted by the
+    end of the hook goes on in the next one. Gunicorn removes it when it starts, since a new
+    arbiter runs the configured workers. Gunicorn is restarted if a batch does not boot or
+    stop in time, which restores the configured workers.
+
+    Attributes:
+        booted_workers_dir: Directory where the Gunicorn hooks mark the booted workers.
+        state_path: Path of the file storing the progress of the rolling reload.
+    """
+
+    def __init__(self, container: ops.Container, workload_config: WorkloadConfig):
+        """Initialize a new instance of the RollingReload class.
+
+        Args:
+            container: The workload container.
+            workload_config: The state of the workload.
+        """
+        self._container = container
+        self._workload_config = workload_config
+
+    @property
+    def booted_workers_dir(self) -> pathlib.Path:
+        """Directory where the Gunicorn hooks mark the booted workers by process ID."""
+        return self._workload_config.state_dir / "gunicorn-workers"
+
+    @property
+    def state_path(self) -> pathlib.Path:
+        """Path of the file storing the progress of the rolling reload."""
+        return self.booted_workers_dir / "rolling-reload.json"
+
+    def booted_workers(self) -> set[str]:
+        """Get the process IDs of the booted workers.
+
+        Returns:
+            The process IDs of the workers marked as booted by the Gunicorn hooks.
+        """
+        try:
+            return {
+                file_info.name
+                for file_info in self._container.list_files(self.booted_workers_dir)
+                if file_info.name.isdigit()
+            }
+        except (PathError, ops.pebble.APIError):
+            return set()
+
+    def start(self, old_workers: set[str], workers: int, batch: int) -> None:
+        """Record the start of a rolling reload, before Gunicorn is signaled to reload.
+
+        A rolling reload in progress is superseded, its workers are replaced by the new one.
+
+        Args:
+            old_workers: The process IDs of the workers booted before the reload.
+            workers: The number of workers of the reloaded configuration.
+            batch: The number of workers replaced at a time.
+        """
+        old_count = min(len(old_workers), workers)
+        self._write_state(
+            {
+                "old_workers": sorted(old_workers),
+                "old_count": old_count,
+                "new_count": workers + batch - old_count,
+                "workers": workers,
+                "batch": batch,
+                "started_at": time.time(),
+                "deadline": time.time() + ROLLING_RELOAD_TIMEOUT,
+            }
+        )
+
+    def cancel(self) -> None:
+        """Forget the rolling reload in progress, when Gunicorn replaces the workers at once."""
+        self._container.remove_path(self.state_path, recursive=True)
+
+    def step(self) -> None:
+        """Run the next step of the rolling reload in progress, if its last batch is done.
+
+        The duration of the rolling reload is sent to the StatsD exporter of the workload once
+        all the workers are replaced.
+        """
+        state = self._read_state()
+        if state is None:
+            return
+        service_name = self._workload_config.service_name
+        if not self._container.get_service(service_name).is_running():
+            # Gunicorn starts again with the configured workers.
+            self.cancel()
+            return
+        booted_workers = self.booted_workers()
+        old_workers = set(state["old_workers"])
+        if (
+            len(booted_workers & old_workers) != state["old_count"]
+            or len(booted_workers - old_workers) != state["new_count"]
+        ):
+            if time.time() > state["deadline"]:
+                logger.warning("rolling reload timed out, restarting gunicorn")
+                self._container.remove_path(self.state_path)
+                self._container.restart(service_name)
+            return
+        extra_count = state["old_count"] + state["new_count"] - state["workers"]
+        if extra_count > 0:
+            signal_count = min(extra_count, MAX_QUEUED_SIGNALS)
+            self._send_worker_signal(signal.SIGTTOU, signal_count)
+            stopped_old_count = min(signal_count, state["old_count"])
+            state["old_count"] -= stopped_old_count
+            state["new_count"] -= signal_count - stopped_old_count
+        elif state["old_count"]:
+            signal_count = min(state["batch"], state["old_count"], MAX_QUEUED_SIGNALS)
+            self._send_worker_signal(signal.SIGTTIN, signal_count)
+            state["new_count"] += signal_count
+        else:
+            self._container.remove_path(self.state_path)
+            logger.info("rolling reload completed")
+            send_reload_duration(time.time() - state["started_at"])
+            return
+        state["deadline"] = time.time() + ROLLING_RELOAD_TIMEOUT
+        self._write_state(state)
+
+    def _send_worker_signal(self, sig: signal.Signals, count: int) -> None:
+        """Send a signal changing the number of workers to Gunicorn several times.
+
+        Args:
+            sig: The TTIN or TTOU signal.
+            count: The number of signals to send.
+        """
+        for _ in range(count):
+            self._container.send_signal(sig, self._workload_config.service_name)
+
+    def _read_state(self) -> dict[str, typing.Any] | None:
+        """Read the progress of the rolling reload.
+
+        Returns:
+            The progress of the rolling reload, None if no rolling reload is in progress.
+        """
+        try:
+            return json.loads(self._container.pull(self.state_path).read())
+        except (PathError, json.JSONDecodeError):
+            return None
+
+    def _write_state(self, state: dict[str, typing.Any]) -> None:
+        """Store the progress of the rolling reload.
+
+        Args:
+            state: The progress of the rolling reload.
+        """
+        self._container.push(
+            self.state_path,
+            json.dumps(state),
+            make_dirs=True,
+            user=self._workload_config.user,
+            group=self._workload_config.group,
+        )
+
+
+def send_reload_duration(duration: float) -> None:
+    """Send the duration of a Gunicorn reload to the StatsD exporter of the workload.
+
+    The charm and the workload containers share the network of the pod.
+
+    Args:
+        duration: The duration of the reload in seconds.
+    """
+    host, _, port = str(STATSD_HOST).partition(":")
+    metric = f"{RELOAD_DURATION_METRIC}:{int(duration * 1000)}|ms"
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as statsd_socket:
+            statsd_socket.sendto(metric.encode(), (host, int(port)))
+    except OSError as exc:
+        logger.debug("failed to send %s: %s", RELOAD_DURATION_METRIC, exc)
@@ -5,29 +5,57 @@
 
 import dataclasses
 import datetime
+import functools
+import hashlib
+import json
 import logging
+import math
 import pathlib
 import shlex
 import signal
+import time
 import typing
 from enum import Enum
 
-import jinja2
 import ops
 from ops.pebble import ExecError, PathError
 
+from paas_charm._gunicorn.rolling_reload import (
+    PEBBLE_PATH,
+    RELOAD_NOTICE_KEY,
+    RollingReload,
+    send_reload_duration,
+)
 from paas_charm._gunicorn.workload_config import (
     APPLICATION_ERROR_LOG_FILE_FMT,
     APPLICATION_LOG_FILE_FMT,
     STATSD_HOST,
 )
 from paas_charm.app import WorkloadConfig
+from paas_charm.cgroup import (
+    available_cpus,
+    max_workers_for_memory,
+    read_memory_limit,
+    read_recorded_worker_memory,
+)
 from paas_charm.exceptions import CharmConfigInvalidError
 from paas_charm.paas_config import LoggingFormat
+from paas_charm.timing import timed_phase
 from paas_charm.utils import enable_pebble_log_forwarding
 
+if typing.TYPE_CHECKING:
+    import jinja2
+
 logger = logging.getLogger(__name__)
 
+AUTO_WORKERS = "auto"
+# Maximum number of threads per worker when the memory limit caps the number of workers.
+MAX_AUTO_THREADS = 4
+# Gunicorn worker class serving the ASGI application with Uvicorn.
+UVICORN_WORKER_CLASS = "uvicorn.workers.UvicornWorker"
+# Frameworks serving a WSGI application only, wrapped into an ASGI application for Uvicorn.
+WSGI_ONLY_FRAMEWORKS = ("flask",)
+
 
 class WorkerClassEnum(str, Enum):
     """Enumeration class defining async modes.
@@ -35,6 +63,7 @@ class WorkerClassEnum(str, Enum):
     Attributes:
         SYNC (str): String representation of worker class.
         GEVENT (Enum): Enumeration representation of worker class.
+        UVICORN (Enum): Enumeration representation of worker class, serving the ASGI application.
 
     Args:
         str (str): String representation of worker class.
@@ -43,42 +72,156 @@ class WorkerClassEnum(str, Enum):
 
     SYNC = "sync"
     GEVENT = "gevent"
+    UVICORN = "uvicorn"
+
+
+class WebserverProfileEnum(str, Enum):
+    """Enumeration class defining the webserver tuning profiles.
+
+    Attributes:
+        LATENCY: Keep the workers and favour short queues for low response times.
+        THROUGHPUT: Accept more connections and recycle the workers for sustained load.
+        LOW_MEMORY: Accept fewer connections and recycle the workers often to bound memory.
+        CUSTOM: Only the settings configured individually.
+    """
+
+    LATENCY = "latency"
+    THROUGHPUT = "throughput"
+    LOW_MEMORY = "low-memory"
+    CUSTOM = "custom"
+
+
+# Gunicorn settings of each webserver profile, the individual settings override them.
+# The worker heartbeat file is kept in memory to avoid stalls on overlay filesystems.
+WEBSERVER_PROFILES: dict[WebserverProfileEnum, dict[str, int | bool | str]] = {
+    WebserverProfileEnum.LATENCY: {
+        "backlog": 1024,
+        "worker_connections": 1000,
+        "graceful_timeout": 30,
+        "reuse_port": True,
+        "sendfile": True,
+        "worker_tmp_dir": "/dev/shm",  # nosec: B108
+    },
+    WebserverProfileEnum.THROUGHPUT: {
+        "backlog": 4096,
+        "worker_connections": 2000,
+        "graceful_timeout": 30,
+        "max_requests": 10000,
+        "max_requests_jitter": 1000,
+        "reuse_port": True,
+        "sendfile": True,
+        "worker_tmp_dir": "/dev/shm",  # nosec: B108
+    },
+    WebserverProfileEnum.LOW_MEMORY: {
+        "backlog": 512,
+        "worker_connections": 250,
+        "graceful_timeout": 20,
+        "max_requests": 1000,
+        "max_requests_jitter": 100,
+        "reuse_port": False,
+        "sendfile": True,
+        "worker_tmp_dir": "/dev/shm",  # nosec: B108
+        "preload_app": True,
+        "malloc_arena_max": 2,
+    },
+    WebserverProfileEnum.CUSTOM: {},
+}
+
+# Settings of the webserver profiles, with the type of their configuration option.
+_INT_SETTINGS = (
+    "backlog",
+    "worker_connections",
+    "max_requests",
+    "max_requests_jitter",
+    "limit_request_line",
+    "limit_request_fields",
+    "limit_request_field_size",
+    "malloc_arena_max",
+    "reload_batch",
+)
+_BOOL_SETTINGS = ("reuse_port", "sendfile", "preload_app")
+# Settings that are not Gunicorn settings, not rendered in the Gunicorn configuration.
+_NON_GUNICORN_SETTINGS = ("worker_class", "malloc_arena_max", "reload_batch")
+# Garbage collector thresholds of the workers of a preloaded application.
+PRELOAD_GC_THRESHOLDS = (10000, 50, 100)
+# The workers are replaced in batches on reload from this number of workers, in this many rounds.
+ROLLING_RELOAD_MIN_WORKERS = 3
+ROLLING_RELOAD_ROUNDS = 4
 
 
 @dataclasses.dataclass
-class WebserverConfig:
+class WebserverConfig:  # pylint: disable=too-many-instance-attributes
     """Represent the configuration values for a web server.
 
     Attributes:
-        workers: The number of workers to use for the web server, or None if not specified.
+        workers: The number of workers to use for the web server, ``auto`` to size the workers
+            and threads from the container resources, or None if not specified.
         worker_class: The method of workers to use for the web server, or sync if not specified.
         threads: The number of threads per worker to use for the web server,
             or None if not specified.
         keepalive: The time to wait for requests on a Keep-Alive connection,
             or None if not specified.
         timeout: The request silence timeout for the web server, or None if not specified.
+        profile: The tuning profile the settings below come from, or None if not specified.
+        backlog: The maximum number of pending connections, or None if not specified.
+        worker_connections: The maximum number of connections of an async worker,
+            or None if not specified.
+        graceful_timeout: The time the workers have to finish their requests on restart,
+            or None if not specified.
+        max_requests: The number of requests after which a worker is restarted,
+            or None if not specified.
+        max_requests_jitter: The maximum random number of requests added to max_requests,
+            or None if not specified.
+        reuse_port: Whether to bind with SO_REUSEPORT, or None if not specified.
+        sendfile: Whether to send the files with sendfile, or None if not specified.
+        limit_request_line: The maximum size of the request line, or None if not specified.
+        limit_request_fields: The maximum number of request headers, or None if not specified.
+        limit_request_field_size: The maximum size of a request header,
+            or None if not specified.
+        worker_tmp_dir: The directory of the worker heartbeat files, or None if not specified.
+        preload_app: Whether to load the application before forking the workers and freeze
+            its objects to share their memory pages, or None if not specified.
+        malloc_arena_max: The maximum number of glibc malloc arenas of threaded workers,
+            or None if not specified.
+        reload_batch: The number of workers replaced at a time on reload, 0 to replace them
+            all at once, or None to replace them in batches from 3 workers.
     """
 
-    workers: int | None = None
+    workers: int | typing.Literal["auto"] | None = None
     worker_class: WorkerClassEnum | None = WorkerClassEnum.SYNC
     threads: int | None = None
     keepalive: datetime.timedelta | None = None
     timeout: datetime.timedelta | None = None
+    profile: WebserverProfileEnum | None = None
+    backlog: int | None = None
+    worker_connections: int | None = None
+    graceful_timeout: datetime.timedelta | None = None
+    max_requests: int | None = None
+    max_requests_jitter: int | None = None
+    reuse_port: bool | None = None
+    sendfile: bool | None = None
+    limit_request_line: int | None = None
+    limit_request_fields: int | None = None
+    limit_request_field_size: int | None = None
+    worker_tmp_dir: str | None = None
+    preload_app: bool | None = None
+    malloc_arena_max: int | None = None
+    reload_batch: int | None = None
 
     def items(
         self,
-    ) -> typing.Iterable[tuple[str, str | WorkerClassEnum | int | datetime.timedelta | None]]:
-        """Return the dataclass values as an iterable of the key-value pairs.
+    ) -> typing.Iterable[
+        tuple[str, str | bool | WorkerClassEnum | int | datetime.timedelta | None]
+    ]:
+        """Return the Gunicorn settings as an iterable of the key-value pairs.
 
         Returns:
             An iterable of the key-value pairs.
         """
         return {
-            "workers": self.workers,
-            "worker_class": self.worker_class,
-            "threads": self.threads,
-            "keepalive": self.keepalive,
-            "timeout": self.timeout,
+            field.name: getattr(self, field.name)
+            for field in dataclasses.fields(self)
+            if field.name != "profile"
         }.items()
 
     @classmethod
@@ -87,19 +230,51 @@ class WebserverConfig:
     ) -> "WebserverConfig":
         """Create a WebserverConfig object from a charm state object.
 
+        The settings of the ``webserver-profile`` are overridden by the ones configured
+        individually, as in ``webserver-max-requests``.
+
         Args:
             config: The charm config as a dict.
 
         Returns:
             A WebserverConfig object.
+
+        Raises:
+            CharmConfigInvalidError: if webserver-workers is neither a number nor auto, or if
+                the profile or its settings are not valid.
         """
         keepalive = config.get("webserver-keepalive")
         timeout = config.get("webserver-timeout")
         workers = config.get("webserver-workers")
         worker_class = config.get("webserver-worker-class")
         threads = config.get("webserver-threads")
-        return cls(
-            workers=int(typing.cast(str, workers)) if workers is not None else None,
+        if workers is not None and workers != AUTO_WORKERS:
+            try:
+                workers = int(typing.cast(str, workers))
+            except ValueError as exc:
+                raise CharmConfigInvalidError(
+                    "webserver-workers must be a number or auto"
+                ) from exc
+        profile = None
+        if config.get("webserver-profile"):
+            try:
+                profile = WebserverProfileEnum(config["webserver-profile"])
+            except ValueError as exc:
+                raise CharmConfigInvalidError(
+                    "webserver-profile must be one of: "
+                    + ", ".join(profile.value for profile in WebserverProfileEnum)
+                ) from exc
+        settings: dict[str, WorkerClassEnum | int | float | str | bool] = (
+            dict(WEBSERVER_PROFILES[profile]) if profile is not None else {}
+        )
+        for setting in (*_INT_SETTINGS, *_BOOL_SETTINGS, "graceful_timeout", "worker_tmp_dir"):
+            value = config.get(f"webserver-{setting.replace('_', '-')}")
+            if value is not None and value != "":
+                settings[setting] = value
+        graceful_timeout = settings.get("graceful_timeout")
+        worker_tmp_dir = settings.get("worker_tmp_dir")
+        webserver_config = cls(
+            workers=typing.cast(int | typing.Literal["auto"] | None, workers),
             worker_class=(
                 typing.cast(WorkerClassEnum, worker_class) if worker_class is not None else None
             ),
@@ -108,11 +283,127 @@ class WebserverConfig:
                 datetime.timedelta(seconds=int(keepalive)) if keepalive is not None else None
             ),
             timeout=(datetime.timedelta(seconds=int(timeout)) if timeout is not None else None),
+            profile=profile,
+            graceful_timeout=(
+                datetime.timedelta(seconds=int(graceful_timeout))
+                if graceful_timeout is not None
+                else None
+            ),
+            backlog=_int_setting(settings, "backlog"),
+            worker_connections=_int_setting(settings, "worker_connections"),
+            max_requests=_int_setting(settings, "max_requests"),
+            max_requests_jitter=_int_setting(settings, "max_requests_jitter"),
+            reuse_port=_bool_setting(settings, "reuse_port"),
+            sendfile=_bool_setting(settings, "sendfile"),
+            limit_request_line=_int_setting(settings, "limit_request_line"),
+            limit_request_fields=_int_setting(settings, "limit_request_fields"),
+            limit_request_field_size=_int_setting(settings, "limit_request_field_size"),
+            worker_tmp_dir=str(worker_tmp_dir) if worker_tmp_dir is not None else None,
+            preload_app=_bool_setting(settings, "preload_app"),
+            malloc_arena_max=_int_setting(settings, "malloc_arena_max"),
+            reload_batch=_int_setting(settings, "reload_batch"),
         )
+        webserver_config.validate()
+        return webserver_config
+
+    def validate(self) -> None:
+        """Check that the settings are consistent.
+
+        Raises:
+            CharmConfigInvalidError: if the settings are not valid.
+        """
+        for setting in _INT_SETTINGS:
+            value = getattr(self, setting)
+            if value is not None and value < 0:
+                raise CharmConfigInvalidError(
+                    f"webserver-{setting.replace('_', '-')} must not be negative"
+                )
+        if self.max_requests_jitter and not self.max_requests:
+            raise CharmConfigInvalidError(
+                "webserver-max-requests-jitter requires webserver-max-requests"
+            )
+        if self.max_requests_jitter and self.max_requests_jitter >= typing.cast(
+            int, self.max_requests
+        ):
+            raise CharmConfigInvalidError(
+                "webserver-max-requests-jitter must be lower than webserver-max-requests"
+            )
+        if self.worker_tmp_dir is not None and not self.worker_tmp_dir.startswith("/"):
+            raise CharmConfigInvalidError("webserver-worker-tmp-dir must be an absolute path")
+
+
+def _int_setting(
+    settings: typing.Mapping[str, WorkerClassEnum | int | float | str | bool], setting: str
+) -> int | None:
+    """Read an integer webserver setting.
+
+    Args:
+        settings: The webserver settings of the profile and of the configuration options.
+        setting: The name of the setting.
+
+    Returns:
+        The value of the setting, or None if not specified.
+    """
+    value = settings.get(setting)
+    return int(value) if value is not None else None
+
+
+def _bool_setting(
+    settings: typing.Mapping[str, WorkerClassEnum | int | float | str | bool], setting: str
+) -> bool | None:
+    """Read a boolean webserver setting.
+
+    Args:
+        settings: The webserver settings of the profile and of the configuration options.
+        setting: The name of the setting.
+
+    Returns:
+        The value of the setting, or None if not specified.
+    """
+    value = settings.get(setting)
+    return bool(value) if value is not None else None
+
+
+def size_workers(
+    cpus: int, memory_limit: int | None, worker_memory: int, worker_class: WorkerClassEnum
+) -> tuple[int, int | None]:
+    """Compute the number of Gunicorn workers and threads for the container resources.
+
+    Sync workers handle one request at a time, so there are two per CPU plus one. Gevent and
+    Uvicorn workers handle many requests each, so there is one per CPU plus one. If the memory
+    limit does not fit that many workers, sync workers get threads to keep the same concurrency.
+
+    Args:
+        cpus: the number of CPUs available to the container.
+        memory_limit: the memory limit of the container in bytes, None if unlimited.
+        worker_memory: the memory of a worker in bytes.
+        worker_class: the worker class.
+
+    Returns:
+        The number of workers and the number of threads per worker, None for the default.
+    """
+    is_async = worker_class in (WorkerClassEnum.GEVENT, WorkerClassEnum.UVICORN)
+    if is_async:
+        workers = cpus + 1
+    else:
+        workers = 2 * cpus + 1
+    threads = None
+    max_workers = max_workers_for_memory(memory_limit, worker_memory)
+    if max_workers is not None and max_workers < workers:
+        if not is_async:
+            threads = min(MAX_AUTO_THREADS, math.ceil(workers / max_workers))
+        workers = max_workers
+    return workers, threads
 
 
 class GunicornWebserver:  # pylint: disable=too-few-public-methods
-    """A class representing a Gunicorn web server."""
+    """A class representing a Gunicorn web server.
+
+    Attributes:
+        webserver_config: The webserver configuration, with the automatic sizing resolved.
+        reload_batch: The number of workers replaced at a time on reload, 0 to replace them
+            all at once.
+    """
 
     def __init__(
         self,
@@ -131,20 +422,79 @@ class GunicornWebserver:  # pylint: disable=too-few-public-methods
         self._workload_config = workload_config
         self._container = container
         self._reload_signal = signal.SIGHUP
+        self._rolling_reload = RollingReload(container, workload_config)
+        self._sized_webserver_config: WebserverConfig | None = None
+        self._rendered_config: str | None = None
+
+    @property
+    def webserver_config(self) -> WebserverConfig:
+        """The webserver configuration, with the automatic sizing resolved.
+
+        The container resources are read once for this GunicornWebserver instance.
+        """
+        if self._sized_webserver_config is None:
+            self._sized_webserver_config = self._webserver_config
+            if self._webserver_config.workers == AUTO_WORKERS:
+                self._sized_webserver_config = self._auto_size()
+        return self._sized_webserver_config
+
+    @property
+    def _workers(self) -> int:
+        """The number of workers, Gunicorn runs one worker if not specified."""
+        return typing.cast(int | None, self.webserver_config.workers) or 1
+
+    @property
+    def reload_batch(self) -> int:
+        """The number of workers replaced at a time on reload, 0 to replace them all at once."""
+        if self.webserver_config.reload_batch is not None:
+            return self.webserver_config.reload_batch
+        if self._workers < ROLLING_RELOAD_MIN_WORKERS:
+            return 0
+        return max(1, self._workers // ROLLING_RELOAD_ROUNDS)
+
+    def _auto_size(self) -> WebserverConfig:
+        """Size the workers and threads from the CPU quota and the memory limit.
+
+        The memory of a worker is the one recorded in the state directory after the last
+        restart, it is not measured while rendering the configuration.
+
+        Returns:
+            The webserver configuration with the workers and threads sized.
+        """
+        workers, threads = size_workers(
+            cpus=available_cpus(self._container),
+            memory_limit=read_memory_limit(self._container),
+            worker_memory=read_recorded_worker_memory(
+                self._container, self._workload_config.state_dir
+            ),
+            worker_class=self._webserver_config.worker_class or WorkerClassEnum.SYNC,
+        )
+        logger.info("gunicorn automatic sizing: %s workers, %s threads", workers, threads)
+        return dataclasses.replace(
+            self._webserver_config,
+            workers=workers,
+            threads=self._webserver_config.threads or threads,
+        )
 
     @property
     def _config(self) -> str:
+        """The content of the Gunicorn configuration file, rendered once for this instance."""
+        if self._rendered_config is None:
+            self._rendered_config = self._render_config()
+        return self._rendered_config
+
+    def _render_config(self) -> str:
         """Generate the content of the Gunicorn configuration file based on charm states.
 
         Returns:
             The content of the Gunicorn configuration file.
         """
         config_entries = {}
-        for setting, setting_value in self._webserver_config.items():
+        for setting, setting_value in self.webserver_config.items():
             setting_value = typing.cast(
-                None | str | WorkerClassEnum | int | datetime.timedelta, setting_value
+                None | str | bool | WorkerClassEnum | int | datetime.timedelta, setting_value
             )
-            if setting == "worker_class":
+            if setting in _NON_GUNICORN_SETTINGS:
                 continue
             if setting_value is None:
                 continue
@@ -164,18 +514,45 @@ class GunicornWebserver:  # pylint: disable=too-few-public-methods
                 APPLICATION_ERROR_LOG_FILE_FMT.format(framework=self._workload_config.framework)
             )
 
-        jinja_environment = jinja2.Environment(
-            loader=jinja2.PackageLoader("paas_charm", "templates"), autoescape=True
-        )
-        config = jinja_environment.get_template("gunicorn.conf.py.j2").render(
+        is_uvicorn = self._webserver_config.worker_class == WorkerClassEnum.UVICORN
+        enable_json_logging = self._workload_config.logging_format == LoggingFormat.JSON
+        if enable_json_logging and is_uvicorn:
+            logger.warning(
+                "uvicorn workers do not add the HTTP attributes and the trace and span IDs "
+                "to the JSON access logs"
+            )
+        config = _gunicorn_config_template().render(
             workload_port=self._workload_config.port,
             workload_app_dir=str(self._workload_config.app_dir),
             access_log=access_log,
             error_log=error_log,
             statsd_host=str(STATSD_HOST),
             enable_tracing=self._workload_config.tracing_enabled,
-            enable_json_logging=self._workload_config.logging_format == LoggingFormat.JSON,
+            enable_json_logging=enable_json_logging,
+            enable_uvicorn=is_uvicorn,
+            preload_app=bool(self.webserver_config.preload_app),
+            booted_workers_dir=(
+                str(self._rolling_reload.booted_workers_dir) if self.reload_batch else None
+            ),
+            reload_batch=self.reload_batch,
+            reload_state_file=str(self._rolling_reload.state_path),
+            reload_notice_key=RELOAD_NOTICE_KEY,
+            pebble_path=PEBBLE_PATH,
+            workers=self._workers,
+            gc_thresholds=PRELOAD_GC_THRESHOLDS,
+            wrap_wsgi_to_asgi=is_uvicorn
+            and self._workload_config.framework in WSGI_ONLY_FRAMEWORKS,
             config_entries=config_entries,
+            environment_file=(
+                str(self._workload_config.environment_file_path)
+                if self._workload_config.environment_file is not None
+                else None
+            ),
+            environment_file_format=(
+                self._workload_config.environment_file.value
+                if self._workload_config.environment_file is not None
+                else None
+            ),
         )
         return config
 
@@ -188,33 +565,124 @@ class GunicornWebserver:  # pylint: disable=too-few-public-methods
         """
         return self._workload_config.base_dir / "gunicorn.conf.py"
 
+    @property
+    def _config_state_path(self) -> pathlib.Path:
+        """Path of the file storing the hashes of the applied and checked configuration."""
+        return self._workload_config.state_dir / "gunicorn-config.json"
+
+    def _read_config_state(self) -> dict[str, str]:
+        """Read the hashes of the configuration last applied and of the command last checked.
+
+        Returns:
+            The ``config`` and ``check`` hashes, empty if there are none.
+        """
+        try:
+            return json.loads(self._container.pull(self._config_state_path).read())
+        except (PathError, json.JSONDecodeError):
+            return {}
+
+    @timed_phase("gunicorn.update_config")
     def update_config(
         self, environment: dict[str, str], is_webserver_running: bool, command: str
     ) -> None:
         """Update and apply the configuration file of the web server.
 
+        The hashes of the applied configuration and of the checked configuration, environment
+        and command are stored in the state directory. An unchanged configuration is neither
+        pushed nor applied again. ``gunicorn --check-config``, which imports the application,
+        runs whenever the configuration, the environment or the command changed since the last
+        check, and is skipped only if none of them changed. The state directory does not
+        survive a new workload image, so the first configuration of a new application version
+        is always checked.
+
         Args:
             environment: Environment variables used to run the application.
             is_webserver_running: Indicates if the web server container is currently running.
             command: The WSGI application startup command.
+        """
+        config = self._config
+        config_state = self._read_config_state()
+        config_hash = hashlib.sha256(config.encode()).hexdigest()
+        check_hash = hashlib.sha256(
+            json.dumps(
+                {"config": config, "environment": environment, "command": command},
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+        config_changed = config_state.get("config") != config_hash
+        if not config_changed and config_state.get("check") == check_hash:
+            return
+        if config_changed:
+            self._push_config(config)
+        if config_state:
+            self._container.remove_path(self._config_state_path)
+        self._check_config(environment=environment, command=command)
+        self._container.push(
+            self._config_state_path,
+            json.dumps({"config": config_hash, "check": check_hash}),
+            make_dirs=True,
+        )
+        if config_changed and is_webserver_running:
+            logger.info("gunicorn config changed, reloading")
+            self.reload()
 
-        Raises:
-            CharmConfigInvalidError: if the charm configuration is not valid.
+    def _push_config(self, config: str) -> None:
+        """Validate the configuration in the charm and push it to the workload container.
+
+        Args:
+            config: The content of the Gunicorn configuration file.
         """
+        validate_gunicorn_config(config, str(self._config_path))
         self._prepare_log_dir()
-        webserver_config_path = str(self._config_path)
-        try:
-            current_webserver_config = self._container.pull(webserver_config_path)
-        except PathError:
-            current_webserver_config = None
+        if self.reload_batch and not self._container.exists(
+            self._rolling_reload.booted_workers_dir
+        ):
+            self._container.make_dir(
+                self._rolling_reload.booted_workers_dir,
+                make_parents=True,
+                user=self._workload_config.user,
+                group=self._workload_config.group,
+            )
         self._container.push(
-            webserver_config_path,
-            self._config,
+            self._config_path,
+            config,
             user=self._workload_config.user,
             group=self._workload_config.group,
         )
-        if current_webserver_config == self._config:
-            return
+
+    def reload(self) -> None:
+        """Reload the configuration and the workers of the running Gunicorn.
+
+        Gunicorn replaces all the workers at once on reload. With a reload batch, the
+        configuration only spawns a first batch of new workers, and the rolling reload replaces
+        the other workers a batch at a time in the next hooks, without waiting for them in this
+        one. The workers started by a configuration without reload batch are replaced at once.
+
+        The duration of the reload is sent to the StatsD exporter of the workload.
+        """
+        start = time.perf_counter()
+        with timed_phase("gunicorn.reload"):
+            booted_workers = self._rolling_reload.booted_workers() if self.reload_batch else set()
+            if booted_workers:
+                self._rolling_reload.start(booted_workers, self._workers, self.reload_batch)
+            else:
+                self._rolling_reload.cancel()
+            self._container.send_signal(self._reload_signal, self._workload_config.service_name)
+            if booted_workers:
+                self._rolling_reload.step()
+                return
+        send_reload_duration(time.perf_counter() - start)
+
+    def _check_config(self, environment: dict[str, str], command: str) -> None:
+        """Check the configuration and the application with ``gunicorn --check-config``.
+
+        Args:
+            environment: Environment variables used to run the application.
+            command: The WSGI application startup command.
+
+        Raises:
+            CharmConfigInvalidError: if the charm configuration is not valid.
+        """
         check_config_command = [x for x in shlex.split(command) if x not in ["[", "]"]]
         check_config_command.append("--check-config")
         exec_process = self._container.exec(
@@ -225,7 +693,8 @@ class GunicornWebserver:  # pylint: disable=too-few-public-methods
             working_dir=str(self._workload_config.app_dir),
         )
         try:
-            exec_process.wait_output()
+            with timed_phase("gunicorn.check_config"):
+                exec_process.wait_output()
         except ExecError as exc:
             logger.error(
                 "webserver configuration check failed, stdout: %s, stderr: %s",
@@ -236,9 +705,6 @@ class GunicornWebserver:  # pylint: disable=too-few-public-methods
                 "Webserver configuration check failed, "
                 "please review your charm configuration or database relation"
             ) from exc
-        if is_webserver_running:
-            logger.info("gunicorn config changed, reloading")
-            self._container.send_signal(self._reload_signal, self._workload_config.service_name)
 
     def _prepare_log_dir(self) -> None:
         """Prepare access and error log directory for the application."""
@@ -252,3 +718,37 @@ class GunicornWebserver:  # pylint: disable=too-few-public-methods
                     user=self._workload_config.user,
                     group=self._workload_config.group,
                 )
+
+
+@functools.cache
+def _gunicorn_config_template() -> "jinja2.Template":
+    """Compile the Gunicorn configuration template once per charm process.
+
+    Returns:
+        The compiled Gunicorn configuration template.
+    """
+    import jinja2  # pylint: disable=import-outside-toplevel
+
+    jinja_environment = jinja2.Environment(
+        loader=jinja2.PackageLoader("paas_charm", "templates"), autoescape=True
+    )
+    return jinja_environment.get_template("gunicorn.conf.py.j2")
+
+
+def validate_gunicorn_config(config: str, path: str) -> None:
+    """Validate the Gunicorn configuration file without running it.
+
+    Args:
+        config: The content of the Gunicorn configuration file.
+        path: The path of the Gunicorn configuration file, for the error message.
+
+    Raises:
+        CharmConfigInvalidError: if the configuration is not valid Python.
+    """
+    try:
+        compile(config, path, "exec")
+    except (SyntaxError, ValueError) as exc:
+        logger.error("invalid gunicorn configuration %s: %s", path, exc)
+        raise CharmConfigInvalidError(
+            "Webserver configuration is not valid, please review your charm configuration"
+        ) from exc
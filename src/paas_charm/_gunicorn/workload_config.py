@@ -6,7 +6,12 @@
 import pathlib
 
 from paas_charm.app import WorkloadConfig
-from paas_charm.paas_config import LoggingFormat
+from paas_charm.paas_config import (
+    EnvironmentFileFormat,
+    LoggingFormat,
+    ServiceConfig,
+    ServiceRole,
+)
 
 STATSD_HOST = "localhost:9125"
 APPLICATION_LOG_FILE_FMT = "/var/log/{framework}/access.log"
@@ -19,6 +24,12 @@ def create_workload_config(
     state_dir: pathlib.Path,
     tracing_enabled: bool = False,
     logging_format: LoggingFormat = LoggingFormat.NONE,
+    services: dict[str, ServiceConfig] | None = None,
+    environment_file: EnvironmentFileFormat | None = None,
+    peer_fqdns_file: bool = False,
+    peer_fqdns_signal: str | None = None,
+    unit_roles: dict[str, ServiceRole] | None = None,
+    scheduler_shards: dict[str, int] | None = None,
 ) -> WorkloadConfig:
     """Create an WorkloadConfig for Gunicorn.
 
@@ -28,6 +39,12 @@ def create_workload_config(
         state_dir: state folder directory.
         tracing_enabled: if True, tracing is enabled.
         logging_format: structured logging format; defaults to LoggingFormat.NONE.
+        services: configuration of the Pebble services, by service name.
+        environment_file: format of the environment file of the web service, if any.
+        peer_fqdns_file: if True, the peer FQDNs are delivered in a file.
+        peer_fqdns_signal: name of the signal sent when the peer FQDNs file changes.
+        unit_roles: role of every unit by unit name, if the units have dedicated roles.
+        scheduler_shards: shard index of every scheduler unit by unit name.
 
     Returns:
        new WorkloadConfig
@@ -49,4 +66,10 @@ def create_workload_config(
         unit_name=unit_name,
         tracing_enabled=tracing_enabled,
         logging_format=logging_format,
+        services=services or {},
+        environment_file=environment_file,
+        peer_fqdns_file=peer_fqdns_file,
+        peer_fqdns_signal=peer_fqdns_signal,
+        unit_roles=unit_roles or {},
+        scheduler_shards=scheduler_shards or {},
     )
@@ -5,17 +5,45 @@
 
 import logging
 import shlex
+from typing import Any
 
 import ops
 
-from paas_charm._gunicorn.webserver import GunicornWebserver
+from paas_charm._gunicorn.webserver import (
+    AUTO_WORKERS,
+    UVICORN_WORKER_CLASS,
+    GunicornWebserver,
+    WorkerClassEnum,
+)
 from paas_charm.app import App, WorkloadConfig
 from paas_charm.charm_state import CharmState
 from paas_charm.database_migration import DatabaseMigration
 from paas_charm.exceptions import CharmConfigInvalidError
+from paas_charm.paas_config import ServiceRole
 
 logger = logging.getLogger(__name__)
 
+MALLOC_ARENA_MAX_ENV = "MALLOC_ARENA_MAX"
+WSGI_APPLICATION_SUFFIX = ".wsgi:application"
+ASGI_APPLICATION_SUFFIX = ".asgi:application"
+
+
+def _asgi_application(argument: str) -> str:
+    """Point a Django WSGI application argument of the Gunicorn command to the ASGI one.
+
+    Django projects provide the ``application`` callable in both the ``wsgi`` and the ``asgi``
+    modules, other arguments are returned unchanged.
+
+    Args:
+        argument: An argument of the Gunicorn command.
+
+    Returns:
+        The argument, with the ASGI application module in place of the WSGI one.
+    """
+    if argument.endswith(WSGI_APPLICATION_SUFFIX):
+        return argument.removesuffix(WSGI_APPLICATION_SUFFIX) + ASGI_APPLICATION_SUFFIX
+    return argument
+
 
 class WsgiApp(App):
     """WSGI application manager."""
@@ -66,20 +94,79 @@ class WsgiApp(App):
                 " `-k` worker class argument is not in the service command."
             ) from exc
         worker_class_index = k_index + 1 if current_command[k_index + 1] != "[" else k_index + 2
-        if webserver._webserver_config.worker_class == current_command[worker_class_index]:
+        worker_class = webserver._webserver_config.worker_class
+        new_command = list(current_command)
+        if worker_class == WorkerClassEnum.UVICORN:
+            new_command[worker_class_index] = UVICORN_WORKER_CLASS
+            new_command = [_asgi_application(argument) for argument in new_command]
+        else:
+            new_command[worker_class_index] = worker_class
+        if new_command == current_command:
             return
-
-        new_command = current_command
-        new_command[worker_class_index] = webserver._webserver_config.worker_class
         self._alternate_service_command = " ".join(new_command)
 
+    def _generate_app_layer(self) -> ops.pebble.LayerDict:
+        """Generate the pebble layer definition, limiting the malloc arenas of threaded workers.
+
+        Returns:
+            The pebble layer definition for the application.
+        """
+        layer = super()._generate_app_layer()
+        webserver_config = self._webserver.webserver_config
+        if webserver_config.malloc_arena_max and (webserver_config.threads or 1) > 1:
+            service = layer["services"][self._workload_config.service_name]
+            service.setdefault("environment", {}).setdefault(
+                MALLOC_ARENA_MAX_ENV, str(webserver_config.malloc_arena_max)
+            )
+        return layer
+
+    def _reload_environment(self) -> None:
+        """Reload the environment file, restarting the web service if the app is preloaded.
+
+        The preloaded application is not loaded again on reload, so it would keep the
+        environment read at startup. Otherwise Gunicorn reloads its workers, in batches if
+        configured.
+        """
+        service_name = self._workload_config.service_name
+        if not self._container.get_service(service_name).is_running():
+            return
+        if self._webserver.webserver_config.preload_app:
+            logger.info("environment file changed, restarting preloaded %s", service_name)
+            self._container.restart(service_name)
+            return
+        logger.info("environment file changed, reloading %s", service_name)
+        self._webserver.reload()
+
+    @property
+    def _sizes_workers_automatically(self) -> bool:
+        """Whether the unit runs Gunicorn with the workers sized automatically."""
+        return self._webserver._webserver_config.workers == AUTO_WORKERS and (
+            self._workload_config.runs_role(ServiceRole.WEB)
+        )
+
+    def _restart_fingerprint_data(self) -> dict[str, Any]:
+        """Collect the inputs of the restart, including the webserver configuration.
+
+        Returns:
+            A JSON serializable dictionary with the restart inputs.
+        """
+        data = super()._restart_fingerprint_data()
+        if self._workload_config.runs_role(ServiceRole.WEB):
+            data["webserver_config"] = self._webserver._config
+        return data
+
     def _prepare_service_for_restart(self) -> None:
-        """Specific framework operations before restarting the service."""
+        """Specific framework operations before restarting the service.
+
+        The units that do not run the web service skip the Gunicorn configuration.
+        """
+        if not self._workload_config.runs_role(ServiceRole.WEB):
+            return
         service_name = self._workload_config.service_name
         is_webserver_running = self._container.get_service(service_name).is_running()
         command = self._app_layer()["services"][self._workload_config.framework]["command"]
         self._webserver.update_config(
-            environment=self.gen_environment(),
+            environment=self._app_environment(),
             is_webserver_running=is_webserver_running,
             command=command,
         )
@@ -4,18 +4,31 @@
 """Provide the base generic class to represent the application."""
 
 import collections
+import copy
+import dataclasses
+import hashlib
 import json
 import logging
 import pathlib
+import signal
 import urllib.parse
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Any, List
 
 import ops
+from ops.pebble import PathError
 
+from paas_charm.cgroup import WORKER_MEMORY_NOTICE_KEY, available_cpus
 from paas_charm.charm_state import CharmState
 from paas_charm.database_migration import DatabaseMigration
-from paas_charm.paas_config import LoggingFormat
+from paas_charm.paas_config import (
+    SERVICE_INTEGRATIONS,
+    EnvironmentFileFormat,
+    LoggingFormat,
+    ServiceConfig,
+    ServiceRole,
+)
+from paas_charm.timing import timed_phase
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +48,22 @@ WORKER_SUFFIX = "-worker"
 SCHEDULER_SUFFIX = "-scheduler"
 SCHEDULER_UNIT_NUMBER = "0"
 
+# Role of the services whose role is not declared, by service name suffix.
+SERVICE_ROLE_SUFFIXES: dict[str, ServiceRole] = {
+    WORKER_SUFFIX: ServiceRole.WORKER,
+    SCHEDULER_SUFFIX: ServiceRole.SCHEDULER,
+}
+
+# Environment variable giving the web service the path of its environment file.
+ENVIRONMENT_FILE_ENV = "PAAS_ENVIRONMENT_FILE"
+# Signal sent to the web service to reload its environment file.
+ENVIRONMENT_RELOAD_SIGNAL = signal.SIGHUP
+# Environment variable giving each replica of a worker service its index.
+REPLICA_INDEX_ENV = "PAAS_REPLICA_INDEX"
+# Environment variables giving the scheduler services their shard index and the shard count.
+SCHEDULER_SHARD_INDEX_ENV = "SCHEDULER_SHARD_INDEX"
+SCHEDULER_SHARD_COUNT_ENV = "SCHEDULER_SHARD_COUNT"
+
 
 @dataclass(kw_only=True)
 class WorkloadConfig:  # pylint: disable=too-many-instance-attributes
@@ -58,6 +87,22 @@ class WorkloadConfig:  # pylint: disable=too-many-instance-attributes
         unit_name: Name of the unit. Needed to know if schedulers should run here.
         tracing_enabled: True if tracing should be enabled.
         logging_format: Structured logging format to use; ``LoggingFormat.NONE`` for default.
+        services: Configuration of the Pebble services, by service name.
+        environment_file: format of the environment file of the web service, None to pass
+            the environment in the Pebble layer.
+        peer_fqdns_file: deliver the FQDNs of the peer units in a file instead of the
+            environment.
+        peer_fqdns_signal: name of the signal sent to the services consuming the peer FQDNs
+            file when it changes, None to send no signal.
+        unit_roles: Role of every unit by unit name, empty if the units have no dedicated
+            role and run all the services.
+        scheduler_shards: Shard index of every scheduler unit by unit name.
+        environment_file_path: path of the environment file of the web service.
+        peer_fqdns_file_path: path of the file listing the FQDNs of the peer units.
+        unit_role: role of the unit, None if the units have no dedicated role.
+        scheduler_shard: shard index and shard count of the schedulers of the unit, None if
+            the unit runs no scheduler.
+        scheduler_units: units running the schedulers, by shard index.
     """
 
     framework: str
@@ -75,6 +120,67 @@ class WorkloadConfig:  # pylint: disable=too-many-instance-attributes
     unit_name: str
     tracing_enabled: bool = False
     logging_format: LoggingFormat = LoggingFormat.NONE
+    services: dict[str, ServiceConfig] = dataclasses.field(default_factory=dict)
+    environment_file: EnvironmentFileFormat | None = None
+    peer_fqdns_file: bool = False
+    peer_fqdns_signal: str | None = None
+    unit_roles: dict[str, ServiceRole] = dataclasses.field(default_factory=dict)
+    scheduler_shards: dict[str, int] = dataclasses.field(default_factory=dict)
+
+    @property
+    def environment_file_path(self) -> pathlib.Path:
+        """Path of the environment file of the web service in the application container."""
+        suffix = "json" if self.environment_file == EnvironmentFileFormat.JSON else "env"
+        return self.state_dir / f"environment.{suffix}"
+
+    @property
+    def peer_fqdns_file_path(self) -> pathlib.Path:
+        """Path of the file listing the FQDNs of the peer units in the application container."""
+        return self.state_dir / "peer-fqdns"
+
+    @property
+    def unit_role(self) -> ServiceRole | None:
+        """Role of the unit, None if the units have no dedicated role.
+
+        A unit without allocated role yet is a web unit.
+        """
+        if not self.unit_roles:
+            return None
+        return self.unit_roles.get(self.unit_name, ServiceRole.WEB)
+
+    def runs_role(self, role: ServiceRole) -> bool:
+        """Return if the unit runs the web or worker services of a role.
+
+        Args:
+            role: the role of the services.
+
+        Return:
+            True if the unit has no dedicated role or the given role, False otherwise.
+        """
+        return self.unit_role in (None, role)
+
+    @property
+    def scheduler_shard(self) -> tuple[int, int] | None:
+        """Shard index and shard count of the schedulers of the unit, None if not scheduling.
+
+        The scheduler units run a shard of the scheduler processes each. Without scheduler
+        units, the unit 0 runs the only shard whatever its role.
+        """
+        if ServiceRole.SCHEDULER in self.unit_roles.values():
+            if self.unit_role != ServiceRole.SCHEDULER or self.unit_name not in (
+                self.scheduler_shards
+            ):
+                return None
+            return self.scheduler_shards[self.unit_name], len(self.scheduler_shards)
+        unit_id = self.unit_name.split("/")[1]
+        return (0, 1) if unit_id == SCHEDULER_UNIT_NUMBER else None
+
+    @property
+    def scheduler_units(self) -> list[str]:
+        """Units running the schedulers, by shard index, unit names or the unit number 0."""
+        if ServiceRole.SCHEDULER in self.unit_roles.values():
+            return list(self.scheduler_shards)
+        return [SCHEDULER_UNIT_NUMBER]
 
     def should_run_scheduler(self) -> bool:
         """Return if the unit should run scheduler processes.
@@ -82,8 +188,30 @@ class WorkloadConfig:  # pylint: disable=too-many-instance-attributes
         Return:
             True if the unit should run scheduler processes, False otherwise.
         """
-        unit_id = self.unit_name.split("/")[1]
-        return unit_id == SCHEDULER_UNIT_NUMBER
+        return self.scheduler_shard is not None
+
+    def service_role(self, service_name: str) -> ServiceRole | None:
+        """Get the role of a Pebble service of the workload.
+
+        The role declared in paas-config.yaml takes precedence, then the main service is the
+        web service and the other services get the role of their name suffix.
+
+        Args:
+            service_name: the name of the Pebble service.
+
+        Returns:
+            The role of the service, None if the service is not managed by the charm.
+        """
+        service_config = self.services.get(service_name)
+        if service_config is not None and service_config.role is not None:
+            return service_config.role
+        if service_name == self.service_name:
+            return ServiceRole.WEB
+        normalised_service_name = service_name.lower()
+        for suffix, role in SERVICE_ROLE_SUFFIXES.items():
+            if normalised_service_name.endswith(suffix):
+                return role
+        return None
 
 
 def generate_openfga_env(relation_data: "OpenfgaProviderAppData | None" = None) -> dict[str, str]:
@@ -361,8 +489,14 @@ class App:  # pylint: disable=too-many-instance-attributes
         generate_tempo_env: Maps tempo tracing connection information to environment variables.
         generate_prometheus_env: Maps prometheus connection information to environment variables.
         generate_oauth_env: Maps OAuth connection information to environment variables.
+        layer_environment_keys: environment variables kept in the Pebble layer of the web
+            service when its environment is delivered in a file, read before the process starts.
+        status_message: message of the active status of the charm, about the workload
+            configuration.
     """
 
+    layer_environment_keys: frozenset[str] = frozenset()
+
     generate_db_env = staticmethod(generate_db_env)
     generate_openfga_env = staticmethod(generate_openfga_env)
     generate_rabbitmq_env = staticmethod(generate_rabbitmq_env)
@@ -397,6 +531,10 @@ class App:  # pylint: disable=too-many-instance-attributes
             integrations_prefix: prefix for environment variables related to integrations.
         """
         self.__alternate_service_command: str | None = None
+        self._environment: dict[str, str] | None = None
+        self._original_services: dict[str, Any] | None = None
+        self._layer: ops.pebble.LayerDict | None = None
+        self._replicas: dict[str, int] = {}
         self._container = container
         self._charm_state = charm_state
         self._workload_config = workload_config
@@ -405,6 +543,14 @@ class App:  # pylint: disable=too-many-instance-attributes
         self.configuration_prefix = configuration_prefix
         self.integrations_prefix = integrations_prefix
 
+    @property
+    def status_message(self) -> str:
+        """Message of the active status of the charm, about the workload configuration."""
+        unit_role = self._workload_config.unit_role
+        if unit_role is None:
+            return ""
+        return f"{unit_role.value} unit"
+
     def stop_all_services(self) -> None:
         """Stop all the services in the workload.
 
@@ -414,13 +560,301 @@ class App:  # pylint: disable=too-many-instance-attributes
         service_names = list(services.keys())
         if service_names:
             self._container.stop(*service_names)
+        self._container.remove_path(self._restart_fingerprint_file, recursive=True)
+
+    @timed_phase("app.restart")
+    def restart(self, force: bool = False) -> None:
+        """Restart or start the service if not started with the latest configuration.
+
+        The restart is skipped if the restart fingerprint stored in the state directory matches
+        the current one, i.e. nothing applied to the workload changed since the last restart.
+        If only the environment file changed, the web service is signaled to reload it instead.
+
+        Args:
+            force: restart even if the restart fingerprint has not changed.
+        """
+        with timed_phase("app.fingerprint"):
+            fingerprint = self._restart_fingerprint()
+            current_fingerprint = self._read_restart_fingerprint()
+        environment_file_changed = False
+        if self._workload_config.environment_file is not None:
+            with timed_phase("app.environment_file"):
+                environment_file_changed = self._update_environment_file()
+        if self._workload_config.peer_fqdns_file:
+            with timed_phase("app.peer_fqdns_file"):
+                if self._update_peer_fqdns_file():
+                    self._signal_peer_fqdns_change()
+        if not force and current_fingerprint == fingerprint:
+            if environment_file_changed:
+                with timed_phase("app.migrations"):
+                    self._run_migrations()
+                self._reload_environment()
+            else:
+                logger.info("workload configuration has not changed, skipping restart")
+            return
+        if current_fingerprint is not None:
+            # Remove it first so an interrupted restart is retried in full next time.
+            self._container.remove_path(self._restart_fingerprint_file)
+        was_running = (
+            environment_file_changed
+            and self._container.get_service(self._workload_config.service_name).is_running()
+        )
+        layer = self._app_layer()
+        previous_replicas = self._read_replicas()
+        stale_replicas = self._stale_replicas(previous_replicas)
+        with timed_phase("app.add_layer"):
+            self._container.add_layer(
+                "charm",
+                ops.pebble.LayerDict(services={**layer["services"], **stale_replicas}),
+                combine=True,
+            )
+        with timed_phase("app.prepare_service"):
+            self._prepare_service_for_restart()
+        with timed_phase("app.migrations"):
+            self._run_migrations()
+        with timed_phase("app.replan"):
+            self._container.replan()
+        self._update_replicas(previous_replicas, stale_replicas)
+        if self._sizes_workers_automatically:
+            # The memory of the restarted workers is measured in a later hook, once they run.
+            self._container.pebble.notify(ops.pebble.NoticeType.CUSTOM, WORKER_MEMORY_NOTICE_KEY)
+        if was_running:
+            # The replan only restarts the web service if its Pebble definition changed.
+            self._reload_environment()
+        self._container.push(self._restart_fingerprint_file, fingerprint, make_dirs=True)
+
+    def is_restart_pending(self, force: bool = False) -> bool:
+        """Check if restart would restart the running web service.
+
+        Args:
+            force: whether the restart is forced even if the restart fingerprint is unchanged.
+
+        Returns:
+            True if the web service is running and the restart is not skipped.
+        """
+        service_name = self._workload_config.service_name
+        service = self._container.get_services(service_name).get(service_name)
+        if service is None or not service.is_running():
+            return False
+        return force or self._restart_fingerprint() != self._read_restart_fingerprint()
+
+    @property
+    def _restart_fingerprint_file(self) -> pathlib.Path:
+        """Path of the file storing the fingerprint of the last successful restart."""
+        return self._workload_config.state_dir / "restart-fingerprint"
+
+    @property
+    def _sizes_workers_automatically(self) -> bool:
+        """Whether the workers of the web service are sized from the recorded worker memory."""
+        return False
+
+    @property
+    def _replicas_file(self) -> pathlib.Path:
+        """Path of the file storing the number of replicas of the services at the last restart."""
+        return self._workload_config.state_dir / "replicas.json"
+
+    def _read_replicas(self) -> dict[str, int]:
+        """Read the number of replicas of the replicated services at the last restart.
+
+        Returns:
+            The number of replicas by service name, empty if no service was replicated.
+        """
+        try:
+            return json.loads(self._container.pull(self._replicas_file).read())
+        except PathError:
+            return {}
+
+    def _stale_replicas(self, previous_replicas: dict[str, int]) -> dict[str, Any]:
+        """Disable the replicas of the last restart that the current layer no longer defines.
+
+        The charm layer is combined with the previous one, so these replicas would keep running
+        when the number of replicas of a service is lowered.
+
+        Args:
+            previous_replicas: the number of replicas by service name at the last restart.
+
+        Returns:
+            The disabled definitions of the stale replicas, by service name.
+        """
+        original_services = self._read_original_services()
+        stale_replicas = {}
+        for service_name, previous_count in previous_replicas.items():
+            for index in range(self._replicas.get(service_name, 0), previous_count):
+                stale_replicas[f"{service_name}-{index}"] = {
+                    **original_services[service_name],
+                    "override": "replace",
+                    "startup": "disabled",
+                }
+        return stale_replicas
+
+    def _update_replicas(
+        self, previous_replicas: dict[str, int], stale_replicas: dict[str, Any]
+    ) -> None:
+        """Stop the stale replicas after the replan and record the current number of replicas.
+
+        Args:
+            previous_replicas: the number of replicas by service name at the last restart.
+            stale_replicas: the disabled definitions of the stale replicas, by service name.
+        """
+        if stale_replicas:
+            self._container.stop(*stale_replicas)
+        if self._replicas != previous_replicas:
+            self._container.push(self._replicas_file, json.dumps(self._replicas), make_dirs=True)
+
+    def _read_restart_fingerprint(self) -> str | None:
+        """Read the fingerprint of the last successful restart.
+
+        Returns:
+            The stored fingerprint, or None if there is none.
+        """
+        try:
+            return self._container.pull(self._restart_fingerprint_file).read()
+        except PathError:
+            return None
+
+    def _restart_fingerprint(self) -> str:
+        """Compute the fingerprint of everything the restart applies to the workload.
+
+        Returns:
+            The hex digest of the restart fingerprint data.
+        """
+        data = json.dumps(self._restart_fingerprint_data(), sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _restart_fingerprint_data(self) -> dict[str, Any]:
+        """Collect the inputs of the restart that can change during the container lifetime.
+
+        The Pebble layer covers the services, their commands and their environment. The
+        migration scripts come from the rock and the state directory does not survive the
+        container, so they are not part of the fingerprint. The environment delivered in the
+        environment file and the peer FQDNs delivered in the peer FQDNs file are compared with
+        the files instead.
+
+        Returns:
+            A JSON serializable dictionary with the restart inputs.
+        """
+        workload_config = dataclasses.asdict(self._workload_config)
+        # Only the role and the scheduler shard of this unit change its services.
+        del workload_config["unit_roles"]
+        del workload_config["scheduler_shards"]
+        return {
+            "workload_config": workload_config,
+            "unit_role": self._workload_config.unit_role,
+            "scheduler_shard": self._workload_config.scheduler_shard,
+            "layer": self._app_layer(),
+        }
+
+    def _environment_file_content(self) -> str:
+        """Render the application environment in the format of the environment file.
+
+        Returns:
+            The content of the environment file.
+        """
+        environment = self._service_environment(self._workload_config.service_name)
+        if self._workload_config.environment_file == EnvironmentFileFormat.JSON:
+            return json.dumps(environment, indent=2, sort_keys=True) + "\n"
+        return "".join(f"{k}={json.dumps(v)}\n" for k, v in sorted(environment.items()))
+
+    def _update_environment_file(self) -> bool:
+        """Write the application environment to the environment file if it changed.
 
-    def restart(self) -> None:
-        """Restart or start the service if not started with the latest configuration."""
-        self._container.add_layer("charm", self._app_layer(), combine=True)
-        self._prepare_service_for_restart()
-        self._run_migrations()
-        self._container.replan()
+        Pebble writes the pushed file to a temporary file renamed over the previous one, so
+        the application never reads a partially written environment file.
+
+        Returns:
+            True if the environment file changed.
+        """
+        path = self._workload_config.environment_file_path
+        content = self._environment_file_content()
+        try:
+            if self._container.pull(path).read() == content:
+                return False
+        except PathError:
+            pass
+        self._container.push(
+            path,
+            content,
+            make_dirs=True,
+            permissions=0o600,
+            user=self._workload_config.user,
+            group=self._workload_config.group,
+        )
+        return True
+
+    def _update_peer_fqdns_file(self) -> bool:
+        """Write the FQDNs of the peer units to the peer FQDNs file if they changed.
+
+        The file lists one FQDN per line. Like the environment file, it is replaced
+        atomically by Pebble.
+
+        Returns:
+            True if the peer FQDNs file changed.
+        """
+        path = self._workload_config.peer_fqdns_file_path
+        peer_fqdns = self._charm_state.peer_fqdns
+        content = "".join(f"{fqdn}\n" for fqdn in peer_fqdns.split(",")) if peer_fqdns else ""
+        try:
+            if self._container.pull(path).read() == content:
+                return False
+        except PathError:
+            pass
+        self._container.push(
+            path,
+            content,
+            make_dirs=True,
+            user=self._workload_config.user,
+            group=self._workload_config.group,
+        )
+        return True
+
+    def _signal_peer_fqdns_change(self) -> None:
+        """Signal the running services consuming the peer FQDNs file, if a signal is set."""
+        if self._workload_config.peer_fqdns_signal is None:
+            return
+        peer_fqdns_file_env = f"{self.configuration_prefix}PEER_FQDNS_FILE"
+        service_names = [
+            service_name
+            for service_name, service in self._app_layer()["services"].items()
+            if peer_fqdns_file_env in service.get("environment", {})
+            or (
+                ENVIRONMENT_FILE_ENV in service.get("environment", {})
+                and peer_fqdns_file_env in self._service_environment(service_name)
+            )
+        ]
+        if not service_names:
+            return
+        running_service_names = [
+            service_name
+            for service_name, service in self._container.get_services(*service_names).items()
+            if service.is_running()
+        ]
+        if not running_service_names:
+            return
+        logger.info("peer FQDNs changed, signaling %s", ", ".join(running_service_names))
+        self._container.send_signal(
+            self._workload_config.peer_fqdns_signal, *running_service_names
+        )
+
+    def _reload_environment(self) -> None:
+        """Signal the running web service to reload its environment file."""
+        service_name = self._workload_config.service_name
+        if not self._container.get_service(service_name).is_running():
+            return
+        logger.info("environment file changed, reloading %s", service_name)
+        self._container.send_signal(ENVIRONMENT_RELOAD_SIGNAL, service_name)
+
+    def _app_environment(self) -> dict[str, str]:
+        """Get the application environment, generated once for this App instance.
+
+        The App is created with the charm state of one restart, so the environment is reused
+        by the layer of every service, the migrations and the webserver configuration.
+
+        Returns:
+            A copy of the application environment variables.
+        """
+        if self._environment is None:
+            self._environment = self.gen_environment()
+        return dict(self._environment)
 
     # 2024/04/25 - we're refactoring this method which will get rid of map_integrations_to_env
     # wrapper function. Ignore too-complex error from flake8 for now.
@@ -471,7 +905,9 @@ class App:  # pylint: disable=too-many-instance-attributes
                 env[proxy_variable] = str(proxy_value)
                 env[proxy_variable.upper()] = str(proxy_value)
 
-        if self._charm_state.peer_fqdns is not None:
+        if self._workload_config.peer_fqdns_file:
+            env[f"{prefix}PEER_FQDNS_FILE"] = str(self._workload_config.peer_fqdns_file_path)
+        elif self._charm_state.peer_fqdns is not None:
             env[f"{prefix}PEER_FQDNS"] = self._charm_state.peer_fqdns
 
         env.update(self._generate_integration_environments(prefix=self.integrations_prefix))
@@ -484,28 +920,78 @@ class App:  # pylint: disable=too-many-instance-attributes
             Environment variable mappings for each relation data.
         """
         env: dict[str, str] = {}
-        env.update(self.generate_openfga_env(relation_data=self._charm_state.integrations.openfga))
-        env.update(
-            self.generate_rabbitmq_env(relation_data=self._charm_state.integrations.rabbitmq)
-        )
-        env.update(self.generate_redis_env(relation_data=self._charm_state.integrations.redis))
-        env.update(self.generate_s3_env(relation_data=self._charm_state.integrations.s3))
-        for (
-            database_name,
-            db_relation_data,
-        ) in self._charm_state.integrations.databases_relation_data.items():
-            env.update(self.generate_db_env(database_name, db_relation_data))
-        env.update(self.generate_saml_env(relation_data=self._charm_state.integrations.saml))
-        env.update(self.generate_smtp_env(relation_data=self._charm_state.integrations.smtp))
-        env.update(self.generate_tempo_env(relation_data=self._charm_state.integrations.tracing))
-        env.update(self.generate_prometheus_env(self._workload_config))
-        env.update(
-            self.generate_oauth_env(
-                framework=self._workload_config.framework,
-                relation_data=self._charm_state.integrations.oauth,
-            )
+        for integration_env in self._integration_environments(prefix=prefix).values():
+            env.update(integration_env)
+        return env
+
+    def _integration_environments(self, prefix: str = "") -> dict[str, dict[str, str]]:
+        """Generate environment variables from integration data, by integration name.
+
+        Args:
+            prefix: prefix of the environment variable names.
+
+        Returns:
+            Environment variable mappings for each integration, in the order they are applied.
+        """
+        integrations = self._charm_state.integrations
+        environments = {
+            "openfga": self.generate_openfga_env(relation_data=integrations.openfga),
+            "rabbitmq": self.generate_rabbitmq_env(relation_data=integrations.rabbitmq),
+            "redis": self.generate_redis_env(relation_data=integrations.redis),
+            "s3": self.generate_s3_env(relation_data=integrations.s3),
+        }
+        for database_name, db_relation_data in integrations.databases_relation_data.items():
+            environments[database_name] = self.generate_db_env(database_name, db_relation_data)
+        environments["saml"] = self.generate_saml_env(relation_data=integrations.saml)
+        environments["smtp"] = self.generate_smtp_env(relation_data=integrations.smtp)
+        environments["tracing"] = self.generate_tempo_env(relation_data=integrations.tracing)
+        environments["prometheus"] = self.generate_prometheus_env(self._workload_config)
+        environments["oauth"] = self.generate_oauth_env(
+            framework=self._workload_config.framework, relation_data=integrations.oauth
         )
-        return {prefix + k: v for (k, v) in env.items()}
+        return {
+            name: {prefix + k: v for (k, v) in env.items()} for name, env in environments.items()
+        }
+
+    def _service_environment(self, service_name: str) -> dict[str, str]:
+        """Get the environment of a service, without the variables it does not consume.
+
+        A service declaring the integrations or the configuration options it consumes in
+        paas-config.yaml only gets their environment variables, so a change of the others
+        leaves its definition unchanged and Pebble does not restart it on replan.
+
+        Args:
+            service_name: the name of the Pebble service.
+
+        Returns:
+            The environment variables of the service.
+        """
+        env = self._app_environment()
+        service_config = self._workload_config.services.get(service_name)
+        if service_config is None:
+            return env
+        excluded_keys: set[str] = set()
+        if service_config.integrations is not None:
+            for name, integration_env in self._integration_environments(
+                prefix=self.integrations_prefix
+            ).items():
+                if name in SERVICE_INTEGRATIONS and name not in service_config.integrations:
+                    excluded_keys.update(integration_env)
+            if "peer-fqdns" not in service_config.integrations:
+                excluded_keys.add(f"{self.configuration_prefix}PEER_FQDNS")
+                excluded_keys.add(f"{self.configuration_prefix}PEER_FQDNS_FILE")
+        if service_config.config is not None:
+            consumed_options = {option.replace("-", "_") for option in service_config.config}
+            for option, value in self._charm_state.user_defined_config.items():
+                if option in consumed_options:
+                    continue
+                option_env = f"{self.configuration_prefix}{option.upper()}"
+                excluded_keys.add(option_env)
+                if isinstance(value, collections.abc.Mapping):
+                    excluded_keys.update(
+                        f"{option_env}_{k.replace('-', '_').upper()}" for k in value
+                    )
+        return {k: v for k, v in env.items() if k not in excluded_keys}
 
     @property
     def _alternate_service_command(self) -> str | None:
@@ -516,6 +1002,7 @@ class App:  # pylint: disable=too-many-instance-attributes
     def _alternate_service_command(self, value: str | None) -> None:
         """Specific framework operations before starting the service."""
         self.__alternate_service_command = value
+        self._layer = None
 
     def _prepare_service_for_restart(self) -> None:
         """Specific framework operations before restarting the service."""
@@ -536,48 +1023,125 @@ class App:  # pylint: disable=too-many-instance-attributes
         if migration_command:
             self._database_migration.run(
                 command=migration_command,
-                environment=self.gen_environment(),
+                environment=self._app_environment(),
                 working_dir=app_dir,
                 user=self._workload_config.user,
                 group=self._workload_config.group,
             )
 
+    def _read_original_services(self) -> dict[str, Any]:
+        """Read the services of the rock, saved before the charm layer replaces them.
+
+        Returns:
+            A copy of the original services, read from the container once for this App instance.
+        """
+        if self._original_services is None:
+            original_services_file = self._workload_config.state_dir / "original-services.json"
+            if self._container.exists(original_services_file):
+                services = json.loads(self._container.pull(original_services_file).read())
+            else:
+                plan = self._container.get_plan()
+                services = {k: v.to_dict() for k, v in plan.services.items()}
+                self._container.push(original_services_file, json.dumps(services), make_dirs=True)
+            self._original_services = services
+        return copy.deepcopy(self._original_services)
+
     def _app_layer(self) -> ops.pebble.LayerDict:
         """Generate the pebble layer definition for the application.
 
+        The layer is generated once for this App instance, and again only if the service
+        command changes.
+
         Returns:
             The pebble layer definition for the application.
         """
-        original_services_file = self._workload_config.state_dir / "original-services.json"
-        if self._container.exists(original_services_file):
-            services = json.loads(self._container.pull(original_services_file).read())
-        else:
-            plan = self._container.get_plan()
-            services = {k: v.to_dict() for k, v in plan.services.items()}
-            self._container.push(original_services_file, json.dumps(services), make_dirs=True)
+        if self._layer is None:
+            self._layer = self._generate_app_layer()
+        return self._layer
 
+    def _generate_app_layer(self) -> ops.pebble.LayerDict:
+        """Generate the pebble layer definition for the application.
+
+        Returns:
+            The pebble layer definition for the application.
+        """
+        services = self._read_original_services()
+        self._replicas = {}
         services[self._workload_config.service_name]["override"] = "replace"
-        services[self._workload_config.service_name]["environment"] = self.gen_environment()
         if self._alternate_service_command:
             services[self._workload_config.service_name][
                 "command"
             ] = self._alternate_service_command
 
-        for service_name, service in services.items():
-            normalised_service_name = service_name.lower()
-            # Add environment variables to all worker processes.
-            if normalised_service_name.endswith(WORKER_SUFFIX):
-                service["environment"] = self.gen_environment()
+        for service_name, service in list(services.items()):
+            role = self._workload_config.service_role(service_name)
+            # The web process reads the environment file, if any.
+            if role == ServiceRole.WEB and self._workload_config.environment_file is not None:
+                service["environment"] = {
+                    k: v
+                    for k, v in self._service_environment(service_name).items()
+                    if k in self.layer_environment_keys
+                }
+                service["environment"][ENVIRONMENT_FILE_ENV] = str(
+                    self._workload_config.environment_file_path
+                )
+            # Add environment variables to the web and worker processes.
+            elif role in (ServiceRole.WEB, ServiceRole.WORKER):
+                service["environment"] = self._service_environment(service_name)
+            # Units with a dedicated role only run the web or worker processes of their role.
+            if role in (ServiceRole.WEB, ServiceRole.WORKER) and not (
+                self._workload_config.runs_role(role)
+            ):
+                service["startup"] = "disabled"
+            if role == ServiceRole.WORKER:
+                self._replicate_service(services, service_name)
             # For scheduler processes, add environment variables if
             # the scheduler should run in the unit, disable it otherwise.
-            if normalised_service_name.endswith(SCHEDULER_SUFFIX):
-                if self._workload_config.should_run_scheduler():
-                    service["environment"] = self.gen_environment()
+            if role == ServiceRole.SCHEDULER:
+                scheduler_shard = self._workload_config.scheduler_shard
+                if scheduler_shard is not None:
+                    shard_index, shard_count = scheduler_shard
+                    service["environment"] = {
+                        **self._service_environment(service_name),
+                        SCHEDULER_SHARD_INDEX_ENV: str(shard_index),
+                        SCHEDULER_SHARD_COUNT_ENV: str(shard_count),
+                    }
                 else:
                     service["startup"] = "disabled"
 
         return ops.pebble.LayerDict(services=services)
 
+    def _replicate_service(self, services: dict[str, Any], service_name: str) -> None:
+        """Replace a service by its replicas if more than one replica is configured.
+
+        The replicas are named after the service and their index, the service is disabled. The
+        number of replicas is recorded to disable the stale replicas on restart.
+
+        Args:
+            services: the services of the layer, updated in place.
+            service_name: the name of the service to replicate.
+        """
+        service_config = self._workload_config.services.get(service_name)
+        if service_config is None or service_config.replicas is None:
+            return
+        if service_config.replicas == "auto":
+            replicas = available_cpus(self._container)
+        else:
+            replicas = service_config.replicas
+        if replicas == 1:
+            return
+        service = services[service_name]
+        for index in range(replicas):
+            replica = copy.deepcopy(service)
+            replica["override"] = "replace"
+            replica["environment"] = {
+                **service.get("environment", {}),
+                REPLICA_INDEX_ENV: str(index),
+            }
+            services[f"{service_name}-{index}"] = replica
+        service["startup"] = "disabled"
+        self._replicas[service_name] = replicas
+
 
 def encode_env(value: str | int | float | bool | list | dict) -> str:
     """Encode the environment variable values.
@@ -0,0 +1,324 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Read the resource limits of the workload container from its cgroup v2 files."""
+
+import logging
+import math
+import os
+import pathlib
+import shlex
+
+import ops
+from ops.pebble import APIError, ExecError, PathError
+
+logger = logging.getLogger(__name__)
+
+CPU_MAX_PATH = "/sys/fs/cgroup/cpu.max"
+CPUSET_PATH = "/sys/fs/cgroup/cpuset.cpus.effective"
+MEMORY_MAX_PATH = "/sys/fs/cgroup/memory.max"
+PROCS_PATH = "/sys/fs/cgroup/cgroup.procs"
+PROC_STATUS_PATH_FMT = "/proc/{pid}/status"
+PROC_CMDLINE_PATH_FMT = "/proc/{pid}/cmdline"
+# Process ID of Pebble, the parent of the service processes.
+PEBBLE_PID = 1
+
+# Memory of a worker process assumed before the workload runs, in bytes.
+DEFAULT_WORKER_MEMORY = 128 * 1024 * 1024
+# The measured memory of a worker is rounded up to this granularity to keep the sizing stable.
+WORKER_MEMORY_GRANULARITY = 64 * 1024 * 1024
+# Fraction of the memory limit of the container available to the workers.
+WORKER_MEMORY_FRACTION = 0.8
+# File of the state directory storing the measured memory of a worker, in bytes.
+WORKER_MEMORY_FILE = "worker-memory"
+# Pebble notice recorded when the workload restarts, to measure its workers in a later hook.
+WORKER_MEMORY_NOTICE_KEY = "canonical.com/paas-charm/worker-memory"
+
+
+def _read_cgroup_file(container: ops.Container, path: str) -> str | None:
+    """Read a cgroup file of the workload container.
+
+    Args:
+        container: the workload container.
+        path: the path of the cgroup file.
+
+    Returns:
+        The content of the file, None if it does not exist.
+    """
+    try:
+        return container.pull(path).read()
+    except PathError:
+        logger.debug("%s not found", path)
+        return None
+
+
+def read_cpu_limit(container: ops.Container) -> float | None:
+    """Read the CPU quota of the workload container.
+
+    Args:
+        container: the workload container.
+
+    Returns:
+        The CPU quota in number of CPUs, None if the container has no CPU quota.
+    """
+    content = _read_cgroup_file(container, CPU_MAX_PATH)
+    if content is None:
+        return None
+    cpu_max = content.split()
+    try:
+        quota, period = cpu_max
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except ValueError:
+        logger.warning("invalid %s content: %s", CPU_MAX_PATH, cpu_max)
+        return None
+
+
+def available_cpus(container: ops.Container) -> int:
+    """Get the number of CPUs the workload container can use.
+
+    Args:
+        container: the workload container.
+
+    Returns:
+        The CPU quota rounded up, or the number of CPUs the workload container may run on
+        without CPU quota.
+    """
+    cpu_limit = read_cpu_limit(container)
+    if cpu_limit is None:
+        return read_cpu_count(container)
+    return max(1, math.ceil(cpu_limit))
+
+
+def read_cpu_count(container: ops.Container) -> int:
+    """Count the CPUs the workload container may run on.
+
+    The CPUs are read from the cpuset of the container, or counted by ``nproc`` in the
+    container if the cpuset controller is not enabled.
+
+    Args:
+        container: the workload container.
+
+    Returns:
+        The number of CPUs, the number of CPUs of the charm container if they cannot be
+        counted in the workload container.
+    """
+    content = _read_cgroup_file(container, CPUSET_PATH)
+    if content and content.strip():
+        try:
+            return parse_cpu_list(content)
+        except ValueError:
+            logger.warning("invalid %s content: %s", CPUSET_PATH, content)
+    try:
+        output, _ = container.exec(["nproc"]).wait_output()
+        return max(1, int(output))
+    except (APIError, ExecError, ValueError):
+        logger.warning("cannot count the CPUs of the workload container, using the charm's")
+        return os.cpu_count() or 1
+
+
+def parse_cpu_list(cpu_list: str) -> int:
+    """Count the CPUs of a cpuset list, such as ``0-3,6``.
+
+    Args:
+        cpu_list: the cpuset list.
+
+    Returns:
+        The number of CPUs of the list.
+    """
+    count = 0
+    for cpu_range in cpu_list.strip().split(","):
+        first, _, last = cpu_range.partition("-")
+        count += int(last or first) - int(first) + 1
+    return max(1, count)
+
+
+def read_memory_limit(container: ops.Container) -> int | None:
+    """Read the memory limit of the workload container.
+
+    Args:
+        container: the workload container.
+
+    Returns:
+        The memory limit in bytes, None if the container has no memory limit.
+    """
+    content = _read_cgroup_file(container, MEMORY_MAX_PATH)
+    if content is None or content.strip() == "max":
+        return None
+    try:
+        return int(content)
+    except ValueError:
+        logger.warning("invalid %s content: %s", MEMORY_MAX_PATH, content)
+        return None
+
+
+def _read_process_status(container: ops.Container, pid: str) -> dict[str, str]:
+    """Read the status of a process of the workload container.
+
+    Args:
+        container: the workload container.
+        pid: the ID of the process.
+
+    Returns:
+        The fields of the status by name, empty if the process exited.
+    """
+    try:
+        content = container.pull(PROC_STATUS_PATH_FMT.format(pid=pid)).read()
+    except (PathError, APIError):
+        return {}
+    status = {}
+    for line in content.splitlines():
+        name, _, value = line.partition(":")
+        status[name] = value.strip()
+    return status
+
+
+def _resident_memory(status: dict[str, str]) -> int | None:
+    """Get the resident memory of a process from its status.
+
+    Args:
+        status: the fields of the status of the process.
+
+    Returns:
+        The resident memory in bytes, None if the status has none.
+    """
+    value, _, unit = status.get("VmRSS", "").partition(" ")
+    if not value.isdigit() or unit.strip() != "kB":
+        return None
+    return int(value) * 1024
+
+
+def _read_process_args(container: ops.Container, pid: str) -> list[str]:
+    """Read the command line arguments of a process of the workload container.
+
+    Args:
+        container: the workload container.
+        pid: the ID of the process.
+
+    Returns:
+        The arguments of the process, empty if the process exited.
+    """
+    try:
+        content = container.pull(PROC_CMDLINE_PATH_FMT.format(pid=pid)).read()
+    except (PathError, APIError):
+        return []
+    return content.rstrip("\0").split("\0")
+
+
+def read_worker_memory(container: ops.Container, command: str) -> int | None:
+    """Measure the average resident memory of the worker processes of a service.
+
+    The main process of the service is the child of Pebble started with the command of the
+    service, its workers are its children. A service without children serves the requests
+    in its main process. The resident memory includes the memory the workers share with the
+    main process, which overestimates the memory of a worker.
+
+    Args:
+        container: the workload container.
+        command: the command of the service in the Pebble layer.
+
+    Returns:
+        The average resident memory of a worker in bytes, None if it cannot be measured.
+    """
+    procs = _read_cgroup_file(container, PROCS_PATH)
+    if procs is None:
+        return None
+    # Pebble appends the default arguments between brackets to the command.
+    args = shlex.split(command.partition(" [ ")[0])
+    statuses = {pid: _read_process_status(container, pid) for pid in procs.split()}
+    main_pid = next(
+        (
+            pid
+            for pid, status in statuses.items()
+            if status.get("PPid") == str(PEBBLE_PID)
+            and _read_process_args(container, pid)[: len(args)] == args
+        ),
+        None,
+    )
+    if main_pid is None:
+        return None
+    worker_statuses = [status for status in statuses.values() if status.get("PPid") == main_pid]
+    resident_memory = [
+        memory
+        for status in worker_statuses or [statuses[main_pid]]
+        if (memory := _resident_memory(status)) is not None
+    ]
+    if not resident_memory:
+        return None
+    return sum(resident_memory) // len(resident_memory)
+
+
+def measure_worker_memory(container: ops.Container, service_name: str) -> int | None:
+    """Measure the memory of a worker process of the web service.
+
+    Args:
+        container: the workload container.
+        service_name: the name of the web service.
+
+    Returns:
+        The memory of a worker in bytes, rounded up, None if the web service does not run.
+    """
+    service = container.get_services(service_name).get(service_name)
+    if service is None or not service.is_running():
+        return None
+    command = container.get_plan().services[service_name].command
+    measured_memory = read_worker_memory(container, command)
+    if not measured_memory:
+        return None
+    return math.ceil(measured_memory / WORKER_MEMORY_GRANULARITY) * WORKER_MEMORY_GRANULARITY
+
+
+def read_recorded_worker_memory(container: ops.Container, state_dir: pathlib.Path) -> int:
+    """Read the memory of a worker recorded by ``record_worker_memory``.
+
+    The workers are sized from the recorded memory only, so the sizing does not change with
+    the memory of the running workers from one hook to the next.
+
+    Args:
+        container: the workload container.
+        state_dir: the state directory of the workload.
+
+    Returns:
+        The recorded memory of a worker in bytes, ``DEFAULT_WORKER_MEMORY`` if none.
+    """
+    try:
+        return int(container.pull(state_dir / WORKER_MEMORY_FILE).read())
+    except (PathError, ValueError):
+        return DEFAULT_WORKER_MEMORY
+
+
+def record_worker_memory(
+    container: ops.Container, state_dir: pathlib.Path, service_name: str
+) -> bool:
+    """Measure the memory of a worker of the running web service and record it.
+
+    Args:
+        container: the workload container.
+        state_dir: the state directory of the workload.
+        service_name: the name of the web service.
+
+    Returns:
+        True if the recorded memory changed.
+    """
+    worker_memory = measure_worker_memory(container, service_name)
+    if worker_memory is None or worker_memory == read_recorded_worker_memory(container, state_dir):
+        return False
+    logger.info("measured worker memory: %s bytes", worker_memory)
+    container.push(state_dir / WORKER_MEMORY_FILE, str(worker_memory), make_dirs=True)
+    return True
+
+
+def max_workers_for_memory(memory_limit: int | None, worker_memory: int) -> int | None:
+    """Get the number of workers that fit in the memory limit of the container.
+
+    Args:
+        memory_limit: the memory limit of the container in bytes, None if unlimited.
+        worker_memory: the memory of a worker in bytes.
+
+    Returns:
+        The number of workers that fit, at least one, None without memory limit.
+    """
+    if memory_limit is None:
+        return None
+    return max(1, int(memory_limit * WORKER_MEMORY_FRACTION) // worker_memory)
@@ -4,6 +4,7 @@
 """The base charm class for all application charms."""
 
 import abc
+import contextlib
 import logging
 import pathlib
 import typing
@@ -17,6 +18,7 @@ from ops.model import Container
 from pydantic import BaseModel, ValidationError
 
 from paas_charm.app import App, WorkloadConfig
+from paas_charm.cgroup import WORKER_MEMORY_NOTICE_KEY, record_worker_memory
 from paas_charm.charm_state import CharmState, IntegrationRequirers
 from paas_charm.charm_utils import block_if_invalid_data
 from paas_charm.database_migration import DatabaseMigration, DatabaseMigrationStatus
@@ -27,80 +29,36 @@ from paas_charm.openfga import STORE_NAME
 from paas_charm.paas_config import (
     FRAMEWORKS_SUPPORTING_LOGGING_FORMAT,
     LoggingFormat,
+    ServiceRole,
     read_paas_config,
 )
-from paas_charm.rabbitmq import RabbitMQRequires
-from paas_charm.redis import PaaSRedisRequires
+from paas_charm.restart_coalescer import RESTART_NOTICE_KEY, RestartCoalescer
+from paas_charm.rolling_restart import RollingRestart, is_port_open, ready_checks_succeeded_since
+from paas_charm.secret_cache import SecretContentCache
 from paas_charm.secret_storage import KeySecretStorage
+from paas_charm.timing import log_phase_summary, set_tracing_destination, timed_phase
+from paas_charm.unit_roles import UnitRoles
 from paas_charm.utils import (
+    build_k8s_unit_fqdn,
     build_validation_error_message,
     config_get_with_secret,
     get_endpoints_by_interface_name,
     merge_cos_directories,
 )
 
-logger = logging.getLogger(__name__)
+if typing.TYPE_CHECKING:
+    from charms.openfga_k8s.v1.openfga import OpenFGARequires
+    from charms.smtp_integrator.v0.smtp import SmtpRequires
 
-# Until charmcraft fetch-libs is implemented, the charm will not fail
-# if new optional libs are not fetched, as it will not be backwards compatible.
-try:
-    # pylint: disable=ungrouped-imports
+    from paas_charm.http_proxy import PaaSHttpProxyRequirer
+    from paas_charm.oauth import PaaSOAuthRequirer
+    from paas_charm.rabbitmq import RabbitMQRequires
+    from paas_charm.redis import PaaSRedisRequires
     from paas_charm.s3 import PaaSS3Requirer
-except ImportError:
-    logger.warning(
-        "Missing charm library, please run `charmcraft fetch-lib charms.data_platform_libs.v0.s3`"
-    )
-
-try:
-    # pylint: disable=ungrouped-imports
     from paas_charm.saml import PaaSSAMLRequirer
-except ImportError:
-    logger.warning(
-        "Missing charm library, please run `charmcraft fetch-lib charms.saml_integrator.v0.saml`"
-    )
-
-try:
-    # pylint: disable=ungrouped-imports
     from paas_charm.tracing import PaaSTracingEndpointRequirer
-except ImportError:
-    logger.warning(
-        "Missing charm library, please run "
-        "`charmcraft fetch-lib charms.tempo_coordinator_k8s.v0.tracing`"
-    )
-
-try:
-    # pylint: disable=ungrouped-imports
-    from charms.smtp_integrator.v0.smtp import SmtpRequires
-except ImportError:
-    logger.warning(
-        "Missing charm library, please run "
-        "`charmcraft fetch-lib charms.smtp_integrator.v0.smtp`"
-    )
-
-try:
-    # pylint: disable=ungrouped-imports
-    from charms.openfga_k8s.v1.openfga import OpenFGARequires
-except ImportError:
-    logger.warning(
-        "Missing charm library, please run `charmcraft fetch-lib charms.openfga_k8s.v1.openfga`"
-    )
-
-try:
-    # pylint: disable=ungrouped-imports
-    from paas_charm.oauth import PaaSOAuthRequirer
-except ImportError:
-    logger.warning(
-        "Missing charm library, please run `charmcraft fetch-lib charms.hydra.v0.oauth`"
-    )
 
-try:
-    # pylint: disable=ungrouped-imports
-    from paas_charm.http_proxy import PaaSHttpProxyRequirer
-except ImportError:
-    logger.warning(
-        "Missing charm library, please run "
-        "`charmcraft fetch-lib charms.squid_forward_proxy.v0.http_proxy`"
-    )
+logger = logging.getLogger(__name__)
 
 
 class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-attributes
@@ -144,8 +102,14 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         """
         super().__init__(framework)
         self._framework_name = framework_name
+        self._hook_cache: dict[str, typing.Any] | None = None
+        paas_config = read_paas_config()
+        self._reconcile_events = paas_config.reconcile_events
+        self._reconcile_requested = False
+        self._reconcile_rerun_migrations = False
 
         self._secret_storage = KeySecretStorage(charm=self, key=f"{framework_name}_secret_key")
+        self._secret_content_cache = SecretContentCache(charm=self)
         self._database_requirers = make_database_requirers(self, self.app.name)
 
         requires: dict[str, RelationMeta] = self.framework.meta.requires
@@ -157,20 +121,23 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         self._smtp = self._init_smtp(requires)
         self._openfga = self._init_openfga(requires)
         self._http_proxy = self._init_http_proxy(requires)
+        # Observe before the handlers restarting the workload, so they get the new role.
+        self._unit_roles = UnitRoles(charm=self)
 
+        workload_config = self._workload_config
         self._database_migration = DatabaseMigration(
-            container=self.unit.get_container(self._workload_config.container_name),
+            container=self.unit.get_container(workload_config.container_name),
             state_dir=self._state_dir,
         )
 
         self._ingress = IngressPerAppRequirer(
             self,
-            port=self._workload_config.port,
+            host=self._ingress_host(),
+            port=workload_config.port,
             strip_prefix=True,
         )
         self._oauth = self._init_oauth(requires)
 
-        paas_config = read_paas_config()
         if paas_config.framework_logging_format != LoggingFormat.NONE:
             supported = FRAMEWORKS_SUPPORTING_LOGGING_FORMAT.get(
                 paas_config.framework_logging_format, set()
@@ -183,45 +150,93 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
                 )
         self._observability = Observability(
             charm=self,
-            log_files=self._workload_config.log_files,
-            container_name=self._workload_config.container_name,
+            log_files=workload_config.log_files,
+            container_name=workload_config.container_name,
             cos_dir=self.build_cos_dir(),
-            metrics_target=self._workload_config.metrics_target,
-            metrics_path=self._workload_config.metrics_path,
+            metrics_target=workload_config.metrics_target,
+            metrics_path=workload_config.metrics_path,
             prometheus_config=paas_config.prometheus,
+            scheduler_units=workload_config.scheduler_units,
         )
+        self._restart_coalescer: RestartCoalescer | None = None
+        if paas_config.coalesce_restarts:
+            self._restart_coalescer = RestartCoalescer(
+                charm=self, container_name=workload_config.container_name
+            )
+        self.framework.observe(
+            self.on[workload_config.container_name].pebble_custom_notice,
+            self._on_pebble_custom_notice,
+        )
+        self._rolling_restart: RollingRestart | None = None
+        if paas_config.max_concurrent_restarts is not None:
+            self._rolling_restart = RollingRestart(
+                charm=self,
+                container_name=workload_config.container_name,
+                max_units=paas_config.max_concurrent_restarts,
+                is_workload_ready=self._is_workload_ready,
+            )
 
-        self.framework.observe(self.on.config_changed, self._on_config_changed)
+        self._observe_workload_event(self.on.config_changed, self._on_config_changed)
         self.framework.observe(self.on.rotate_secret_key_action, self._on_rotate_secret_key_action)
-        self.framework.observe(
+        self._observe_workload_event(
             self.on.secret_storage_relation_changed,
             self._on_secret_storage_relation_changed,
         )
-        self.framework.observe(
+        self._observe_workload_event(
             self.on.secret_storage_relation_departed,
             self._on_secret_storage_relation_departed,
         )
         self.framework.observe(self.on.update_status, self._on_update_status)
-        self.framework.observe(self.on.secret_changed, self._on_secret_changed)
+        # The new leader publishes the application data of the ingress and is a web unit.
+        self._observe_workload_event(self.on.leader_elected, self._on_leader_elected)
+        self._observe_workload_event(self.on.secret_changed, self._on_secret_changed)
         for database, database_requirer in self._database_requirers.items():
-            self.framework.observe(
+            self._observe_workload_event(
                 database_requirer.on.database_created,
                 getattr(self, f"_on_{database}_database_database_created"),
+                rerun_migrations=True,
             )
-            self.framework.observe(
+            self._observe_workload_event(
                 database_requirer.on.endpoints_changed,
                 getattr(self, f"_on_{database}_database_endpoints_changed"),
+                rerun_migrations=True,
             )
-            self.framework.observe(
+            self._observe_workload_event(
                 self.on[database_requirer.relation_name].relation_broken,
                 getattr(self, f"_on_{database}_database_relation_broken"),
             )
-        self.framework.observe(self._ingress.on.ready, self._on_ingress_ready)
-        self.framework.observe(self._ingress.on.revoked, self._on_ingress_revoked)
-        self.framework.observe(
-            self.on[self._workload_config.container_name].pebble_ready,
+        self._observe_workload_event(self._ingress.on.ready, self._on_ingress_ready)
+        self._observe_workload_event(self._ingress.on.revoked, self._on_ingress_revoked)
+        self._observe_workload_event(
+            self.on[workload_config.container_name].pebble_ready,
             self._on_pebble_ready,
         )
+        if self._reconcile_events:
+            self.framework.observe(self.framework.on.pre_commit, self._on_pre_commit)
+        self.framework.observe(self.framework.on.commit, self._on_commit)
+
+    def _observe_workload_event(
+        self,
+        event: ops.BoundEvent,
+        handler: typing.Callable[[typing.Any], None],
+        rerun_migrations: bool = False,
+    ) -> None:
+        """Observe an event that changes the workload.
+
+        If ``reconcile_events`` is set in paas-config.yaml, the event requests a reconcile of
+        the workload at the end of the hook instead, and the handler is not observed.
+
+        Args:
+            event: the event to observe.
+            handler: the handler of the event if the events are not reconciled.
+            rerun_migrations: whether the event requires to run the migrations again.
+        """
+        if not self._reconcile_events:
+            self.framework.observe(event, handler)
+        elif rerun_migrations:
+            self.framework.observe(event, self._on_reconcile_with_migrations_requested)
+        else:
+            self.framework.observe(event, self._on_reconcile_requested)
 
     def _init_redis(self, requires: dict[str, RelationMeta]) -> "PaaSRedisRequires | None":
         """Initialize the Redis relation if its required.
@@ -235,11 +250,16 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         _redis = None
         if "redis" in requires and requires["redis"].interface_name == "redis":
             try:
+                # pylint: disable-next=import-outside-toplevel
+                from paas_charm.redis import PaaSRedisRequires
+
                 _redis = PaaSRedisRequires(charm=self, relation_name="redis")
-                self.framework.observe(
-                    self.on.redis_relation_updated, self._on_redis_relation_updated
+                self._observe_workload_event(
+                    self.on.redis_relation_updated,
+                    self._on_redis_relation_updated,
+                    rerun_migrations=True,
                 )
-            except NameError:
+            except ImportError:
                 logger.exception(
                     "Missing charm library,                               "
                     "please run `charmcraft fetch-lib charms.redis_k8s.v0.redis`"
@@ -261,11 +281,14 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         _http_proxy = None
         if "http-proxy" in requires and requires["http-proxy"].interface_name == "http_proxy":
             try:
+                # pylint: disable-next=import-outside-toplevel
+                from paas_charm.http_proxy import PaaSHttpProxyRequirer
+
                 _http_proxy = PaaSHttpProxyRequirer(self)
-                self.framework.observe(
+                self._observe_workload_event(
                     self.on["http-proxy"].relation_changed, self._on_http_proxy_changed
                 )
-            except NameError:
+            except ImportError:
                 logger.exception(
                     "Missing charm library,                               "
                     "please run `charmcraft fetch-lib charms.squid_forward_proxy.v0.http_proxy`"
@@ -285,10 +308,17 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         _s3 = None
         if "s3" in requires and requires["s3"].interface_name == "s3":
             try:
+                # pylint: disable-next=import-outside-toplevel
+                from paas_charm.s3 import PaaSS3Requirer
+
                 _s3 = PaaSS3Requirer(charm=self, relation_name="s3", bucket_name=self.app.name)
-                self.framework.observe(_s3.on.credentials_changed, self._on_s3_credential_changed)
-                self.framework.observe(_s3.on.credentials_gone, self._on_s3_credential_gone)
-            except NameError:
+                self._observe_workload_event(
+                    _s3.on.credentials_changed,
+                    self._on_s3_credential_changed,
+                    rerun_migrations=True,
+                )
+                self._observe_workload_event(_s3.on.credentials_gone, self._on_s3_credential_gone)
+            except ImportError:
                 logger.exception(
                     "Missing charm library, "
                     "please run `charmcraft fetch-lib charms.data_platform_libs.v0.s3`"
@@ -307,9 +337,16 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         _saml = None
         if "saml" in requires and requires["saml"].interface_name == "saml":
             try:
+                # pylint: disable-next=import-outside-toplevel
+                from paas_charm.saml import PaaSSAMLRequirer
+
                 _saml = PaaSSAMLRequirer(self)
-                self.framework.observe(_saml.on.saml_data_available, self._on_saml_data_available)
-            except NameError:
+                self._observe_workload_event(
+                    _saml.on.saml_data_available,
+                    self._on_saml_data_available,
+                    rerun_migrations=True,
+                )
+            except ImportError:
                 logger.exception(
                     "Missing charm library, "
                     "please run `charmcraft fetch-lib charms.saml_integrator.v0.saml`"
@@ -327,16 +364,21 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         """
         _rabbitmq = None
         if "rabbitmq" in requires and requires["rabbitmq"].interface_name == "rabbitmq":
+            # The RabbitMQ integration module ships with paas_charm, it needs no charm library.
+            # pylint: disable-next=import-outside-toplevel
+            from paas_charm.rabbitmq import RabbitMQRequires
+
             _rabbitmq = RabbitMQRequires(
                 self,
                 "rabbitmq",
                 username=self.app.name,
                 vhost="/",
             )
-            self.framework.observe(_rabbitmq.on.connected, self._on_rabbitmq_connected)
-            self.framework.observe(_rabbitmq.on.ready, self._on_rabbitmq_ready)
-            self.framework.observe(_rabbitmq.on.departed, self._on_rabbitmq_departed)
-
+            self._observe_workload_event(_rabbitmq.on.connected, self._on_rabbitmq_connected)
+            self._observe_workload_event(
+                _rabbitmq.on.ready, self._on_rabbitmq_ready, rerun_migrations=True
+            )
+            self._observe_workload_event(_rabbitmq.on.departed, self._on_rabbitmq_departed)
         return _rabbitmq
 
     def _init_tracing(
@@ -353,16 +395,25 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         _tracing = None
         if "tracing" in requires and requires["tracing"].interface_name == "tracing":
             try:
+                # pylint: disable-next=import-outside-toplevel
+                from paas_charm.tracing import PaaSTracingEndpointRequirer
+
                 _tracing = PaaSTracingEndpointRequirer(
                     self, relation_name="tracing", protocols=["otlp_http"]
                 )
-                self.framework.observe(
+                self._observe_workload_event(
                     _tracing.on.endpoint_changed, self._on_tracing_relation_changed
                 )
-                self.framework.observe(
+                self._observe_workload_event(
                     _tracing.on.endpoint_removed, self._on_tracing_relation_broken
                 )
-            except NameError:
+                self.framework.observe(
+                    _tracing.on.endpoint_changed, self._on_charm_tracing_changed
+                )
+                self.framework.observe(
+                    _tracing.on.endpoint_removed, self._on_charm_tracing_changed
+                )
+            except ImportError:
                 logger.exception(
                     "Missing charm library, please run "
                     "`charmcraft fetch-lib charms.tempo_coordinator_k8s.v0.tracing`"
@@ -381,9 +432,14 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         _smtp = None
         if "smtp" in requires and requires["smtp"].interface_name == "smtp":
             try:
+                # pylint: disable-next=import-outside-toplevel
+                from charms.smtp_integrator.v0.smtp import SmtpRequires
+
                 _smtp = SmtpRequires(self)
-                self.framework.observe(_smtp.on.smtp_data_available, self._on_smtp_data_available)
-            except NameError:
+                self._observe_workload_event(
+                    _smtp.on.smtp_data_available, self._on_smtp_data_available
+                )
+            except ImportError:
                 logger.exception(
                     "Missing charm library, please run "
                     "`charmcraft fetch-lib charms.smtp_integrator.v0.smtp`"
@@ -402,11 +458,14 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         openfga = None
         if "openfga" in requires and requires["openfga"].interface_name == "openfga":
             try:
+                # pylint: disable-next=import-outside-toplevel
+                from charms.openfga_k8s.v1.openfga import OpenFGARequires
+
                 openfga = OpenFGARequires(self, STORE_NAME)
-                self.framework.observe(
+                self._observe_workload_event(
                     openfga.on.openfga_store_created, self._on_openfga_store_created
                 )
-            except NameError:
+            except ImportError:
                 logger.exception(
                     "Missing charm library, please run "
                     "`charmcraft fetch-lib charms.openfga_k8s.v1.openfga`"
@@ -428,21 +487,90 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
             return None
         endpoint_name = oauth_integrations[0][0]
         try:
+            # pylint: disable-next=import-outside-toplevel
+            from paas_charm.oauth import PaaSOAuthRequirer
+
             _oauth = PaaSOAuthRequirer(
                 charm=self,
                 base_url=self._base_url,
                 relation_name=endpoint_name,
                 charm_config=self.config,
             )
-            self.framework.observe(_oauth.on.oauth_info_changed, self._on_oauth_info_changed)
-            self.framework.observe(_oauth.on.oauth_info_removed, self._on_oauth_info_removed)
-        except NameError:
+            self._observe_workload_event(_oauth.on.oauth_info_changed, self._on_oauth_info_changed)
+            self._observe_workload_event(_oauth.on.oauth_info_removed, self._on_oauth_info_removed)
+        except ImportError:
             logger.exception(
                 "Missing charm library, please run `charmcraft fetch-lib charms.hydra.v0.oauth`"
             )
             return None
         return _oauth
 
+    @contextlib.contextmanager
+    def _hook_cache_scope(self) -> typing.Iterator[None]:
+        """Memoize the state read from Juju while an event is being handled.
+
+        Inside the scope the charm state and the charm configuration are built only once.
+        Nested scopes reuse the outermost cache, which is discarded when the scope exits.
+        The scope is opened by each observer method rather than once per dispatch, since the
+        charm instance can handle several events, as in the unit tests.
+        """
+        if self._hook_cache is not None:
+            yield
+            return
+        self._hook_cache = {}
+        try:
+            yield
+        finally:
+            self._hook_cache = None
+
+    def invalidate_hook_cache(self) -> None:
+        """Discard the memoized state, to be called after the charm writes to that state."""
+        if self._hook_cache is not None:
+            self._hook_cache.clear()
+
+    def _hook_cached(self, key: str, factory: typing.Callable[[], typing.Any]) -> typing.Any:
+        """Return the memoized value for the key, calling the factory on a cache miss.
+
+        Values are only memoized inside a hook cache scope, exceptions are never memoized.
+
+        Args:
+            key: the cache key.
+            factory: function building the value.
+
+        Returns:
+            The memoized or newly built value.
+        """
+        if self._hook_cache is None:
+            return factory()
+        if key not in self._hook_cache:
+            self._hook_cache[key] = factory()
+        return self._hook_cache[key]
+
+    def _get_charm_config(self) -> dict:
+        """Return the charm configuration with the secret-typed options resolved.
+
+        Returns:
+            The charm configuration, secret options are replaced by the secret content.
+        """
+        return typing.cast(dict, self._hook_cached("charm_config", self._read_charm_config))
+
+    def _read_charm_config(self) -> dict:
+        """Read the charm configuration and the content of the secret-typed options.
+
+        Each secret is refreshed to its latest revision and read once in the hook.
+
+        Returns:
+            The charm configuration, secret options are replaced by the secret content.
+        """
+        charm_config = {k: config_get_with_secret(self, k) for k in self.config.keys()}
+        return typing.cast(
+            dict,
+            {
+                k: self._secret_content_cache.get_content(v) if isinstance(v, ops.Secret) else v
+                for k, v in charm_config.items()
+            },
+        )
+
     def get_framework_config(self) -> BaseModel:
         """Return the framework related configurations.
 
@@ -454,14 +582,8 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         """
         # Will raise an AttributeError if it the attribute framework_config_class does not exist.
         framework_config_class = self.framework_config_class
-        charm_config = {k: config_get_with_secret(self, k) for k in self.config.keys()}
-        config = typing.cast(
-            dict,
-            {
-                k: v.get_content(refresh=True) if isinstance(v, ops.Secret) else v
-                for k, v in charm_config.items()
-            },
-        )
+        # The framework config validators may modify the input, do not pass the shared dict.
+        config = dict(self._get_charm_config())
 
         try:
             return framework_config_class.model_validate(config)
@@ -470,6 +592,16 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
             logger.error(error_messages.long)
             raise CharmConfigInvalidError(error_messages.short) from exc
 
+    def _get_cached_framework_config(self) -> BaseModel:
+        """Return the framework related configurations, validated once per event handler.
+
+        Returns:
+             Framework related configurations, the object is shared and must not be modified.
+        """
+        return typing.cast(
+            BaseModel, self._hook_cached("framework_config", self.get_framework_config)
+        )
+
     def build_cos_dir(self) -> pathlib.Path:
         """Build and return a merged directory with COS files.
 
@@ -510,6 +642,14 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         """
         return (self.charm_dir / "cos_custom").absolute()
 
+    def get_app_config_cache_dir(self) -> pathlib.Path:
+        """Return the directory caching the validator of the user-defined configurations.
+
+        Returns:
+            Return the directory caching the validator of the user-defined configurations.
+        """
+        return (self.charm_dir / ".paas_charm_cache").absolute()
+
     @property
     def _container(self) -> Container:
         """Return the workload container."""
@@ -520,6 +660,11 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         """Configure the application pebble service layer."""
         self.restart()
 
+    @block_if_invalid_data
+    def _on_leader_elected(self, _: ops.EventBase) -> None:
+        """Handle the leader-elected event."""
+        self.restart()
+
     @block_if_invalid_data
     def _on_secret_changed(self, _: ops.EventBase) -> None:
         """Configure the application Pebble service layer."""
@@ -539,6 +684,7 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
             event.fail("charm is still initializing")
             return
         self._secret_storage.reset_secret_key()
+        self.invalidate_hook_cache()
         event.set_results({"status": "success"})
         self.restart()
 
@@ -689,30 +835,138 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
         yield from self._missing_required_storage_integrations(requires, charm_state)
         yield from self._missing_required_other_integrations(requires, charm_state)
 
+    @timed_phase("charm.restart")
     def restart(self, rerun_migrations: bool = False) -> None:
         """Restart or start the service if not started with the latest configuration.
 
         Args:
             rerun_migrations: whether it is necessary to run the migrations again.
         """
+        if self._restart_coalescer:
+            self._restart_coalescer.mark_restarted()
         if not self.is_ready():
             return
 
+        if self._restart_coalescer and self._restart_coalescer.pop_rerun_migrations():
+            rerun_migrations = True
         if rerun_migrations:
             self._database_migration.set_status_to_pending()
 
         try:
-            if self._oauth:
-                self._oauth.update_client()
+            self._update_oauth_client()
+            # Raises CharmConfigInvalidError if the app-unit-roles option is invalid.
+            self._unit_roles.requested_units()
+            app = self._create_app()
+            if not self._acquire_restart_lease(app, force=rerun_migrations):
+                self.update_app_and_unit_status(ops.WaitingStatus("Waiting for restart lease"))
+                return
             self.update_app_and_unit_status(ops.MaintenanceStatus("Preparing service for restart"))
-            self._create_app().restart()
+            app.restart(force=rerun_migrations)
         except CharmConfigInvalidError as exc:
             self.update_app_and_unit_status(ops.BlockedStatus(exc.msg))
             return
-        self._ingress.provide_ingress_requirements(port=self._workload_config.port)
-        self.unit.set_ports(ops.Port(protocol="tcp", port=self._workload_config.port))
+        if self._rolling_restart:
+            # The restart lease is released by a later hook, once the workload is ready.
+            self._rolling_restart.mark_restarted()
+        self._publish_unit_address()
+
+        self.update_app_and_unit_status(ops.ActiveStatus(app.status_message))
+
+    def _update_oauth_client(self) -> None:
+        """Update the OAuth client configuration, if the charm has an OAuth integration."""
+        if not self._oauth:
+            return
+        self._oauth.update_client()
+        if self._oauth.is_related():
+            # The OAuth relation data in the charm state depends on the client config.
+            self.invalidate_hook_cache()
+
+    def _publish_unit_address(self) -> None:
+        """Publish the address of the unit to the ingress and open the port of the web units."""
+        self._ingress.provide_ingress_requirements(
+            host=self._ingress_host(), port=self._workload_config.port
+        )
+        if self._workload_config.runs_role(ServiceRole.WEB):
+            self.unit.set_ports(ops.Port(protocol="tcp", port=self._workload_config.port))
+        else:
+            self.unit.set_ports()
+
+    def _ingress_host(self) -> str | None:
+        """Get the address the unit publishes to the ingress.
+
+        The ingress needs a valid address from every unit and routes the requests to all of
+        them, so a unit not serving web publishes the address of a web unit instead of its own.
+
+        Returns:
+            The FQDN of a web unit if the unit does not serve web, None for its own address.
+        """
+        if self._workload_config.runs_role(ServiceRole.WEB):
+            return None
+        web_units = [
+            unit_name
+            for unit_name, role in self._workload_config.unit_roles.items()
+            if role == ServiceRole.WEB
+        ]
+        if not web_units:
+            return None
+        unit_number = int(self.unit.name.split("/")[1])
+        return build_k8s_unit_fqdn(
+            self.app.name, web_units[unit_number % len(web_units)], self.model.name
+        )
 
-        self.update_app_and_unit_status(ops.ActiveStatus())
+    def _acquire_restart_lease(self, app: App, force: bool) -> bool:
+        """Acquire a restart lease if restarts are rolling and the running workload restarts.
+
+        Args:
+            app: the application to restart.
+            force: whether the restart is forced even if the configuration is unchanged.
+
+        Returns:
+            True if the unit can restart the workload, False if it has to wait for a lease.
+        """
+        if self._rolling_restart is None or self._rolling_restart.holds_lease:
+            return True
+        if not app.is_restart_pending(force=force):
+            return True
+        return self._rolling_restart.acquire()
+
+    def _is_workload_ready(self, restarted_at: float) -> bool:
+        """Check if the web service is running and ready to serve requests since a restart.
+
+        The Pebble readiness checks must have succeeded since the restart. Without readiness
+        checks, the web service must accept connections on its port.
+
+        Args:
+            restarted_at: the time of the restart, in seconds since the epoch.
+
+        Returns:
+            True if the workload is ready to serve requests.
+        """
+        if not self._container.can_connect():
+            return False
+        if not self._workload_config.runs_role(ServiceRole.WEB):
+            # The readiness checks are about the web service, not run by the unit.
+            return True
+        service_name = self._workload_config.service_name
+        service = self._container.get_services(service_name).get(service_name)
+        if service is None or not service.is_running():
+            return False
+        checks_succeeded = ready_checks_succeeded_since(self._container, restarted_at)
+        if checks_succeeded is None:
+            return is_port_open(self._workload_config.port)
+        return checks_succeeded
+
+    def _schedule_restart(self, rerun_migrations: bool = False) -> None:
+        """Restart the service, once for a burst of events if restarts are coalesced.
+
+        Args:
+            rerun_migrations: whether it is necessary to run the migrations again.
+        """
+        if self._restart_coalescer and self._restart_coalescer.schedule(
+            rerun_migrations=rerun_migrations
+        ):
+            return
+        self.restart(rerun_migrations=rerun_migrations)
 
     def _gen_environment(self) -> dict[str, str]:
         """Generate the environment dictionary used for the App.
@@ -728,24 +982,27 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
     def _create_charm_state(self) -> CharmState:
         """Create charm state.
 
+        The charm state is built once per event handler and shared by all its consumers,
+        see ``_hook_cache_scope``. This method may raise CharmConfigInvalidError.
+
+        Returns:
+            The CharmState
+        """
+        return typing.cast(CharmState, self._hook_cached("charm_state", self._build_charm_state))
+
+    def _build_charm_state(self) -> CharmState:
+        """Build a new charm state from the charm configuration and the integrations.
+
         This method may raise CharmConfigInvalidError.
 
         Returns:
             New CharmState
         """
-        charm_config = {k: config_get_with_secret(self, k) for k in self.config.keys()}
-        config = typing.cast(
-            dict,
-            {
-                k: v.get_content(refresh=True) if isinstance(v, ops.Secret) else v
-                for k, v in charm_config.items()
-            },
-        )
         return CharmState.from_charm(
             charm_dir=self.charm_dir,
-            config=config,
+            config=self._get_charm_config(),
             framework=self._framework_name,
-            framework_config=self.get_framework_config(),
+            framework_config=self._get_cached_framework_config(),
             secret_storage=self._secret_storage,
             integration_requirers=IntegrationRequirers(
                 databases=self._database_requirers,
@@ -760,6 +1017,7 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
                 http_proxy=self._http_proxy,
             ),
             base_url=self._base_url,
+            app_config_cache_dir=self.get_app_config_cache_dir(),
         )
 
     @property
@@ -788,129 +1046,193 @@ class PaasCharm(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-at
     @block_if_invalid_data
     def _on_mysql_database_database_created(self, _: DatabaseRequiresEvent) -> None:
         """Handle mysql's database-created event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_mysql_database_endpoints_changed(self, _: DatabaseRequiresEvent) -> None:
         """Handle mysql's endpoints-changed event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_mysql_database_relation_broken(self, _: ops.RelationBrokenEvent) -> None:
         """Handle mysql's relation-broken event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_postgresql_database_database_created(self, _: DatabaseRequiresEvent) -> None:
         """Handle postgresql's database-created event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_postgresql_database_endpoints_changed(self, _: DatabaseRequiresEvent) -> None:
         """Handle mysql's endpoints-changed event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_postgresql_database_relation_broken(self, _: ops.RelationBrokenEvent) -> None:
         """Handle postgresql's relation-broken event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_mongodb_database_database_created(self, _: DatabaseRequiresEvent) -> None:
         """Handle mongodb's database-created event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_mongodb_database_endpoints_changed(self, _: DatabaseRequiresEvent) -> None:
         """Handle mysql's endpoints-changed event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_mongodb_database_relation_broken(self, _: ops.RelationBrokenEvent) -> None:
         """Handle postgresql's relation-broken event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_redis_relation_updated(self, _: DatabaseRequiresEvent) -> None:
         """Handle redis's database-created event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_s3_credential_changed(self, _: ops.HookEvent) -> None:
         """Handle s3 credentials-changed event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_s3_credential_gone(self, _: ops.HookEvent) -> None:
         """Handle s3 credentials-gone event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_saml_data_available(self, _: ops.HookEvent) -> None:
         """Handle saml data available event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_ingress_revoked(self, _: ops.HookEvent) -> None:
         """Handle event for ingress revoked."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_ingress_ready(self, _: ops.HookEvent) -> None:
         """Handle event for ingress ready."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_pebble_ready(self, _: ops.PebbleReadyEvent) -> None:
         """Handle the pebble-ready event."""
         self.restart()
 
+    def _on_commit(self, _: ops.CommitEvent) -> None:
+        """Log the duration of the phases of the hook."""
+        log_phase_summary()
+
+    def _on_charm_tracing_changed(self, _: ops.HookEvent) -> None:
+        """Send the charm traces to the Tempo related for the workload, if possible."""
+        # pylint: disable-next=import-outside-toplevel
+        from paas_charm.tracing import InvalidTracingRelationDataError
+
+        endpoint = None
+        try:
+            relation_data = self._tracing.to_relation_data() if self._tracing else None
+        except InvalidTracingRelationDataError:
+            logger.exception("invalid tracing relation data, charm traces are not sent")
+            relation_data = None
+        if relation_data:
+            endpoint = str(relation_data.endpoint)
+        set_tracing_destination(endpoint)
+
+    def _on_reconcile_requested(self, _: ops.EventBase) -> None:
+        """Request a reconcile of the workload at the end of the hook."""
+        self._reconcile_requested = True
+
+    def _on_reconcile_with_migrations_requested(self, _: ops.EventBase) -> None:
+        """Request a reconcile of the workload running the migrations again."""
+        self._reconcile_requested = True
+        self._reconcile_rerun_migrations = True
+
+    def _on_pre_commit(self, event: ops.PreCommitEvent) -> None:
+        """Reconcile the workload once at the end of the hook if an event requested it.
+
+        Args:
+            event: the event that triggered this handler.
+        """
+        if self._reconcile_requested:
+            self._reconcile(event)
+
+    @block_if_invalid_data
+    def _reconcile(self, _: ops.EventBase) -> None:
+        """Bring the workload to the state described by the charm state.
+
+        The reconcile is idempotent, it builds the charm state once and restarts the
+        workload only if the restart fingerprint changed.
+        """
+        rerun_migrations = self._reconcile_rerun_migrations
+        self._reconcile_requested = False
+        self._reconcile_rerun_migrations = False
+        self.restart(rerun_migrations=rerun_migrations)
+
+    @block_if_invalid_data
+    def _on_pebble_custom_notice(self, event: ops.PebbleCustomNoticeEvent) -> None:
+        """Handle the pebble-custom-notice event.
+
+        Args:
+            event: the event that triggered this handler.
+        """
+        if event.notice.key == RESTART_NOTICE_KEY:
+            self.restart()
+        elif event.notice.key == WORKER_MEMORY_NOTICE_KEY and record_worker_memory(
+            self._container, self._workload_config.state_dir, self._workload_config.service_name
+        ):
+            # Size the workers again from the measured memory.
+            self.restart()
+
     @block_if_invalid_data
     def _on_rabbitmq_connected(self, _: ops.HookEvent) -> None:
         """Handle rabbitmq connected event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_rabbitmq_ready(self, _: ops.HookEvent) -> None:
         """Handle rabbitmq ready event."""
-        self.restart(rerun_migrations=True)
+        self._schedule_restart(rerun_migrations=True)
 
     @block_if_invalid_data
     def _on_rabbitmq_departed(self, _: ops.HookEvent) -> None:
         """Handle rabbitmq departed event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_tracing_relation_changed(self, _: ops.HookEvent) -> None:
         """Handle tracing relation changed event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_tracing_relation_broken(self, _: ops.HookEvent) -> None:
         """Handle tracing relation broken event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_smtp_data_available(self, _: ops.HookEvent) -> None:
         """Handle smtp data available event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_openfga_store_created(self, _: ops.HookEvent) -> None:
         """Handle openfga store created event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_oauth_info_changed(self, _: ops.HookEvent) -> None:
         """Handle the OAuth info changed event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_oauth_info_removed(self, _: ops.HookEvent) -> None:
         """Handle the OAuth info removed event."""
-        self.restart()
+        self._schedule_restart()
 
     @block_if_invalid_data
     def _on_http_proxy_changed(self, _: ops.HookEvent) -> None:
         """Handle http-proxy relation changed."""
-        self.restart()
+        self._schedule_restart()
@@ -3,12 +3,15 @@
 
 """This module defines the CharmState class which represents the state of the charm."""
 
+import hashlib
+import json
 import logging
 import os
 import pathlib
 import typing
 from dataclasses import dataclass, field
 
+import pydantic_core
 from pydantic import BaseModel, Field, ValidationError, create_model
 
 from paas_charm.exceptions import (
@@ -17,6 +20,7 @@ from paas_charm.exceptions import (
     RelationDataError,
 )
 from paas_charm.secret_storage import KeySecretStorage
+from paas_charm.timing import timed_phase
 from paas_charm.utils import build_validation_error_message, config_metadata
 
 # This is just for type checking, no need to cover this code.
@@ -83,6 +87,7 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
         self.base_url = base_url
 
     @classmethod
+    @timed_phase("charm_state.from_charm")
     def from_charm(  # pylint: disable=too-many-arguments,too-many-locals
         cls,
         *,
@@ -93,6 +98,7 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
         secret_storage: KeySecretStorage,
         integration_requirers: "IntegrationRequirers",
         base_url: str | None = None,
+        app_config_cache_dir: pathlib.Path | None = None,
     ) -> "CharmState":
         """Initialize a new instance of the CharmState class from the associated charm.
 
@@ -104,6 +110,7 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
             secret_storage: The secret storage manager associated with the charm.
             integration_requirers: The collection of integration requirers.
             base_url: Base URL for the service.
+            app_config_cache_dir: Directory caching the user-defined config validator.
 
         Return:
             The CharmState instance created by the provided charm.
@@ -121,9 +128,9 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
             k: v for k, v in user_defined_config.items() if k not in framework_config.dict().keys()
         }
 
-        app_config_class = app_config_class_factory(charm_dir, framework)
+        app_config_validator = get_app_config_validator(charm_dir, framework, app_config_cache_dir)
         try:
-            app_config_class(**user_defined_config)
+            app_config_validator.validate_python(user_defined_config)
         except ValidationError as exc:
             error_messages = build_validation_error_message(exc, underscore_to_dash=True)
             logger.error(error_messages.long)
@@ -425,6 +432,87 @@ def app_config_class_factory(charm_dir: pathlib.Path, framework: str) -> type[Ba
     return create_model("AppConfig", **model_attributes)  # type: ignore[call-overload]
 
 
+def get_app_config_validator(
+    charm_dir: pathlib.Path, framework: str, cache_dir: pathlib.Path | None = None
+) -> pydantic_core.SchemaValidator:
+    """Get the validator of the user-defined configuration options.
+
+    Creating the AppConfig model is expensive and every hook runs in a new process, so the core
+    schema of the model is stored in the cache directory, keyed by a digest of the user-defined
+    configuration options. The model is created dynamically if the cache is missing or unusable,
+    and the schemas cached for previous configuration options are then removed.
+
+    Args:
+        charm_dir: The charm directory.
+        framework: The framework name.
+        cache_dir: The cache directory, or None to always create the model dynamically.
+
+    Returns:
+        The validator of the user-defined configuration options.
+    """
+    if cache_dir is None:
+        return typing.cast(
+            pydantic_core.SchemaValidator,
+            app_config_class_factory(charm_dir, framework).__pydantic_validator__,
+        )
+    config_options = config_metadata(pathlib.Path(charm_dir))["options"]
+    user_defined_options = {
+        option_name: option
+        for option_name, option in config_options.items()
+        if is_user_defined_config(option_name, framework)
+    }
+    digest = hashlib.sha256(
+        json.dumps(
+            [pydantic_core.__version__, user_defined_options], sort_keys=True, default=str
+        ).encode()
+    ).hexdigest()
+    cache_file = cache_dir / f"app-config-{digest}.json"
+    try:
+        return pydantic_core.SchemaValidator(json.loads(cache_file.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, pydantic_core.SchemaError):
+        logger.warning("Invalid AppConfig cache %s, ignoring it", cache_file, exc_info=True)
+
+    app_config_class = app_config_class_factory(charm_dir, framework)
+    try:
+        schema = json.dumps(_portable_core_schema(app_config_class.__pydantic_core_schema__))
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(schema, encoding="utf-8")
+        for stale_cache_file in cache_dir.glob("app-config-*.json"):
+            if stale_cache_file != cache_file:
+                stale_cache_file.unlink(missing_ok=True)
+    except (OSError, TypeError, ValueError):
+        logger.warning("Failed to cache the AppConfig schema in %s", cache_file, exc_info=True)
+    return typing.cast(pydantic_core.SchemaValidator, app_config_class.__pydantic_validator__)
+
+
+def _portable_core_schema(model_schema: typing.Any) -> dict:
+    """Extract the JSON serializable fields schema from the core schema of the AppConfig model.
+
+    Args:
+        model_schema: The pydantic core schema of the AppConfig model.
+
+    Returns:
+        The core schema validating the model fields, without pydantic internal metadata.
+
+    Raises:
+        ValueError: If the schema is not a plain model schema.
+    """
+    if model_schema.get("type") != "model":
+        raise ValueError(f"unexpected AppConfig core schema type {model_schema.get('type')}")
+
+    def _strip_metadata(value: typing.Any) -> typing.Any:
+        """Remove the metadata entries from a core schema."""
+        if isinstance(value, dict):
+            return {k: _strip_metadata(v) for k, v in value.items() if k != "metadata"}
+        if isinstance(value, list):
+            return [_strip_metadata(v) for v in value]
+        return value
+
+    return _strip_metadata(model_schema["schema"])
+
+
 def is_user_defined_config(option_name: str, framework: str) -> bool:
     """Check if a config option is user defined.
 
@@ -21,6 +21,9 @@ class PaasCharmBaseProtocol(typing.Protocol):  # pylint: disable=too-few-public-
     def _create_charm_state(self) -> CharmState:
         """Create charm state."""
 
+    def _hook_cache_scope(self) -> typing.ContextManager[None]:
+        """Memoize the state read from Juju while an event is being handled."""
+
     def update_app_and_unit_status(self, status: ops.StatusBase) -> None:
         """Update the application and unit status.
 
@@ -38,6 +41,8 @@ def block_if_invalid_data(
 ) -> typing.Callable[[C, E], None]:
     """Create a decorator that blocks the charm if the config or relation data is wrong.
 
+    The charm state is built once for the whole observer method and reused by it.
+
     Args:
         method: observer method to wrap.
 
@@ -57,8 +62,9 @@ def block_if_invalid_data(
             The value returned from the original function. That is, None.
         """
         try:
-            instance._create_charm_state()  # pylint: disable=protected-access
-            return method(instance, event)
+            with instance._hook_cache_scope():  # pylint: disable=protected-access
+                instance._create_charm_state()  # pylint: disable=protected-access
+                return method(instance, event)
         except CharmConfigInvalidError as exc:
             logger.exception("Wrong Charm Configuration")
             instance.update_app_and_unit_status(ops.BlockedStatus(exc.msg))
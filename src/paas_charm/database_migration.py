@@ -12,6 +12,7 @@ import ops
 from ops.pebble import ExecError
 
 from paas_charm.exceptions import CharmConfigInvalidError
+from paas_charm.timing import timed_phase
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +75,7 @@ class DatabaseMigration:
 
     # disable the too-many-arguments check because it's a wrapper around `ops.Container.exec`
     # pylint: disable=too-many-arguments
+    @timed_phase("database_migration.run")
     def run(
         self,
         *,
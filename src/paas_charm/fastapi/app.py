@@ -10,6 +10,12 @@ import pathlib
 import ops
 
 from paas_charm.app import App, WorkloadConfig
+from paas_charm.cgroup import (
+    available_cpus,
+    max_workers_for_memory,
+    read_memory_limit,
+    read_recorded_worker_memory,
+)
 from paas_charm.charm_state import CharmState
 from paas_charm.database_migration import DatabaseMigration
 from paas_charm.paas_config import LoggingFormat
@@ -22,6 +28,7 @@ logger = logging.getLogger(__name__)
 _LOG_CONFIG_DIR = pathlib.PurePosixPath("/tmp/fastapi/log_config")  # nosec: B108
 _HANDLER_FILE = "uvicorn_log_handler.py"
 _CONFIG_FILE = "uvicorn-log-config.json"
+_AUTO_WEB_CONCURRENCY = "auto"
 
 
 class FastAPIApp(App):
@@ -32,8 +39,16 @@ class FastAPIApp(App):
     a JSON formatter module and a uvicorn ``dictConfig`` logging configuration
     file into ``/tmp/fastapi/log_config/`` inside the container, then activates them
     via ``PYTHONPATH`` and ``UVICORN_LOG_CONFIG`` environment variables.
+
+    Attrs:
+        layer_environment_keys: environment variables read by uvicorn before the application
+            can read its environment file.
+        status_message: message of the active status of the charm, about the workload
+            configuration and the automatic sizing of the uvicorn workers.
     """
 
+    layer_environment_keys = frozenset({"PYTHONPATH", "UVICORN_LOG_CONFIG"})
+
     def __init__(
         self,
         *,
@@ -57,6 +72,20 @@ class FastAPIApp(App):
             database_migration=database_migration,
             framework_config_prefix="",
         )
+        self._auto_web_concurrency: int | None = None
+
+    @property
+    def status_message(self) -> str:
+        """The role of the unit and the web concurrency, if sized automatically."""
+        messages = [super().status_message]
+        if self._auto_web_concurrency is not None:
+            messages.append(f"web concurrency: {self._auto_web_concurrency} (auto)")
+        return ", ".join(filter(None, messages))
+
+    @property
+    def _sizes_workers_automatically(self) -> bool:
+        """Whether the uvicorn workers are sized automatically."""
+        return self._auto_web_concurrency is not None
 
     def _prepare_service_for_restart(self) -> None:
         """Push structured logging files to the container when JSON logging is configured."""
@@ -81,10 +110,18 @@ class FastAPIApp(App):
     def gen_environment(self) -> dict[str, str]:
         """Return the application environment, adding logging vars when JSON is configured.
 
+        The ``auto`` web concurrency is replaced by one uvicorn worker per CPU of the CPU quota
+        of the container, capped by its memory limit and the recorded memory of a worker. The
+        resources of the container are read again on every restart, so the sizing follows the
+        new limits of a rescheduled pod.
+
         Returns:
             A dictionary representing the application environment variables.
         """
         env = super().gen_environment()
+        if env.get("WEB_CONCURRENCY") == _AUTO_WEB_CONCURRENCY:
+            self._auto_web_concurrency = self._size_web_concurrency()
+            env["WEB_CONCURRENCY"] = str(self._auto_web_concurrency)
         if self._workload_config.logging_format == LoggingFormat.JSON:
             existing = env.get("PYTHONPATH", "")
             env["PYTHONPATH"] = (
@@ -93,6 +130,22 @@ class FastAPIApp(App):
             env["UVICORN_LOG_CONFIG"] = str(_LOG_CONFIG_DIR / _CONFIG_FILE)
         return env
 
+    def _size_web_concurrency(self) -> int:
+        """Size the uvicorn workers from the CPU quota and the memory limit of the container.
+
+        Returns:
+            The number of uvicorn workers.
+        """
+        workers = available_cpus(self._container)
+        max_workers = max_workers_for_memory(
+            read_memory_limit(self._container),
+            read_recorded_worker_memory(self._container, self._workload_config.state_dir),
+        )
+        if max_workers is not None:
+            workers = min(workers, max_workers)
+        logger.info("uvicorn automatic sizing: %s workers", workers)
+        return workers
+
 
 def _read_template(filename: str) -> str:
     """Read a file from the fastapi templates directory bundled with paas_charm."""
@@ -7,7 +7,7 @@ import pathlib
 import typing
 
 import ops
-from pydantic import ConfigDict, Field
+from pydantic import ConfigDict, Field, PositiveInt
 
 from paas_charm.app import App, WorkloadConfig
 from paas_charm.charm import PaasCharm
@@ -22,7 +22,8 @@ class FastAPIConfig(FrameworkConfig):
     Attrs:
         uvicorn_port: port where the application is listening
         uvicorn_host: The uvicorn host name or ip address where uvicorn is listening
-        web_concurrency: number of workers for uvicorn
+        web_concurrency: number of workers for uvicorn, ``auto`` to size them from the CPU
+            quota and the memory limit of the container.
         uvicorn_log_level: uvicorn log level
         metrics_port: port where the metrics are collected
         metrics_path: path where the metrics are collected
@@ -33,7 +34,9 @@ class FastAPIConfig(FrameworkConfig):
 
     uvicorn_port: int = Field(alias="webserver-port", default=8080, gt=0)
     uvicorn_host: str = Field(alias="webserver-host", default="0.0.0.0")  # nosec
-    web_concurrency: int = Field(alias="webserver-workers", default=1, gt=0)
+    web_concurrency: PositiveInt | typing.Literal["auto"] = Field(
+        alias="webserver-workers", default=1
+    )
     uvicorn_log_level: typing.Literal["critical", "error", "warning", "info", "debug", "trace"] = (
         Field(alias="webserver-log-level", default="info")
     )
@@ -63,10 +66,20 @@ class Charm(PaasCharm):
 
     @property
     def _workload_config(self) -> WorkloadConfig:
-        """Return an WorkloadConfig instance."""
+        """Return a WorkloadConfig instance, built once per event handler."""
+        return typing.cast(
+            WorkloadConfig, self._hook_cached("workload_config", self._create_workload_config)
+        )
+
+    def _create_workload_config(self) -> WorkloadConfig:
+        """Create a new WorkloadConfig instance.
+
+        Returns:
+            New WorkloadConfig.
+        """
         framework_name = self._framework_name
         base_dir = pathlib.Path("/app")
-        framework_config = typing.cast(FastAPIConfig, self.get_framework_config())
+        framework_config = typing.cast(FastAPIConfig, self._get_cached_framework_config())
         paas_config = read_paas_config()
         return WorkloadConfig(
             framework=framework_name,
@@ -80,6 +93,12 @@ class Charm(PaasCharm):
             metrics_path=framework_config.metrics_path,
             unit_name=self.unit.name,
             logging_format=paas_config.framework_logging_format,
+            services=paas_config.services,
+            environment_file=paas_config.environment_file,
+            peer_fqdns_file=paas_config.peer_fqdns_file,
+            peer_fqdns_signal=paas_config.peer_fqdns_signal,
+            unit_roles=self._unit_roles.allocation,
+            scheduler_shards=self._unit_roles.scheduler_shards,
         )
 
     def _create_app(self) -> App:
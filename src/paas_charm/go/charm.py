@@ -12,6 +12,7 @@ from pydantic import ConfigDict, Field
 from paas_charm.app import App, WorkloadConfig
 from paas_charm.charm import PaasCharm
 from paas_charm.framework import FrameworkConfig
+from paas_charm.paas_config import read_paas_config
 
 
 class GoConfig(FrameworkConfig):
@@ -53,10 +54,21 @@ class Charm(PaasCharm):
 
     @property
     def _workload_config(self) -> WorkloadConfig:
-        """Return an WorkloadConfig instance."""
+        """Return a WorkloadConfig instance, built once per event handler."""
+        return typing.cast(
+            WorkloadConfig, self._hook_cached("workload_config", self._create_workload_config)
+        )
+
+    def _create_workload_config(self) -> WorkloadConfig:
+        """Create a new WorkloadConfig instance.
+
+        Returns:
+            New WorkloadConfig.
+        """
         framework_name = self._framework_name
         base_dir = pathlib.Path("/app")
-        framework_config = typing.cast(GoConfig, self.get_framework_config())
+        framework_config = typing.cast(GoConfig, self._get_cached_framework_config())
+        paas_config = read_paas_config()
         return WorkloadConfig(
             framework=framework_name,
             port=framework_config.port,
@@ -68,6 +80,12 @@ class Charm(PaasCharm):
             unit_name=self.unit.name,
             metrics_target=f"*:{framework_config.metrics_port}",
             metrics_path=framework_config.metrics_path,
+            services=paas_config.services,
+            environment_file=paas_config.environment_file,
+            peer_fqdns_file=paas_config.peer_fqdns_file,
+            peer_fqdns_signal=paas_config.peer_fqdns_signal,
+            unit_roles=self._unit_roles.allocation,
+            scheduler_shards=self._unit_roles.scheduler_shards,
         )
 
     def _create_app(self) -> App:
@@ -3,6 +3,7 @@
 
 """Provide the Observability class to represent the observability stack for charms."""
 
+import json
 import logging
 import os.path
 import typing
@@ -22,6 +23,8 @@ logger = logging.getLogger(__name__)
 class Observability(ops.Object):
     """A class representing the observability stack for charm managed application."""
 
+    _stored = ops.StoredState()
+
     def __init__(  # pylint: disable=too-many-arguments
         self,
         *,
@@ -32,6 +35,8 @@ class Observability(ops.Object):
         metrics_target: str | None,
         metrics_path: str | None,
         prometheus_config: PrometheusConfig | None = None,
+        scheduler_units: typing.Sequence[str] = (SCHEDULER_UNIT_NUMBER,),
+        peer_relation_name: str = "secret-storage",
     ):
         """Initialize a new instance of the Observability class.
 
@@ -44,19 +49,36 @@ class Observability(ops.Object):
             metrics_target: Target to scrape for metrics.
             metrics_path: Path to scrape for metrics.
             prometheus_config: Custom Prometheus configuration from paas-config.yaml.
+            scheduler_units: Units running the schedulers, the @scheduler targets.
+            peer_relation_name: The name of the peer relation storing the scheduler units.
         """
         super().__init__(charm, "observability")
         self._charm = charm
+        self._stored.set_default(published_jobs=None)
         jobs = build_prometheus_jobs(
-            metrics_target, metrics_path, prometheus_config, charm.app.name, charm.model.name
+            metrics_target,
+            metrics_path,
+            prometheus_config,
+            charm.app.name,
+            charm.model.name,
+            scheduler_units=scheduler_units,
         )
+        self._jobs = json.dumps(jobs, sort_keys=True)
+        refresh_events = [
+            charm.on.config_changed,
+            charm.on[container_name].pebble_ready,
+            charm.on[peer_relation_name].relation_changed,
+        ]
         self._metrics_endpoint = MetricsEndpointProvider(
             charm,
             alert_rules_path=os.path.join(cos_dir, "prometheus_alert_rules"),
             jobs=jobs,
             relation_name="metrics-endpoint",
-            refresh_event=[charm.on.config_changed, charm.on[container_name].pebble_ready],
+            refresh_event=refresh_events,
         )
+        for refresh_event in [*refresh_events, charm.on["metrics-endpoint"].relation_joined]:
+            charm.framework.observe(refresh_event, self._on_jobs_published)
+        charm.framework.observe(charm.on.update_status, self._on_update_status)
         # The charm isn't necessarily bundled with charms.loki_k8s.v1
         # Dynamically switches between two versions here.
         if enable_pebble_log_forwarding():
@@ -98,6 +120,22 @@ class Observability(ops.Object):
             relation_name="grafana-dashboard",
         )
 
+    def _on_jobs_published(self, _: ops.HookEvent) -> None:
+        """Record the scrape jobs the metrics endpoint published in this hook."""
+        if self._stored.published_jobs != self._jobs:
+            self._stored.published_jobs = self._jobs
+
+    def _on_update_status(self, _: ops.UpdateStatusEvent) -> None:
+        """Publish the scrape jobs again if they changed since they were published.
+
+        The leader allocates the scheduler units after the jobs of the hook are built, so the
+        jobs it published in that hook miss the new scheduler units.
+        """
+        if self._stored.published_jobs == self._jobs:
+            return
+        self._metrics_endpoint.set_scrape_job_spec()
+        self._stored.published_jobs = self._jobs
+
 
 def build_prometheus_jobs(
     metrics_target: str | None,
@@ -105,6 +143,7 @@ def build_prometheus_jobs(
     prometheus_config: PrometheusConfig | None,
     app_name: str,
     model_name: str,
+    scheduler_units: typing.Sequence[str] = (SCHEDULER_UNIT_NUMBER,),
 ) -> list[dict[str, typing.Any]]:
     """Build Prometheus scrape jobs list from framework defaults and custom config.
 
@@ -114,6 +153,7 @@ def build_prometheus_jobs(
         prometheus_config: Custom Prometheus configuration from paas-config.yaml.
         app_name: Application name for @scheduler resolution.
         model_name: Juju model name for @scheduler resolution.
+        scheduler_units: Units running the schedulers, @scheduler expands to all of them.
 
     Returns:
         List of Prometheus job configurations (empty list if no jobs are configured).
@@ -122,9 +162,11 @@ def build_prometheus_jobs(
 
     # Add default framework job if configured. The library adds a default job_name.
     if metrics_path and metrics_target:
-        resolved_target = _resolve_scheduler_placeholder(app_name, model_name, metrics_target)
+        resolved_targets = _resolve_targets(
+            app_name, model_name, [metrics_target], scheduler_units
+        )
         jobs.append(
-            {"metrics_path": metrics_path, "static_configs": [{"targets": [resolved_target]}]}
+            {"metrics_path": metrics_path, "static_configs": [{"targets": resolved_targets}]}
         )
 
     # Add custom jobs from paas-config.yaml
@@ -132,10 +174,9 @@ def build_prometheus_jobs(
         for scrape_config in prometheus_config.scrape_configs:
             static_configs = []
             for sc in scrape_config.static_configs:
-                resolved_targets = [
-                    _resolve_scheduler_placeholder(app_name, model_name, target)
-                    for target in sc.targets
-                ]
+                resolved_targets = _resolve_targets(
+                    app_name, model_name, sc.targets, scheduler_units
+                )
                 config: dict[str, typing.Any] = {"targets": resolved_targets}
                 if sc.labels:
                     config["labels"] = sc.labels
@@ -152,13 +193,48 @@ def build_prometheus_jobs(
     return jobs
 
 
-def _resolve_scheduler_placeholder(app_name: str, model_name: str, target: str) -> str:
+def _resolve_targets(
+    app_name: str,
+    model_name: str,
+    targets: typing.Sequence[str],
+    scheduler_units: typing.Sequence[str],
+) -> list[str]:
+    """Replace every @scheduler placeholder with the FQDNs of all the scheduler units.
+
+    Args:
+        app_name: Application name (e.g., "flask-app").
+        model_name: Juju model name (e.g., "my-model").
+        targets: Target strings possibly containing @scheduler placeholders.
+        scheduler_units: Units running the schedulers, unit numbers or unit names.
+
+    Returns:
+        The targets, with one target per scheduler unit for the @scheduler placeholders.
+    """
+    resolved_targets: list[str] = []
+    for target in targets:
+        if target.startswith("@scheduler:"):
+            resolved_targets.extend(
+                _resolve_scheduler_placeholder(app_name, model_name, target, scheduler_unit)
+                for scheduler_unit in scheduler_units
+            )
+        else:
+            resolved_targets.append(target)
+    return resolved_targets
+
+
+def _resolve_scheduler_placeholder(
+    app_name: str,
+    model_name: str,
+    target: str,
+    scheduler_unit: str = SCHEDULER_UNIT_NUMBER,
+) -> str:
     """Replace @scheduler placeholder with scheduler unit FQDN.
 
     Args:
         app_name: Application name (e.g., "flask-app").
         model_name: Juju model name (e.g., "my-model").
         target: Target string possibly containing @scheduler placeholder.
+        scheduler_unit: Unit running the schedulers, unit number or unit name.
 
     Returns:
         Target with @scheduler replaced by scheduler unit's Kubernetes DNS FQDN,
@@ -170,6 +246,6 @@ def _resolve_scheduler_placeholder(app_name: str, model_name: str, target: str)
     """
     if target.startswith("@scheduler:"):
         port = target.split(":", 1)[1]
-        scheduler_fqdn = build_k8s_unit_fqdn(app_name, SCHEDULER_UNIT_NUMBER, model_name)
+        scheduler_fqdn = build_k8s_unit_fqdn(app_name, scheduler_unit, model_name)
         return f"{scheduler_fqdn}:{port}"
     return target
@@ -4,8 +4,10 @@
 """Module for reading and validating the paas-config.yaml configuration file."""
 
 import enum
+import hashlib
 import logging
 import pathlib
+import signal
 import typing
 from collections import Counter
 
@@ -14,6 +16,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    PositiveInt,
     ValidationError,
     field_validator,
     model_validator,
@@ -26,6 +29,9 @@ logger = logging.getLogger(__name__)
 
 CONFIG_FILE_NAME = "paas-config.yaml"
 
+# Validated paas-config.yaml files, keyed by the file path and the digest of its content.
+_PAAS_CONFIG_CACHE: dict[tuple[pathlib.Path, str], "PaasConfig"] = {}
+
 
 class LoggingFormat(str, enum.Enum):
     """Valid values for the ``framework_logging_format`` paas-config option.
@@ -43,6 +49,18 @@ class LoggingFormat(str, enum.Enum):
     JSON = "json"
 
 
+class EnvironmentFileFormat(str, enum.Enum):
+    """Valid values for the ``environment_file`` paas-config option.
+
+    Attributes:
+        JSON: A JSON object mapping the variable names to their values.
+        DOTENV: One ``NAME="value"`` line per variable, the value quoted as a JSON string.
+    """
+
+    JSON = "json"
+    DOTENV = "dotenv"
+
+
 # Mapping of LoggingFormat to the set of frameworks that support it.
 FRAMEWORKS_SUPPORTING_LOGGING_FORMAT: dict[LoggingFormat, set[str]] = {
     LoggingFormat.JSON: {"fastapi", "flask", "django"},
@@ -54,7 +72,7 @@ class StaticConfig(BaseModel):
 
     Attributes:
         targets: List of target hosts to scrape (e.g., ["*:8000", "localhost:9090"]).
-                 Supports @scheduler placeholder for targeting scheduler unit (unit 0).
+                 Supports @scheduler placeholder for targeting the scheduler units.
         labels: Optional labels to assign to all metrics from these targets.
         model_config: Pydantic model configuration.
     """
@@ -152,6 +170,92 @@ class PrometheusConfig(BaseModel):
         return self
 
 
+class ServiceRole(str, enum.Enum):
+    """Role of a Pebble service of the workload.
+
+    Attributes:
+        WEB: The service serving the application, it runs in every unit.
+        WORKER: A background worker service, it runs in every unit.
+        SCHEDULER: A scheduler service, it only runs in one unit.
+    """
+
+    WEB = "web"
+    WORKER = "worker"
+    SCHEDULER = "scheduler"
+
+
+# Sources of environment variables that a service can declare to consume.
+SERVICE_INTEGRATIONS = frozenset(
+    {
+        "mongodb",
+        "mysql",
+        "oauth",
+        "openfga",
+        "peer-fqdns",
+        "postgresql",
+        "rabbitmq",
+        "redis",
+        "s3",
+        "saml",
+        "smtp",
+        "tracing",
+    }
+)
+
+
+class ServiceConfig(BaseModel):
+    """Configuration of a Pebble service of the workload.
+
+    Attributes:
+        role: Role of the service, inferred from the service name if not set.
+        integrations: Integrations whose environment variables the service consumes,
+            ``peer-fqdns`` for the FQDNs of the peer units. All of them if not set.
+        config: Charm configuration options whose environment variables the service
+            consumes. All of them if not set.
+        replicas: Number of processes of a worker service, ``auto`` for one per CPU of the
+            container.
+        model_config: Pydantic model configuration.
+    """
+
+    role: ServiceRole | None = Field(default=None, description="Role of the service")
+    integrations: typing.List[str] | None = Field(
+        default=None, description="Integrations whose environment variables the service consumes"
+    )
+    config: typing.List[str] | None = Field(
+        default=None,
+        description="Configuration options whose environment variables the service consumes",
+    )
+    replicas: PositiveInt | typing.Literal["auto"] | None = Field(
+        default=None, description="Number of processes of a worker service"
+    )
+
+    model_config = ConfigDict(extra="forbid")
+
+    @field_validator("integrations")
+    @classmethod
+    def validate_integrations(
+        cls, integrations: typing.List[str] | None
+    ) -> typing.List[str] | None:
+        """Validate that the integrations are known sources of environment variables.
+
+        Args:
+            integrations: List of integration names to validate.
+
+        Returns:
+            The validated integrations list.
+
+        Raises:
+            ValueError: If an integration is unknown.
+        """
+        unknown = sorted(set(integrations or ()) - SERVICE_INTEGRATIONS)
+        if unknown:
+            raise ValueError(
+                f"Unknown integrations {', '.join(unknown)}, "
+                f"valid values: {', '.join(sorted(SERVICE_INTEGRATIONS))}"
+            )
+        return integrations
+
+
 class PaasConfig(BaseModel):
     """Configuration from paas-config.yaml file.
 
@@ -160,6 +264,19 @@ class PaasConfig(BaseModel):
         framework_logging_format: Structured logging format for the framework server.
             Defaults to ``LoggingFormat.NONE`` (framework default logging).
             ``LoggingFormat.JSON`` ("json") is supported for FastAPI, Flask, and Django.
+        coalesce_restarts: Coalesce the restarts triggered by bursts of integration events
+            into one restart, requires Pebble custom notices (Juju 3.4 or newer).
+        reconcile_events: Handle all the events that change the workload with one reconcile
+            at the end of the hook, instead of one restart per event.
+        services: Configuration of the Pebble services of the workload, by service name.
+        environment_file: Deliver the environment of the web service in a file of this
+            format, reloaded in place with SIGHUP instead of restarting the service.
+        max_concurrent_restarts: Maximum number of units restarting the workload at a time,
+            coordinated through the peer relation. The units restart independently if not set.
+        peer_fqdns_file: Deliver the FQDNs of the peer units in a file updated in place,
+            instead of the ``PEER_FQDNS`` environment variable restarting the services.
+        peer_fqdns_signal: Name of the signal sent to the services consuming the peer FQDNs
+            file when it changes, no signal if not set.
         model_config: Pydantic model configuration.
     """
 
@@ -170,6 +287,34 @@ class PaasConfig(BaseModel):
         default=LoggingFormat.NONE,
         description="Structured logging format for the framework server (e.g. 'json').",
     )
+    coalesce_restarts: bool = Field(
+        default=False,
+        description="Coalesce the restarts triggered by bursts of integration events.",
+    )
+    reconcile_events: bool = Field(
+        default=False,
+        description="Reconcile the workload once per hook for all the workload events.",
+    )
+    services: typing.Dict[str, ServiceConfig] = Field(
+        default_factory=dict, description="Configuration of the Pebble services of the workload"
+    )
+    environment_file: EnvironmentFileFormat | None = Field(
+        default=None,
+        description="Format of the file delivering the environment of the web service.",
+    )
+    max_concurrent_restarts: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of units restarting the workload at a time.",
+    )
+    peer_fqdns_file: bool = Field(
+        default=False,
+        description="Deliver the FQDNs of the peer units in a file instead of the environment.",
+    )
+    peer_fqdns_signal: str | None = Field(
+        default=None,
+        description="Signal sent to the services when the peer FQDNs file changes.",
+    )
 
     @field_validator("framework_logging_format", mode="before")
     @classmethod
@@ -185,12 +330,47 @@ class PaasConfig(BaseModel):
         """
         return LoggingFormat.NONE if v is None else v
 
+    @field_validator("peer_fqdns_signal")
+    @classmethod
+    def validate_peer_fqdns_signal(cls, peer_fqdns_signal: str | None) -> str | None:
+        """Validate that the peer FQDNs signal is a signal name.
+
+        Args:
+            peer_fqdns_signal: Name of the signal to validate.
+
+        Returns:
+            The validated signal name.
+
+        Raises:
+            ValueError: If the signal name is unknown.
+        """
+        if peer_fqdns_signal is not None and peer_fqdns_signal not in signal.Signals.__members__:
+            raise ValueError(f"Unknown signal {peer_fqdns_signal}, e.g. SIGHUP or SIGUSR1")
+        return peer_fqdns_signal
+
+    @model_validator(mode="after")
+    def validate_peer_fqdns_signal_requires_file(self) -> "PaasConfig":
+        """Validate that the peer FQDNs signal is only set with the peer FQDNs file.
+
+        Returns:
+            The validated PaasConfig instance.
+
+        Raises:
+            ValueError: If the signal is set without the file.
+        """
+        if self.peer_fqdns_signal is not None and not self.peer_fqdns_file:
+            raise ValueError("peer_fqdns_signal requires peer_fqdns_file")
+        return self
+
     model_config = ConfigDict(extra="forbid", populate_by_name=True)
 
 
 def read_paas_config(charm_root: pathlib.Path | None = None) -> PaasConfig:
     """Read and validate the paas-config.yaml file.
 
+    The file is parsed and validated once per content, later calls with an unchanged file
+    return the same PaasConfig object, which must not be modified.
+
     Args:
         charm_root: Path to the charm root directory. If None, uses current directory.
 
@@ -211,21 +391,29 @@ def read_paas_config(charm_root: pathlib.Path | None = None) -> PaasConfig:
         return PaasConfig()
 
     try:
-        with config_path.open("r", encoding="utf-8") as config_file:
-            config_data = yaml.safe_load(config_file) or {}
-    except yaml.YAMLError as exc:
-        error_msg = f"Invalid YAML in {CONFIG_FILE_NAME}: {exc}"
-        logger.error(error_msg)
-        raise PaasConfigError(error_msg) from exc
+        content = config_path.read_bytes()
     except (OSError, IOError) as exc:
         error_msg = f"Failed to read {CONFIG_FILE_NAME}: {exc}"
         logger.error(error_msg)
         raise PaasConfigError(error_msg) from exc
 
+    cache_key = (config_path.absolute(), hashlib.sha256(content).hexdigest())
+    if (paas_config := _PAAS_CONFIG_CACHE.get(cache_key)) is not None:
+        return paas_config
+
+    try:
+        config_data = yaml.safe_load(content) or {}
+    except yaml.YAMLError as exc:
+        error_msg = f"Invalid YAML in {CONFIG_FILE_NAME}: {exc}"
+        logger.error(error_msg)
+        raise PaasConfigError(error_msg) from exc
+
     try:
-        return PaasConfig(**config_data)
+        paas_config = PaasConfig(**config_data)
     except ValidationError as exc:
         error_details = build_validation_error_message(exc, underscore_to_dash=True)
         error_msg = f"Invalid {CONFIG_FILE_NAME}: {error_details.short}"
         logger.error("%s: %s", error_msg, error_details.long)
         raise PaasConfigError(error_msg) from exc
+    _PAAS_CONFIG_CACHE[cache_key] = paas_config
+    return paas_config
@@ -0,0 +1,71 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Provide the RestartCoalescer class to coalesce bursts of restart-triggering events."""
+
+import logging
+
+import ops
+
+logger = logging.getLogger(__name__)
+
+RESTART_NOTICE_KEY = "canonical.com/paas-charm/restart"
+
+
+class RestartCoalescer(ops.Object):
+    """A class that coalesces the restarts requested by bursts of events into one restart.
+
+    Instead of restarting the workload, an event marks the restart as pending and records
+    a Pebble custom notice, Juju then emits a pebble-custom-notice event after the events
+    already queued. Only the first event of a burst records the notice, the following
+    events find the restart already pending, so the burst costs one restart.
+    """
+
+    _stored = ops.StoredState()
+
+    def __init__(self, charm: ops.CharmBase, container_name: str):
+        """Initialize the RestartCoalescer with a given charm object.
+
+        Args:
+            charm: The charm object that uses the RestartCoalescer.
+            container_name: The name of the workload container.
+        """
+        super().__init__(parent=charm, key="restart-coalescer")
+        self._container = charm.unit.get_container(container_name)
+        self._stored.set_default(pending=False, rerun_migrations=False)
+
+    def schedule(self, rerun_migrations: bool = False) -> bool:
+        """Schedule a restart of the workload after the queued events.
+
+        Args:
+            rerun_migrations: whether it is necessary to run the migrations again.
+
+        Returns:
+            True if the restart is scheduled, False if the workload container is not
+            reachable and the restart must be done right away.
+        """
+        if rerun_migrations:
+            self._stored.rerun_migrations = True
+        if bool(self._stored.pending):
+            logger.debug("restart already scheduled")
+            return True
+        if not self._container.can_connect():
+            return False
+        self._container.pebble.notify(ops.pebble.NoticeType.CUSTOM, RESTART_NOTICE_KEY)
+        self._stored.pending = True
+        logger.info("restart scheduled")
+        return True
+
+    def mark_restarted(self) -> None:
+        """Mark the scheduled restart as done, the next schedule records a new notice."""
+        self._stored.pending = False
+
+    def pop_rerun_migrations(self) -> bool:
+        """Get and reset whether a scheduled restart requires to run the migrations again.
+
+        Returns:
+            True if the migrations need to run again.
+        """
+        rerun_migrations = bool(self._stored.rerun_migrations)
+        self._stored.rerun_migrations = False
+        return rerun_migrations
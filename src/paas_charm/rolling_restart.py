@@ -0,0 +1,264 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Provide the RollingRestart class to coordinate the restarts of the units."""
+
+import json
+import logging
+import re
+import socket
+import time
+import typing
+
+import ops
+
+logger = logging.getLogger(__name__)
+
+RESTART_REQUEST_KEY = "restart-request"
+RESTART_LEASES_KEY = "restart-leases"
+RESTARTED_NOTICE_KEY = "canonical.com/paas-charm/restarted"
+
+# Defaults of Pebble for the period and the timeout of a check.
+DEFAULT_CHECK_PERIOD = 10.0
+DEFAULT_CHECK_TIMEOUT = 3.0
+PORT_PROBE_TIMEOUT = 1.0
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001, "us": 1e-6, "µs": 1e-6}
+
+
+class RollingRestart(ops.Object):
+    """A class that lets at most a given number of units restart the workload at a time.
+
+    A unit that has to restart a running workload requests a restart lease in its peer
+    relation data, then waits for the leader to grant it in the application peer relation
+    data. Every change of the peer relation data triggers a relation-changed event on the
+    other units, which drives the restarts forward.
+
+    The unit never releases the lease in the hook restarting the workload, the Pebble checks
+    still report the state from before the restart. It records a Pebble custom notice instead,
+    and releases the lease in a later hook once its workload is ready again: the hook of the
+    notice, of a recovered Pebble check, of a peer relation change or of update-status. The
+    leader then grants the lease to the next unit.
+
+    Attributes:
+        holds_lease: Whether this unit holds a restart lease.
+    """
+
+    _stored = ops.StoredState()
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        charm: ops.CharmBase,
+        container_name: str,
+        max_units: int,
+        is_workload_ready: typing.Callable[[float], bool],
+        peer_relation_name: str = "secret-storage",
+    ):
+        """Initialize the RollingRestart with a given charm object.
+
+        Args:
+            charm: The charm object that uses the RollingRestart.
+            container_name: The name of the workload container.
+            max_units: The maximum number of units restarting the workload at a time.
+            is_workload_ready: Check if the workload of the unit is ready to serve requests
+                since the given restart time.
+            peer_relation_name: The name of the peer relation used to coordinate the units.
+        """
+        super().__init__(parent=charm, key="rolling-restart")
+        self._charm = charm
+        self._container = charm.unit.get_container(container_name)
+        self._max_units = max_units
+        self._is_workload_ready = is_workload_ready
+        self._peer_relation_name = peer_relation_name
+        self._restarted_in_hook = False
+        self._stored.set_default(restarted_at=0.0)
+        charm.framework.observe(
+            charm.on[peer_relation_name].relation_changed, self._on_peer_relation_changed
+        )
+        charm.framework.observe(
+            charm.on[peer_relation_name].relation_departed, self._on_peer_relation_changed
+        )
+        charm.framework.observe(charm.on.leader_elected, self._on_peer_relation_changed)
+        charm.framework.observe(charm.on.update_status, self._on_release_event)
+        charm.framework.observe(
+            charm.on[container_name].pebble_custom_notice, self._on_pebble_custom_notice
+        )
+        # The pebble-check-recovered event only exists from ops 2.15.
+        check_recovered = getattr(charm.on[container_name], "pebble_check_recovered", None)
+        if check_recovered is not None:
+            charm.framework.observe(check_recovered, self._on_release_event)
+
+    @property
+    def _relation(self) -> ops.Relation | None:
+        """The peer relation used to coordinate the units."""
+        return self.model.get_relation(self._peer_relation_name)
+
+    @property
+    def holds_lease(self) -> bool:
+        """Whether this unit holds a restart lease."""
+        relation = self._relation
+        if relation is None:
+            return False
+        return self._charm.unit.name in _read_leases(relation.data[self._charm.app])
+
+    def acquire(self) -> bool:
+        """Request a restart lease, granted right away if this unit is the leader.
+
+        Returns:
+            True if this unit holds a restart lease, False if it has to wait for it.
+        """
+        relation = self._relation
+        if relation is None:
+            return True
+        relation.data[self._charm.unit][RESTART_REQUEST_KEY] = "true"
+        self._grant_leases()
+        if self.holds_lease:
+            return True
+        logger.info("waiting for a restart lease")
+        return False
+
+    def mark_restarted(self) -> None:
+        """Record the restart of the workload, the lease is released by a later hook."""
+        if not self.holds_lease:
+            return
+        self._stored.restarted_at = time.time()
+        self._restarted_in_hook = True
+        if self._container.can_connect():
+            self._container.pebble.notify(ops.pebble.NoticeType.CUSTOM, RESTARTED_NOTICE_KEY)
+
+    def release_if_ready(self) -> bool:
+        """Release the restart lease of this unit if its workload is ready again.
+
+        Returns:
+            True if the unit holds no restart lease anymore.
+        """
+        if not self.holds_lease:
+            return True
+        if self._restarted_in_hook:
+            logger.info("workload restarted in this hook, keeping the restart lease")
+            return False
+        if not self._is_workload_ready(typing.cast(float, self._stored.restarted_at)):
+            logger.info("workload not ready, keeping the restart lease")
+            return False
+        relation = typing.cast(ops.Relation, self._relation)
+        relation.data[self._charm.unit].pop(RESTART_REQUEST_KEY, None)
+        self._grant_leases()
+        logger.info("restart lease released")
+        return True
+
+    def _grant_leases(self) -> None:
+        """Drop the released leases and grant the free ones to the waiting units, if leader."""
+        relation = self._relation
+        if relation is None or not self._charm.unit.is_leader():
+            return
+        units = sorted(
+            {*relation.units, self._charm.unit}, key=lambda unit: int(unit.name.split("/")[1])
+        )
+        requests = [unit.name for unit in units if relation.data[unit].get(RESTART_REQUEST_KEY)]
+        app_data = relation.data[self._charm.app]
+        current_leases = _read_leases(app_data)
+        leases = [unit_name for unit_name in current_leases if unit_name in requests]
+        for unit_name in requests:
+            if len(leases) >= self._max_units:
+                break
+            if unit_name not in leases:
+                leases.append(unit_name)
+        if leases != current_leases:
+            logger.info("restart leases: %s", leases)
+            app_data[RESTART_LEASES_KEY] = json.dumps(leases)
+
+    def _on_peer_relation_changed(self, _: ops.HookEvent) -> None:
+        """Release the restart lease of this unit if ready, and grant the leases if leader."""
+        self.release_if_ready()
+        self._grant_leases()
+
+    def _on_release_event(self, _: ops.HookEvent) -> None:
+        """Release the restart lease of this unit if its workload became ready since."""
+        self.release_if_ready()
+
+    def _on_pebble_custom_notice(self, event: ops.PebbleCustomNoticeEvent) -> None:
+        """Release the restart lease of this unit after the hook restarting the workload.
+
+        Args:
+            event: the event that triggered this handler.
+        """
+        if event.notice.key == RESTARTED_NOTICE_KEY:
+            # Pebble delivers the notice after the hook that restarted the workload.
+            self._restarted_in_hook = False
+            self.release_if_ready()
+
+
+def _read_leases(app_data: ops.RelationDataContent) -> list[str]:
+    """Read the names of the units holding a restart lease.
+
+    Args:
+        app_data: The application peer relation data.
+
+    Returns:
+        The names of the units holding a restart lease, in the order they were granted.
+    """
+    return json.loads(app_data.get(RESTART_LEASES_KEY, "[]"))
+
+
+def ready_checks_succeeded_since(container: ops.Container, restarted_at: float) -> bool | None:
+    """Check if the readiness checks of the workload succeeded since a restart.
+
+    The status of a check only changes after its threshold of failures, so it is still up
+    right after the restart. Pebble runs a check every period, resets its failures when it
+    succeeds and does not report when it last ran, so a check has succeeded since the restart
+    if it is up without failures a period and a timeout after the restart.
+
+    Args:
+        container: The workload container.
+        restarted_at: The time of the restart, in seconds since the epoch.
+
+    Returns:
+        True if every readiness check succeeded since the restart, False if one has not, None
+        if the workload has no readiness checks.
+    """
+    checks = container.get_checks(level=ops.pebble.CheckLevel.READY)
+    if not checks:
+        return None
+    plan_checks = container.get_plan().checks
+    elapsed = time.time() - restarted_at
+    for name, check in checks.items():
+        if check.status != ops.pebble.CheckStatus.UP or check.failures:
+            return False
+        plan_check = plan_checks.get(name)
+        period = parse_duration(plan_check.period) if plan_check else None
+        timeout = parse_duration(plan_check.timeout) if plan_check else None
+        if elapsed < (period or DEFAULT_CHECK_PERIOD) + (timeout or DEFAULT_CHECK_TIMEOUT):
+            return False
+    return True
+
+
+def is_port_open(port: int) -> bool:
+    """Check if the workload accepts connections on a port.
+
+    The charm container shares the network namespace of the workload container.
+
+    Args:
+        port: The port of the workload.
+
+    Returns:
+        True if a TCP connection to the port succeeds.
+    """
+    try:
+        with socket.create_connection(("localhost", port), timeout=PORT_PROBE_TIMEOUT):
+            return True
+    except OSError:
+        return False
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse a Pebble duration, such as ``10s`` or ``1m30s``.
+
+    Args:
+        value: The duration, empty or None for the default duration.
+
+    Returns:
+        The duration in seconds, None if the duration is empty or invalid.
+    """
+    parts = re.findall(r"(\d+(?:\.\d*)?)(h|ms|us|µs|m|s)", value or "")
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
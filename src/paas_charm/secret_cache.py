@@ -0,0 +1,73 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Provide the SecretContentCache for reading the secrets referenced by the charm config."""
+
+import ops
+
+from paas_charm.timing import timed_phase
+
+
+def _secret_key(secret_id: str) -> str:
+    """Get the cache key of a secret, independent of the secret ID format.
+
+    Args:
+        secret_id: the secret ID, as ``secret:<id>`` or ``secret://<model-uuid>/<id>``.
+
+    Returns:
+        The unique identifier part of the secret ID.
+    """
+    return secret_id.rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+
+
+class SecretContentCache(ops.Object):
+    """A class that caches the content of the Juju secrets read by the charm in a hook.
+
+    A secret is refreshed to its latest revision the first time it is read in a hook, so a
+    missed secret-changed event does not leave the charm on an old revision, and the content
+    is cached by secret ID for the rest of the hook. Only secret owners can read the revision
+    of a secret, so the cache cannot be kept across hooks by revision.
+    """
+
+    def __init__(self, charm: ops.CharmBase):
+        """Initialize the SecretContentCache with a given charm object.
+
+        The cache must be created before other secret-changed observers of the charm,
+        so the cached content is discarded before they run.
+
+        Args:
+            charm: The charm object that uses the SecretContentCache.
+        """
+        super().__init__(parent=charm, key="secret-content-cache")
+        self._contents: dict[str, dict[str, str]] = {}
+        charm.framework.observe(charm.on.secret_changed, self._on_secret_changed)
+
+    def _on_secret_changed(self, event: ops.SecretChangedEvent) -> None:
+        """Discard the cached content of the changed secret, read before the event in the hook.
+
+        Args:
+            event: The event that triggered this handler.
+        """
+        if event.secret.id is None:
+            return
+        self._contents.pop(_secret_key(event.secret.id), None)
+
+    def get_content(self, secret: ops.Secret) -> dict[str, str]:
+        """Get the content of the latest revision of a secret, read once in the hook.
+
+        Args:
+            secret: The secret, it must have an ID.
+
+        Returns:
+            The secret content.
+
+        Raises:
+            ValueError: If the secret has no ID.
+        """
+        if secret.id is None:
+            raise ValueError("only secrets with an ID can be cached")
+        key = _secret_key(secret.id)
+        if key not in self._contents:
+            with timed_phase("secret.get_content"):
+                self._contents[key] = secret.get_content(refresh=True)
+        return dict(self._contents[key])
@@ -0,0 +1,79 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Provide the timing of the phases of the charm hooks."""
+
+import contextlib
+import json
+import logging
+import time
+import typing
+
+import ops
+
+try:
+    from opentelemetry import trace
+except ImportError:  # opentelemetry-api is only a dependency of recent ops versions.
+    trace = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_tracer = trace.get_tracer("paas_charm") if trace is not None else None
+
+# Durations in seconds of the phases timed in the current hook, in completion order.
+_PHASES: list[tuple[str, float]] = []
+
+
+@contextlib.contextmanager
+def timed_phase(name: str) -> typing.Iterator[None]:
+    """Time a phase of the hook and trace it as a span.
+
+    It can be used as a context manager or as a decorator.
+
+    Args:
+        name: the name of the phase.
+    """
+    span = _tracer.start_as_current_span(name) if _tracer is not None else contextlib.nullcontext()
+    start = time.perf_counter()
+    try:
+        with span:
+            yield
+    finally:
+        _PHASES.append((name, time.perf_counter() - start))
+
+
+def pop_phase_summary() -> dict[str, dict[str, float]]:
+    """Get the summary of the phases timed in the current hook and reset it.
+
+    Returns:
+        The number of runs and the total duration in milliseconds of each phase.
+    """
+    summary: dict[str, dict[str, float]] = {}
+    for name, duration in _PHASES:
+        phase = summary.setdefault(name, {"count": 0, "total_ms": 0.0})
+        phase["count"] += 1
+        phase["total_ms"] += duration * 1000
+    for phase in summary.values():
+        phase["total_ms"] = round(phase["total_ms"], 3)
+    _PHASES.clear()
+    return summary
+
+
+def log_phase_summary() -> None:
+    """Log the summary of the phases timed in the current hook as JSON, and reset it."""
+    summary = pop_phase_summary()
+    if summary:
+        logger.info("hook phases: %s", json.dumps(summary, sort_keys=True))
+
+
+def set_tracing_destination(endpoint: str | None) -> None:
+    """Send the charm traces to a Tempo OTLP HTTP endpoint, requires ``ops[tracing]``.
+
+    Args:
+        endpoint: the Tempo OTLP HTTP endpoint, None to stop sending the traces.
+    """
+    ops_tracing = getattr(ops, "tracing", None)
+    if ops_tracing is None:
+        return
+    url = f"{endpoint.rstrip('/')}/v1/traces" if endpoint else None
+    ops_tracing.set_destination(url=url, ca=None)
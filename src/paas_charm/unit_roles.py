@@ -0,0 +1,228 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Provide the UnitRoles class to dedicate the units to the web, worker or scheduler role."""
+
+import json
+import logging
+
+import ops
+
+from paas_charm.exceptions import CharmConfigInvalidError
+from paas_charm.paas_config import ServiceRole
+
+logger = logging.getLogger(__name__)
+
+UNIT_ROLES_CONFIG = "app-unit-roles"
+UNIT_ROLES_KEY = "unit-roles"
+SCHEDULER_SHARDS_KEY = "scheduler-shards"
+
+# Roles that the configuration can request units for, in allocation order.
+# The web role gets the remaining units.
+DEDICATED_ROLES = (ServiceRole.SCHEDULER, ServiceRole.WORKER)
+
+
+class UnitRoles(ops.Object):
+    """A class that allocates a role to every unit of the application.
+
+    The ``app-unit-roles`` configuration option requests a number of units for the worker
+    and scheduler roles, for example ``worker=2,scheduler=1``. The leader allocates the roles
+    to the units and stores the allocation in the application peer relation data, every
+    other unit is a web unit. The leader is always a web unit, since it publishes the
+    application data of the ingress. The units keep their role as long as the configuration
+    allows, so scaling the application only allocates a role to the new units. Without the
+    option, the units have no dedicated role and run all the services.
+
+    The leader also assigns a scheduler shard index to every scheduler unit. A scheduler unit
+    keeps its shard while the number of scheduler units allows, a new scheduler unit takes
+    over the shard of a removed one.
+
+    Attributes:
+        allocation: The role of every unit by unit name, empty if the units have no
+            dedicated role.
+        scheduler_shards: The shard index of every scheduler unit by unit name.
+    """
+
+    def __init__(self, charm: ops.CharmBase, peer_relation_name: str = "secret-storage"):
+        """Initialize the UnitRoles with a given charm object.
+
+        Args:
+            charm: The charm object that uses the UnitRoles.
+            peer_relation_name: The name of the peer relation storing the allocation.
+        """
+        super().__init__(parent=charm, key="unit-roles")
+        self._charm = charm
+        self._peer_relation_name = peer_relation_name
+        charm.framework.observe(charm.on.config_changed, self._on_allocation_changed)
+        charm.framework.observe(charm.on.leader_elected, self._on_allocation_changed)
+        charm.framework.observe(
+            charm.on[peer_relation_name].relation_changed, self._on_allocation_changed
+        )
+        charm.framework.observe(
+            charm.on[peer_relation_name].relation_departed, self._on_allocation_changed
+        )
+
+    @property
+    def _relation(self) -> ops.Relation | None:
+        """The peer relation storing the allocation."""
+        return self.model.get_relation(self._peer_relation_name)
+
+    @property
+    def allocation(self) -> dict[str, ServiceRole]:
+        """The role of every unit by unit name, empty if the units have no dedicated role."""
+        relation = self._relation
+        if relation is None:
+            return {}
+        allocation = json.loads(relation.data[self._charm.app].get(UNIT_ROLES_KEY, "{}"))
+        return {unit_name: ServiceRole(role) for unit_name, role in allocation.items()}
+
+    @property
+    def scheduler_shards(self) -> dict[str, int]:
+        """The shard index of every scheduler unit by unit name."""
+        relation = self._relation
+        if relation is None:
+            return {}
+        return json.loads(relation.data[self._charm.app].get(SCHEDULER_SHARDS_KEY, "{}"))
+
+    def requested_units(self) -> dict[ServiceRole, int]:
+        """Get the number of units requested for each dedicated role by the configuration.
+
+        Returns:
+            The number of units by role, empty if the units have no dedicated role.
+        """
+        return parse_unit_roles(str(self._charm.config.get(UNIT_ROLES_CONFIG) or ""))
+
+    def _allocate(self) -> None:
+        """Allocate the roles to the units of the application, if leader."""
+        relation = self._relation
+        if relation is None or not self._charm.unit.is_leader():
+            return
+        try:
+            requested_units = self.requested_units()
+        except CharmConfigInvalidError as exc:
+            logger.error("invalid %s configuration: %s", UNIT_ROLES_CONFIG, exc.msg)
+            return
+        app_data = relation.data[self._charm.app]
+        if not requested_units:
+            app_data.pop(UNIT_ROLES_KEY, None)
+            app_data.pop(SCHEDULER_SHARDS_KEY, None)
+            return
+        unit_names = [unit.name for unit in {*relation.units, self._charm.unit}]
+        allocation = allocate_unit_roles(
+            unit_names, requested_units, self.allocation, leader_name=self._charm.unit.name
+        )
+        if allocation != self.allocation:
+            logger.info("unit roles: %s", allocation)
+            app_data[UNIT_ROLES_KEY] = json.dumps(
+                {unit_name: role.value for unit_name, role in allocation.items()}
+            )
+        scheduler_shards = assign_scheduler_shards(
+            [unit_name for unit_name, role in allocation.items() if role == ServiceRole.SCHEDULER],
+            self.scheduler_shards,
+        )
+        if scheduler_shards != self.scheduler_shards:
+            logger.info("scheduler shards: %s", scheduler_shards)
+            app_data[SCHEDULER_SHARDS_KEY] = json.dumps(scheduler_shards)
+
+    def _on_allocation_changed(self, _: ops.HookEvent) -> None:
+        """Allocate the roles again when the configuration or the units change, if leader."""
+        self._allocate()
+
+
+def parse_unit_roles(value: str) -> dict[ServiceRole, int]:
+    """Parse the number of units of each dedicated role, as in ``worker=2,scheduler=1``.
+
+    Args:
+        value: The value of the ``app-unit-roles`` configuration option.
+
+    Returns:
+        The number of units by role.
+
+    Raises:
+        CharmConfigInvalidError: If the value is not valid.
+    """
+    requested_units: dict[ServiceRole, int] = {}
+    for item in filter(None, (item.strip() for item in value.split(","))):
+        role_name, _, count = item.partition("=")
+        try:
+            role = ServiceRole(role_name.strip())
+            units = int(count)
+        except ValueError as exc:
+            raise CharmConfigInvalidError(
+                f"invalid {UNIT_ROLES_CONFIG} item '{item}', expected <role>=<units>"
+            ) from exc
+        if role not in DEDICATED_ROLES or units < 0:
+            raise CharmConfigInvalidError(
+                f"invalid {UNIT_ROLES_CONFIG} item '{item}', "
+                f"valid roles: {', '.join(role.value for role in DEDICATED_ROLES)}"
+            )
+        requested_units[role] = units
+    return requested_units
+
+
+def allocate_unit_roles(
+    unit_names: list[str],
+    requested_units: dict[ServiceRole, int],
+    current_allocation: dict[str, ServiceRole],
+    leader_name: str,
+) -> dict[str, ServiceRole]:
+    """Allocate the roles to the units, the leader being a web unit.
+
+    The units keep their current dedicated role while the role needs units. The roles that
+    still need units are then allocated to the highest numbered units, the other units are
+    web units. The leader is always a web unit, so a new leader gives its dedicated role to
+    another unit.
+
+    Args:
+        unit_names: The names of the units of the application.
+        requested_units: The number of units requested for each dedicated role.
+        current_allocation: The current role of the units.
+        leader_name: The name of the leader unit.
+
+    Returns:
+        The role of every unit by unit name.
+    """
+    unit_names = sorted(unit_names, key=lambda unit_name: int(unit_name.split("/")[1]))
+    missing_units = dict(requested_units)
+    allocation: dict[str, ServiceRole] = {leader_name: ServiceRole.WEB}
+    for unit_name in unit_names:
+        role = current_allocation.get(unit_name)
+        if unit_name not in allocation and role in DEDICATED_ROLES and missing_units.get(role):
+            allocation[unit_name] = role
+            missing_units[role] -= 1
+    for unit_name in reversed(unit_names):
+        if unit_name in allocation:
+            continue
+        role = next((role for role in DEDICATED_ROLES if missing_units.get(role)), None)
+        allocation[unit_name] = role or ServiceRole.WEB
+        if role is not None:
+            missing_units[role] -= 1
+    return dict(sorted(allocation.items(), key=lambda item: int(item[0].split("/")[1])))
+
+
+def assign_scheduler_shards(
+    unit_names: list[str], current_shards: dict[str, int]
+) -> dict[str, int]:
+    """Assign a shard index to every scheduler unit, keeping the current assignment if possible.
+
+    The units keep their shard index while it is lower than the number of scheduler units.
+    The free shard indexes are then assigned to the other units in unit number order.
+
+    Args:
+        unit_names: The names of the scheduler units.
+        current_shards: The current shard index of the units.
+
+    Returns:
+        The shard index of every scheduler unit by unit name.
+    """
+    unit_names = sorted(unit_names, key=lambda unit_name: int(unit_name.split("/")[1]))
+    shards: dict[str, int] = {}
+    for unit_name in unit_names:
+        shard = current_shards.get(unit_name)
+        if shard is not None and shard < len(unit_names) and shard not in shards.values():
+            shards[unit_name] = shard
+    free_shards = iter(sorted(set(range(len(unit_names))) - set(shards.values())))
+    for unit_name in unit_names:
+        if unit_name not in shards:
+            shards[unit_name] = next(free_shards)
+    return dict(sorted(shards.items(), key=lambda item: item[1]))
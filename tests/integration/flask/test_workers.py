@@ -127,6 +127,7 @@ def test_async_workers(
 
     # Use threading to make concurrent requests
     def fetch_page():
+        """Request a page taking 2 seconds to serve."""
         params = {"duration": 2}
         response = session_with_retry.get(
             f"http://{flask_unit_ip}:8000/sleep", params=params, timeout=5
@@ -140,3 +141,75 @@ def test_async_workers(
 
     elapsed_seconds = (datetime.now() - start_time).total_seconds()
     assert elapsed_seconds < 3, f"Async workers for Flask are not working! Took {elapsed_seconds}s"
+
+
+# Average PSS and USS of the Gunicorn workers in kB, read from the workload container.
+WORKER_MEMORY_SCRIPT = """
+import os
+
+def status(pid):
+    with open(f"/proc/{pid}/status", encoding="utf-8") as status_file:
+        return dict(line.split(":", 1) for line in status_file)
+
+def cmdline(pid):
+    with open(f"/proc/{pid}/cmdline", "rb") as cmdline_file:
+        return cmdline_file.read()
+
+pids = [int(pid) for pid in os.listdir("/proc") if pid.isdigit()]
+gunicorn_pids = {pid for pid in pids if b"gunicorn" in cmdline(pid)}
+workers = [pid for pid in gunicorn_pids if int(status(pid)["PPid"]) in gunicorn_pids]
+pss = uss = 0
+for pid in workers:
+    with open(f"/proc/{pid}/smaps_rollup", encoding="utf-8") as smaps_file:
+        smaps = {line.split(":")[0]: line.split()[1] for line in smaps_file if ":" in line}
+    pss += int(smaps["Pss"])
+    uss += int(smaps["Private_Clean"]) + int(smaps["Private_Dirty"])
+print(pss // len(workers), uss // len(workers))
+"""
+
+
+def _measure_worker_memory(juju: jubilant.Juju, unit_name: str) -> tuple[int, int]:
+    """Measure the average PSS and USS of the Gunicorn workers of a unit, in kB."""
+    output = juju.ssh(unit_name, "python3", "-c", WORKER_MEMORY_SCRIPT, container="flask-app")
+    pss, uss = output.split()
+    return int(pss), int(uss)
+
+
+def test_preload_app_worker_memory(
+    juju: jubilant.Juju,
+    flask_app: App,
+    session_with_retry: requests.Session,
+):
+    """
+    arrange: Flask is deployed with 4 Gunicorn workers.
+    act: Enable webserver-preload-app.
+    assert: The workers of the preloaded application use less private memory.
+    """
+    juju.config(flask_app.name, {"webserver-workers": "4", "webserver-preload-app": False})
+    juju.wait(lambda status: status.apps[flask_app.name].is_active)
+    unit_name, unit = list(juju.status().apps[flask_app.name].units.items())[0]
+
+    def measure() -> tuple[int, int]:
+        """Serve some requests and measure the memory of the workers."""
+        for _ in range(20):
+            session_with_retry.get(f"http://{unit.address}:8000", timeout=5)
+        return _measure_worker_memory(juju, unit_name)
+
+    try:
+        pss_before, uss_before = measure()
+        juju.config(flask_app.name, {"webserver-preload-app": True})
+        juju.wait(lambda status: status.apps[flask_app.name].is_active)
+        pss_after, uss_after = measure()
+    finally:
+        juju.config(flask_app.name, reset=["webserver-workers", "webserver-preload-app"])
+        juju.wait(lambda status: status.apps[flask_app.name].is_active)
+
+    logger.info(
+        "worker memory before preload: PSS %s kB, USS %s kB, after: PSS %s kB, USS %s kB",
+        pss_before,
+        uss_before,
+        pss_after,
+        uss_after,
+    )
+    assert uss_after < uss_before
+    assert pss_after < pss_before
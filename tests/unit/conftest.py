@@ -102,3 +102,14 @@ def temp_cos_merged_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None
         return (tmp_path / "cos_merged").absolute()
 
     monkeypatch.setattr(PaasCharm, "get_cos_merged_dir", _get_cos_merged_dir)
+
+
+@pytest.fixture(autouse=True)
+def temp_app_config_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Store the cached AppConfig validators in a test temporary directory."""
+
+    def _get_app_config_cache_dir(_: PaasCharm) -> Path:
+        """Return the AppConfig validator cache directory of the test."""
+        return (tmp_path / "app_config_cache").absolute()
+
+    monkeypatch.setattr(PaasCharm, "get_app_config_cache_dir", _get_app_config_cache_dir)
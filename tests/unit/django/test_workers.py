@@ -17,7 +17,7 @@ from .constants import DEFAULT_LAYER, DJANGO_CONTAINER_NAME
             DEFAULT_LAYER,
             "eventlet",
             "blocked",
-            "Only 'gevent' and 'sync' are allowed. https://bit.ly/django-async-doc",
+            "Only 'gevent', 'sync' and 'uvicorn' are allowed. https://bit.ly/django-async-doc",
             1,
             id="fail-eventlet",
         ),
@@ -104,7 +104,7 @@ def test_async_workers_config(
         (
             "eventlet",
             "blocked",
-            "Only 'gevent' and 'sync' are allowed. https://bit.ly/django-async-doc",
+            "Only 'gevent', 'sync' and 'uvicorn' are allowed. https://bit.ly/django-async-doc",
             1,
         ),
         (
@@ -144,3 +144,50 @@ def test_async_workers_config_fail(
     assert harness.model.unit.status == ops.StatusBase.from_name(
         name=expected_status, message=expected_message
     )
+
+
+@pytest.mark.parametrize(
+    "exec_res, expected_status, expected_message",
+    [
+        pytest.param(0, "active", "", id="success-uvicorn"),
+        pytest.param(
+            1,
+            "blocked",
+            "uvicorn must be installed in the rock. https://bit.ly/django-async-doc",
+            id="fail-uvicorn-not-installed",
+        ),
+    ],
+)
+def test_uvicorn_workers_config(harness: Harness, exec_res, expected_status, expected_message):
+    """
+    arrange: Prepare a unit and run initial hooks.
+    act: Set the `webserver-worker-class` config to uvicorn.
+    assert: Gunicorn serves the ASGI application with the Uvicorn worker if uvicorn is
+        installed, the charm is blocked otherwise.
+    """
+    postgresql_relation_data = {
+        "database": "test-database",
+        "endpoints": "test-postgresql:5432,test-postgresql-2:5432",
+        "password": "test-password",
+        "username": "test-username",
+    }
+    harness.add_relation("postgresql", "postgresql-k8s", app_data=postgresql_relation_data)
+    container = harness.model.unit.get_container(DJANGO_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.handle_exec(
+        container.name,
+        ["python3", "-c", "import uvicorn.workers"],
+        result=ExecResult(exit_code=exec_res),
+    )
+    harness.handle_exec(container.name, ["/bin/python3"], result=ExecResult(exit_code=0))
+    harness.begin_with_initial_hooks()
+    harness.update_config({"webserver-worker-class": "uvicorn"})
+
+    assert harness.model.unit.status == ops.StatusBase.from_name(
+        name=expected_status, message=expected_message
+    )
+    if exec_res:
+        return
+    command = container.get_plan().services["django"].command
+    assert "django_app.asgi:application" in command
+    assert "-k [ uvicorn.workers.UvicornWorker ]" in command
@@ -12,6 +12,8 @@ import ops
 import pytest
 from ops.testing import Harness
 
+from paas_charm.fastapi.charm import FastAPIConfig
+
 from .constants import DEFAULT_LAYER, FASTAPI_CONTAINER_NAME
 
 
@@ -113,3 +115,37 @@ def test_fastapi_config(
         "user": "_daemon_",
         "working-dir": "/app",
     }
+
+
+def test_fastapi_auto_web_concurrency(harness: Harness) -> None:
+    """
+    arrange: prepare the container cgroup files with a CPU quota of 3 CPUs and 1GiB of memory.
+    act: start the fastapi charm with the webserver-workers option set to auto.
+    assert: the web concurrency is sized from the CPU quota and shown in the unit status.
+    """
+    container = harness.model.unit.get_container(FASTAPI_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    cgroup_dir = harness.get_filesystem_root(FASTAPI_CONTAINER_NAME) / "sys/fs/cgroup"
+    cgroup_dir.mkdir(parents=True)
+    (cgroup_dir / "cpu.max").write_text("300000 100000", encoding="utf-8")
+    (cgroup_dir / "memory.max").write_text(str(1024**3), encoding="utf-8")
+    harness.update_config({"webserver-workers": "auto"})
+
+    harness.begin_with_initial_hooks()
+
+    env = container.get_plan().to_dict()["services"]["fastapi"]["environment"]
+    assert env["WEB_CONCURRENCY"] == "3"
+    assert harness.model.unit.status == ops.ActiveStatus("web concurrency: 3 (auto)")
+
+
+@pytest.mark.parametrize("web_concurrency", [4, "4"])
+def test_fastapi_config_web_concurrency(web_concurrency) -> None:
+    """
+    arrange: none.
+    act: create the FastAPI configuration from webserver-workers declared as an int, as in the
+        charmcraft extension, or as a string, as in the example.
+    assert: the web concurrency should be parsed from both types.
+    """
+    config = FastAPIConfig.model_validate({"webserver-workers": web_concurrency})
+
+    assert config.web_concurrency == 4
@@ -75,6 +75,23 @@ def harness_fixture() -> typing.Generator[Harness, None, None]:
         handler=check_config_handler,
     )
 
+    uvicorn_check_config_command = [
+        "/bin/python3",
+        "-m",
+        "gunicorn",
+        "-c",
+        "/flask/gunicorn.conf.py",
+        "app:app",
+        "-k",
+        "uvicorn.workers.UvicornWorker",
+        "--check-config",
+    ]
+    harness.handle_exec(
+        FLASK_CONTAINER_NAME,
+        uvicorn_check_config_command,
+        handler=check_config_handler,
+    )
+
     yield harness
     harness.cleanup()
 
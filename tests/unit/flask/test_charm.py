@@ -9,20 +9,28 @@
 # Very similar cases to other frameworks. Disable duplicated checks.
 # pylint: disable=R0801
 
+import json
+import signal
 import unittest.mock
 from secrets import token_hex
 
 import ops
 import pytest
+from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
 from ops.pebble import ServiceStatus
 from ops.testing import Harness
 
+import paas_charm.charm
 from paas_charm._gunicorn.webserver import GunicornWebserver, WebserverConfig
 from paas_charm._gunicorn.workload_config import create_workload_config
 from paas_charm._gunicorn.wsgi_app import WsgiApp
+from paas_charm.cgroup import WORKER_MEMORY_NOTICE_KEY
 from paas_charm.charm_state import CharmState, IntegrationRequirers
 from paas_charm.database_migration import DatabaseMigrationStatus
 from paas_charm.flask import Charm
+from paas_charm.paas_config import EnvironmentFileFormat, ServiceConfig, ServiceRole
+from paas_charm.restart_coalescer import RESTART_NOTICE_KEY
+from paas_charm.rolling_restart import RESTARTED_NOTICE_KEY
 
 from .constants import (
     DEFAULT_LAYER,
@@ -89,6 +97,427 @@ def test_flask_pebble_layer(harness: Harness) -> None:
     }
 
 
+def test_restart_skipped_when_unchanged(harness: Harness) -> None:
+    """
+    arrange: start the flask charm and restart the flask application once.
+    act: restart the flask application again, with and without changes.
+    assert: the workload container should only be replanned if the restart inputs changed
+        or the restart is forced.
+    """
+    harness.begin()
+    container = harness.charm.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+
+    def create_flask_app(secret_key: str) -> WsgiApp:
+        """Create a flask application with the given secret key."""
+        return WsgiApp(
+            container=container,
+            charm_state=CharmState(
+                framework="flask", is_secret_storage_ready=True, secret_key=secret_key
+            ),
+            workload_config=workload_config,
+            webserver=GunicornWebserver(
+                webserver_config=WebserverConfig(),
+                workload_config=workload_config,
+                container=container,
+            ),
+            database_migration=harness.charm._database_migration,
+        )
+
+    create_flask_app("foo").restart()
+
+    with unittest.mock.patch.object(container, "replan") as replan:
+        create_flask_app("foo").restart()
+        replan.assert_not_called()
+        create_flask_app("foo").restart(force=True)
+        replan.assert_called_once()
+        create_flask_app("bar").restart()
+        assert replan.call_count == 2
+
+    plan = container.get_plan()
+    assert plan.services["flask"].environment["FLASK_SECRET_KEY"] == "bar"
+
+
+def test_restart_generates_environment_once(harness: Harness) -> None:
+    """
+    arrange: start the flask charm with worker and scheduler services, set the gevent worker
+        class and restart the flask application once.
+    act: restart the flask application with a new secret key.
+    assert: the environment should be generated once and the original services read once,
+        and every service should get the environment.
+    """
+    harness.begin()
+    container = harness.charm.unit.get_container(FLASK_CONTAINER_NAME)
+    layer = {
+        "services": {
+            **DEFAULT_LAYER["services"],
+            "flask-worker": {"override": "replace", "command": "celery worker"},
+            "flask-scheduler": {"override": "replace", "command": "celery beat"},
+        }
+    }
+    container.add_layer("a_layer", layer)
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+
+    def create_flask_app(secret_key: str) -> WsgiApp:
+        """Create a flask application with the given secret key."""
+        return WsgiApp(
+            container=container,
+            charm_state=CharmState(
+                framework="flask", is_secret_storage_ready=True, secret_key=secret_key
+            ),
+            workload_config=workload_config,
+            webserver=GunicornWebserver(
+                webserver_config=WebserverConfig(worker_class="gevent"),
+                workload_config=workload_config,
+                container=container,
+            ),
+            database_migration=harness.charm._database_migration,
+        )
+
+    create_flask_app("foo").restart()
+
+    with (
+        unittest.mock.patch.object(
+            WsgiApp, "gen_environment", autospec=True, side_effect=WsgiApp.gen_environment
+        ) as gen_environment,
+        unittest.mock.patch.object(container, "pull", wraps=container.pull) as pull,
+    ):
+        create_flask_app("bar").restart()
+
+    gen_environment.assert_called_once()
+    original_services_pulls = [
+        call
+        for call in pull.call_args_list
+        if str(call.args[0]).endswith("original-services.json")
+    ]
+    assert len(original_services_pulls) == 1
+    plan = container.get_plan()
+    assert "-k [ gevent ]" in plan.services["flask"].command
+    for service_name in ("flask", "flask-worker", "flask-scheduler"):
+        assert plan.services[service_name].environment["FLASK_SECRET_KEY"] == "bar"
+
+
+def test_restart_service_environments(harness: Harness) -> None:
+    """
+    arrange: start the flask charm with a worker consuming no configuration option and a
+        scheduler declared by role, on a unit that should not run the scheduler.
+    act: restart the flask application with two values of a configuration option.
+    assert: only the flask service gets the configuration option, the worker definition does
+        not change and the scheduler is disabled.
+    """
+    harness.begin()
+    container = harness.charm.unit.get_container(FLASK_CONTAINER_NAME)
+    layer = {
+        "services": {
+            **DEFAULT_LAYER["services"],
+            "flask-worker": {"override": "replace", "command": "celery worker"},
+            "celery-beat": {"override": "replace", "command": "celery beat"},
+        }
+    }
+    container.add_layer("a_layer", layer)
+    workload_config = create_workload_config(
+        framework_name="flask",
+        unit_name="flask/1",
+        state_dir=harness.charm._state_dir,
+        services={
+            "flask-worker": ServiceConfig(integrations=["redis"], config=[]),
+            "celery-beat": ServiceConfig(role=ServiceRole.SCHEDULER),
+        },
+    )
+
+    def restart_flask_app(greeting: str) -> None:
+        """Restart a flask application with the given greeting configuration option."""
+        WsgiApp(
+            container=container,
+            charm_state=CharmState(
+                framework="flask",
+                is_secret_storage_ready=True,
+                secret_key="foo",
+                user_defined_config={"greeting": greeting},
+            ),
+            workload_config=workload_config,
+            webserver=GunicornWebserver(
+                webserver_config=WebserverConfig(),
+                workload_config=workload_config,
+                container=container,
+            ),
+            database_migration=harness.charm._database_migration,
+        ).restart()
+
+    restart_flask_app("hello")
+    worker = container.get_plan().services["flask-worker"].to_dict()
+    restart_flask_app("bonjour")
+
+    plan = container.get_plan()
+    assert plan.services["flask"].environment["FLASK_GREETING"] == "bonjour"
+    assert plan.services["flask-worker"].to_dict() == worker
+    assert "FLASK_GREETING" not in worker["environment"]
+    assert worker["environment"]["FLASK_SECRET_KEY"] == "foo"
+    assert plan.services["celery-beat"].startup == "disabled"
+
+
+@pytest.mark.parametrize(
+    "replicas, cpu_max, expected_replicas",
+    [
+        pytest.param(3, None, 3, id="3"),
+        pytest.param("auto", "250000 100000", 3, id="auto"),
+    ],
+)
+def test_worker_replicas(harness: Harness, replicas, cpu_max, expected_replicas) -> None:
+    """
+    arrange: start the flask charm with a worker service configured with replicas.
+    act: restart the flask application.
+    assert: the worker service should be disabled and replaced by its replicas, each with
+        the application environment and its index.
+    """
+    harness.begin()
+    container = harness.charm.unit.get_container(FLASK_CONTAINER_NAME)
+    if cpu_max:
+        cgroup_dir = harness.get_filesystem_root(FLASK_CONTAINER_NAME) / "sys/fs/cgroup"
+        cgroup_dir.mkdir(parents=True)
+        (cgroup_dir / "cpu.max").write_text(cpu_max, encoding="utf-8")
+    layer = {
+        "services": {
+            **DEFAULT_LAYER["services"],
+            "flask-worker": {
+                "override": "replace",
+                "command": "celery worker",
+                "startup": "enabled",
+            },
+        }
+    }
+    container.add_layer("a_layer", layer)
+    workload_config = create_workload_config(
+        framework_name="flask",
+        unit_name="flask/0",
+        state_dir=harness.charm._state_dir,
+        services={"flask-worker": ServiceConfig(replicas=replicas)},
+    )
+    WsgiApp(
+        container=container,
+        charm_state=CharmState(framework="flask", is_secret_storage_ready=True, secret_key="foo"),
+        workload_config=workload_config,
+        webserver=GunicornWebserver(
+            webserver_config=WebserverConfig(),
+            workload_config=workload_config,
+            container=container,
+        ),
+        database_migration=harness.charm._database_migration,
+    ).restart()
+
+    services = container.get_plan().services
+    assert services["flask-worker"].startup == "disabled"
+    replica_names = sorted(name for name in services if name.startswith("flask-worker-"))
+    assert replica_names == [f"flask-worker-{index}" for index in range(expected_replicas)]
+    for index in range(expected_replicas):
+        replica = services[f"flask-worker-{index}"]
+        assert replica.command == "celery worker"
+        assert replica.environment["FLASK_SECRET_KEY"] == "foo"
+        assert replica.environment["PAAS_REPLICA_INDEX"] == str(index)
+    assert container.get_services("flask-worker")["flask-worker"].is_running() is False
+
+
+def test_worker_replicas_lowered(harness: Harness) -> None:
+    """
+    arrange: start the flask charm with a worker service configured with 3 replicas.
+    act: restart the flask application with 2 replicas, then with a single one.
+    assert: the replicas beyond the number of replicas should be disabled and stopped, and the
+        worker service should run again without replicas.
+    """
+    harness.begin()
+    container = harness.charm.unit.get_container(FLASK_CONTAINER_NAME)
+    layer = {
+        "services": {
+            **DEFAULT_LAYER["services"],
+            "flask-worker": {
+                "override": "replace",
+                "command": "celery worker",
+                "startup": "enabled",
+            },
+        }
+    }
+    container.add_layer("a_layer", layer)
+
+    def restart_flask_app(replicas: int | None) -> dict[str, ops.pebble.ServiceInfo]:
+        """Restart the flask application with a number of replicas of the worker service.
+
+        Args:
+            replicas: the number of replicas of the worker service.
+
+        Returns:
+            The services of the flask container.
+        """
+        workload_config = create_workload_config(
+            framework_name="flask",
+            unit_name="flask/0",
+            state_dir=harness.charm._state_dir,
+            services={"flask-worker": ServiceConfig(replicas=replicas)},
+        )
+        WsgiApp(
+            container=container,
+            charm_state=CharmState(
+                framework="flask", is_secret_storage_ready=True, secret_key="foo"
+            ),
+            workload_config=workload_config,
+            webserver=GunicornWebserver(
+                webserver_config=WebserverConfig(),
+                workload_config=workload_config,
+                container=container,
+            ),
+            database_migration=harness.charm._database_migration,
+        ).restart()
+        return container.get_services()
+
+    services = restart_flask_app(3)
+    assert [services[f"flask-worker-{index}"].is_running() for index in range(3)] == [True] * 3
+
+    services = restart_flask_app(2)
+    assert [services[f"flask-worker-{index}"].is_running() for index in range(3)] == [
+        True,
+        True,
+        False,
+    ]
+    assert container.get_plan().services["flask-worker-2"].startup == "disabled"
+
+    services = restart_flask_app(None)
+    assert services["flask-worker"].is_running()
+    assert not any(services[f"flask-worker-{index}"].is_running() for index in range(3))
+    plan = container.get_plan()
+    assert [plan.services[f"flask-worker-{index}"].startup for index in range(3)] == [
+        "disabled"
+    ] * 3
+
+
+@pytest.mark.parametrize(
+    "environment_file, parse_environment_file",
+    [
+        pytest.param(EnvironmentFileFormat.JSON, json.loads, id="json"),
+        pytest.param(
+            EnvironmentFileFormat.DOTENV,
+            lambda content: {
+                k: json.loads(v) for k, _, v in (line.partition("=") for line in content.split())
+            },
+            id="dotenv",
+        ),
+    ],
+)
+def test_restart_reloads_environment_file(
+    harness: Harness, environment_file, parse_environment_file
+) -> None:
+    """
+    arrange: start the flask charm with the environment delivered in a file and restart the
+        flask application once.
+    act: restart the flask application with a new secret key.
+    assert: the environment file should have the new secret key, the flask service definition
+        should not change and the flask service should be signaled to reload the environment.
+    """
+    harness.begin()
+    container = harness.charm.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    workload_config = create_workload_config(
+        framework_name="flask",
+        unit_name="flask/0",
+        state_dir=harness.charm._state_dir,
+        environment_file=environment_file,
+    )
+
+    def create_flask_app(secret_key: str) -> WsgiApp:
+        """Create a flask application with the given secret key."""
+        return WsgiApp(
+            container=container,
+            charm_state=CharmState(
+                framework="flask", is_secret_storage_ready=True, secret_key=secret_key
+            ),
+            workload_config=workload_config,
+            webserver=GunicornWebserver(
+                webserver_config=WebserverConfig(),
+                workload_config=workload_config,
+                container=container,
+            ),
+            database_migration=harness.charm._database_migration,
+        )
+
+    create_flask_app("foo").restart()
+    flask_service = container.get_plan().services["flask"].to_dict()
+
+    with unittest.mock.patch.object(container, "send_signal") as send_signal:
+        create_flask_app("bar").restart()
+
+    environment = parse_environment_file(
+        container.pull(workload_config.environment_file_path).read()
+    )
+    assert environment["FLASK_SECRET_KEY"] == "bar"
+    assert flask_service["environment"] == {
+        "PAAS_ENVIRONMENT_FILE": str(workload_config.environment_file_path)
+    }
+    assert container.get_plan().services["flask"].to_dict() == flask_service
+    send_signal.assert_called_once_with(signal.SIGHUP, "flask")
+    gunicorn_config = container.pull("/flask/gunicorn.conf.py").read()
+    assert str(workload_config.environment_file_path) in gunicorn_config
+    assert "def on_reload(server):" in gunicorn_config
+
+
+def test_restart_updates_peer_fqdns_file(harness: Harness) -> None:
+    """
+    arrange: start the flask charm with the peer FQDNs delivered in a file signaled with
+        SIGUSR1 and restart the flask application once.
+    act: restart the flask application with one more peer unit.
+    assert: the peer FQDNs file should list the new unit, the flask service definition
+        should not change and the flask service should be signaled.
+    """
+    harness.begin()
+    container = harness.charm.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    workload_config = create_workload_config(
+        framework_name="flask",
+        unit_name="flask/0",
+        state_dir=harness.charm._state_dir,
+        peer_fqdns_file=True,
+        peer_fqdns_signal="SIGUSR1",
+    )
+
+    def create_flask_app(peer_fqdns: str) -> WsgiApp:
+        """Create a flask application with the given peer FQDNs."""
+        return WsgiApp(
+            container=container,
+            charm_state=CharmState(
+                framework="flask",
+                is_secret_storage_ready=True,
+                secret_key="foo",
+                peer_fqdns=peer_fqdns,
+            ),
+            workload_config=workload_config,
+            webserver=GunicornWebserver(
+                webserver_config=WebserverConfig(),
+                workload_config=workload_config,
+                container=container,
+            ),
+            database_migration=harness.charm._database_migration,
+        )
+
+    create_flask_app("flask-0.example").restart()
+    flask_service = container.get_plan().services["flask"].to_dict()
+
+    with unittest.mock.patch.object(container, "send_signal") as send_signal:
+        create_flask_app("flask-0.example,flask-1.example").restart()
+
+    assert (
+        container.pull(workload_config.peer_fqdns_file_path).read()
+        == "flask-0.example\nflask-1.example\n"
+    )
+    assert flask_service["environment"]["FLASK_PEER_FQDNS_FILE"] == str(
+        workload_config.peer_fqdns_file_path
+    )
+    assert "FLASK_PEER_FQDNS" not in flask_service["environment"]
+    assert container.get_plan().services["flask"].to_dict() == flask_service
+    send_signal.assert_called_once_with("SIGUSR1", "flask")
+
+
 def test_rotate_secret_key_action(harness: Harness):
     """
     arrange: none
@@ -237,6 +666,157 @@ def test_rabbitmq_integration(harness: Harness, rabbitmq_relation_data, expected
         assert service_env[env] == env_val
 
 
+def test_coalesce_restarts(harness: Harness, monkeypatch, tmp_path):
+    """
+    arrange: enable coalesce_restarts in paas-config.yaml and start the flask charm.
+    act: integrate with rabbitmq, then emit the restart pebble custom notice.
+    assert: the integration events should only record one restart notice, and the flask
+        service should get the rabbitmq environment variables on the notice.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "paas-config.yaml").write_text("coalesce_restarts: true\n", encoding="utf-8")
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.begin_with_initial_hooks()
+
+    harness.add_relation(
+        "rabbitmq",
+        "rabbitmq",
+        app_data={"hostname": "rabbitmq.example.com", "password": "3m036hhyiDHs"},
+        unit_data={"ingress-address": "10.152.183.168"},
+    )
+
+    assert "RABBITMQ_HOSTNAME" not in container.get_plan().services["flask"].environment
+    notices = container.get_notices(keys=[RESTART_NOTICE_KEY])
+    assert len(notices) == 1
+    assert notices[0].occurrences == 1
+
+    harness.pebble_notify(FLASK_CONTAINER_NAME, RESTART_NOTICE_KEY)
+
+    assert harness.model.unit.status == ops.ActiveStatus()
+    service_env = container.get_plan().services["flask"].environment
+    assert service_env["RABBITMQ_HOSTNAME"] == "rabbitmq.example.com"
+
+
+def test_rolling_restart(harness: Harness, monkeypatch, tmp_path):
+    """
+    arrange: set max_concurrent_restarts to 1 in paas-config.yaml, start the flask charm and
+        give the restart lease to another unit.
+    act: change the configuration, release the restart lease of the other unit, then notify
+        the restart once the workload listens on its port.
+    assert: the flask service should only restart with the new configuration once the other
+        unit released the lease, and the unit should keep the lease until a later event finds
+        the workload ready.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "paas-config.yaml").write_text("max_concurrent_restarts: 1\n", encoding="utf-8")
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.begin_with_initial_hooks()
+    relation_id = harness.model.get_relation("secret-storage").id
+    harness.add_relation_unit(relation_id, "flask-k8s/1")
+    harness.update_relation_data(relation_id, "flask-k8s/1", {"restart-request": "true"})
+    assert json.loads(harness.get_relation_data(relation_id, "flask-k8s")["restart-leases"]) == [
+        "flask-k8s/1"
+    ]
+
+    harness.update_config({"webserver-timeout": 7})
+
+    assert harness.model.unit.status == ops.WaitingStatus("Waiting for restart lease")
+    assert "timeout = 7" not in container.pull("/flask/gunicorn.conf.py").read()
+    assert harness.get_relation_data(relation_id, "flask-k8s/0")["restart-request"] == "true"
+
+    monkeypatch.setattr(paas_charm.charm, "is_port_open", lambda _: False)
+    harness.update_relation_data(relation_id, "flask-k8s/1", {"restart-request": ""})
+
+    assert harness.model.unit.status == ops.ActiveStatus()
+    assert "timeout = 7" in container.pull("/flask/gunicorn.conf.py").read()
+    assert harness.get_relation_data(relation_id, "flask-k8s/0")["restart-request"] == "true"
+    assert json.loads(harness.get_relation_data(relation_id, "flask-k8s")["restart-leases"]) == [
+        "flask-k8s/0"
+    ]
+
+    monkeypatch.setattr(paas_charm.charm, "is_port_open", lambda _: True)
+    harness.pebble_notify(FLASK_CONTAINER_NAME, RESTARTED_NOTICE_KEY)
+
+    assert "restart-request" not in harness.get_relation_data(relation_id, "flask-k8s/0")
+    assert json.loads(harness.get_relation_data(relation_id, "flask-k8s")["restart-leases"]) == []
+
+
+def test_auto_workers_recorded_memory(harness: Harness):
+    """
+    arrange: give the flask container a CPU quota of 1.5 CPUs and a memory limit of 1 GiB,
+        and start the flask charm with webserver-workers set to auto.
+    act: run the Gunicorn workers with 300 MB of memory each, emit a config-changed event,
+        then notify the worker memory measurement.
+    assert: the workers should only be sized again from the memory measured on the notice.
+    """
+    root = harness.get_filesystem_root(FLASK_CONTAINER_NAME)
+    cgroup_dir = root / "sys/fs/cgroup"
+    cgroup_dir.mkdir(parents=True)
+    (cgroup_dir / "cpu.max").write_text("150000 100000", encoding="utf-8")
+    (cgroup_dir / "memory.max").write_text(str(2**30), encoding="utf-8")
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.update_config({"webserver-workers": "auto"})
+    harness.begin_with_initial_hooks()
+
+    assert "workers = 5" in container.pull("/flask/gunicorn.conf.py").read().splitlines()
+    assert container.get_notices(keys=[WORKER_MEMORY_NOTICE_KEY])
+
+    (cgroup_dir / "cgroup.procs").write_text("1\n10\n11\n", encoding="utf-8")
+    for pid, ppid, rss_kb in ((1, 0, 20000), (10, 1, 50000), (11, 10, 300000)):
+        (root / f"proc/{pid}").mkdir(parents=True)
+        (root / f"proc/{pid}/status").write_text(
+            f"PPid:\t{ppid}\nVmRSS:\t{rss_kb} kB\n", encoding="utf-8"
+        )
+    (root / "proc/10/cmdline").write_text(
+        "/bin/python3\0-m\0gunicorn\0-c\0/flask/gunicorn.conf.py\0app:app\0-k\0sync\0",
+        encoding="utf-8",
+    )
+    harness.charm.on.config_changed.emit()
+
+    assert "workers = 5" in container.pull("/flask/gunicorn.conf.py").read().splitlines()
+
+    harness.pebble_notify(FLASK_CONTAINER_NAME, WORKER_MEMORY_NOTICE_KEY)
+
+    assert "workers = 2" in container.pull("/flask/gunicorn.conf.py").read().splitlines()
+    recorded_memory = container.pull(harness.charm._state_dir / "worker-memory").read()
+    assert recorded_memory == str(320 * 1024 * 1024)
+
+
+def test_scrape_jobs_refreshed_on_update_status(harness: Harness, monkeypatch):
+    """
+    arrange: start the flask charm, publishing its scrape jobs.
+    act: emit the update-status event, then change the scrape jobs, as the scheduler units do,
+        and emit the update-status event twice.
+    assert: the scrape jobs should only be published again once, after they changed.
+    """
+    publications = []
+    monkeypatch.setattr(
+        MetricsEndpointProvider,
+        "set_scrape_job_spec",
+        lambda _, __=None: publications.append(True),
+        raising=False,
+    )
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.begin_with_initial_hooks()
+    publications.clear()
+
+    harness.charm.on.update_status.emit()
+
+    assert not publications
+
+    harness.charm._observability._jobs = json.dumps(
+        [{"static_configs": [{"targets": ["flask-k8s-1.flask-k8s-endpoints:8081"]}]}]
+    )
+    harness.charm.on.update_status.emit()
+    harness.charm.on.update_status.emit()
+
+    assert len(publications) == 1
+
+
 def test_rabbitmq_integration_with_relation_data_empty(harness: Harness):
     """
     arrange: Prepare a rabbitmq integration (RabbitMQ), with missing data.
@@ -7,10 +7,15 @@ import os
 import pathlib
 from secrets import token_hex
 
+import ops
 import pytest
 from ops import testing
 
+import paas_charm.charm_state
 from examples.flask.charm.src.charm import FlaskCharm
+from paas_charm.charm import PaasCharm
+from paas_charm.databases import PaaSDatabaseRequires
+from tests.unit.conftest import postgresql_relation
 
 PROJECT_ROOT = pathlib.Path(__file__).parent.parent.parent.parent
 
@@ -279,3 +284,117 @@ def test_flask_secret_key_id_duplication(flask_base_state):
 
     assert isinstance(out.unit_status, testing.BlockedStatus)
     assert "invalid option" in out.unit_status.message
+
+
+def test_charm_state_built_once_per_event(flask_base_state, monkeypatch):
+    """
+    arrange: prepare a juju secret configuration and a postgresql integration.
+    act: run the config-changed event.
+    assert: the relation data and the secret content should be read only once in the event.
+    """
+    secret = testing.Secret(tracked_content={"foo": "foo"})
+    flask_base_state["secrets"] = [secret]
+    flask_base_state["config"] = {"secret-test": secret.id}
+    flask_base_state["relations"].append(postgresql_relation("test-database"))
+    relation_reads = []
+    secret_reads = []
+    original_to_relation_data = PaaSDatabaseRequires.to_relation_data
+    original_get_content = ops.Secret.get_content
+
+    def counting_to_relation_data(self):
+        """Record the relation data read and read it."""
+        relation_reads.append(self.relation_name)
+        return original_to_relation_data(self)
+
+    def counting_get_content(self, *, refresh=False):
+        """Record the secret content read and read it."""
+        secret_reads.append(self.id)
+        return original_get_content(self, refresh=refresh)
+
+    monkeypatch.setattr(PaaSDatabaseRequires, "to_relation_data", counting_to_relation_data)
+    monkeypatch.setattr(ops.Secret, "get_content", counting_get_content)
+
+    ctx = testing.Context(FlaskCharm)
+    state = testing.State(**flask_base_state)
+    out = ctx.run(ctx.on.config_changed(), state)
+
+    assert out.unit_status == testing.ActiveStatus()
+    assert sorted(relation_reads) == ["mongodb", "mysql", "postgresql"]
+    assert len(secret_reads) == 1
+    env = list(out.containers)[0].plan.services["flask"].environment
+    assert env.get("POSTGRESQL_DB_CONNECT_STRING")
+    assert env.get("FLASK_SECRET_TEST_FOO") == "foo"
+
+
+def test_app_config_model_built_once_across_events(flask_base_state, monkeypatch):
+    """
+    arrange: prepare a flask charm with the AppConfig validator cache directory.
+    act: run the config-changed event twice, each in a new charm instance.
+    assert: the AppConfig model should only be created in the first event.
+    """
+    model_builds = []
+    original_app_config_class_factory = paas_charm.charm_state.app_config_class_factory
+
+    def counting_app_config_class_factory(charm_dir, framework):
+        """Record the AppConfig model creation and create it."""
+        model_builds.append(framework)
+        return original_app_config_class_factory(charm_dir, framework)
+
+    monkeypatch.setattr(
+        paas_charm.charm_state, "app_config_class_factory", counting_app_config_class_factory
+    )
+    ctx = testing.Context(FlaskCharm)
+
+    first = ctx.run(ctx.on.config_changed(), testing.State(**flask_base_state))
+    second = ctx.run(ctx.on.config_changed(), testing.State(**flask_base_state))
+
+    assert first.unit_status == testing.ActiveStatus()
+    assert second.unit_status == testing.ActiveStatus()
+    assert model_builds == ["flask"]
+
+
+def test_secret_configuration_latest_revision(flask_base_state):
+    """
+    arrange: prepare a juju secret configuration with a new revision not yet tracked, as if
+        the secret-changed event was missed.
+    act: run the config-changed event.
+    assert: the content of the latest revision should be used.
+    """
+    secret = testing.Secret(tracked_content={"foo": "old"}, latest_content={"foo": "new"})
+    flask_base_state["secrets"] = [secret]
+    flask_base_state["config"] = {"secret-test": secret.id}
+    ctx = testing.Context(FlaskCharm)
+
+    out = ctx.run(ctx.on.config_changed(), testing.State(**flask_base_state))
+
+    env = list(out.containers)[0].plan.services["flask"].environment
+    assert env.get("FLASK_SECRET_TEST_FOO") == "new"
+
+
+def test_reconcile_events(flask_base_state, monkeypatch, tmp_path):
+    """
+    arrange: enable reconcile_events in paas-config.yaml and prepare a postgresql integration.
+    act: run the postgresql relation-changed event.
+    assert: the database events should be reconciled with one restart rerunning the migrations.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "paas-config.yaml").write_text("reconcile_events: true\n", encoding="utf-8")
+    postgresql = postgresql_relation("test-database")
+    flask_base_state["relations"].append(postgresql)
+    restarts = []
+    original_restart = PaasCharm.restart
+
+    def recording_restart(self, rerun_migrations=False):
+        """Record the restart and restart the workload."""
+        restarts.append(rerun_migrations)
+        return original_restart(self, rerun_migrations=rerun_migrations)
+
+    monkeypatch.setattr(PaasCharm, "restart", recording_restart)
+
+    ctx = testing.Context(FlaskCharm)
+    out = ctx.run(ctx.on.relation_changed(postgresql), testing.State(**flask_base_state))
+
+    assert restarts == [True]
+    assert out.unit_status == testing.ActiveStatus()
+    env = list(out.containers)[0].plan.services["flask"].environment
+    assert env.get("POSTGRESQL_DB_CONNECT_STRING")
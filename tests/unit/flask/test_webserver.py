@@ -6,17 +6,30 @@
 # this is a unit test file
 # pylint: disable=protected-access
 
+import gc
+import logging
+import signal
 import textwrap
+import time
 import unittest.mock
 
 import ops
 import pytest
 from ops.testing import Harness
 
-from paas_charm._gunicorn.webserver import GunicornWebserver, WebserverConfig
+from paas_charm._gunicorn.rolling_reload import RollingReload
+from paas_charm._gunicorn.webserver import (
+    GunicornWebserver,
+    WebserverConfig,
+    WorkerClassEnum,
+    size_workers,
+    validate_gunicorn_config,
+)
 from paas_charm._gunicorn.workload_config import create_workload_config
 from paas_charm._gunicorn.wsgi_app import WsgiApp
 from paas_charm.charm_state import CharmState
+from paas_charm.exceptions import CharmConfigInvalidError
+from paas_charm.paas_config import LoggingFormat
 from paas_charm.utils import enable_pebble_log_forwarding
 
 from .constants import DEFAULT_LAYER, FLASK_CONTAINER_NAME
@@ -31,7 +44,60 @@ GUNICORN_CONFIG_TEST_PARAMS = [
                 accesslog = '/var/log/flask/access.log'
                 errorlog = '/var/log/flask/error.log'
                 statsd_host = 'localhost:9125'
-                workers = 10"""),
+                workers = 10
+
+
+                def pre_fork(server, worker):
+                    # Restore the workers setting on_reload lowered to spawn a first batch of new workers.
+                    server.cfg.set('workers', 10)
+
+
+                import os
+                import subprocess
+
+
+                def _notify_charm():
+                    # Wake the charm up to replace the next batch of workers of a rolling reload.
+                    if not os.path.exists('/tmp/flask/state/gunicorn-workers/rolling-reload.json'):
+                        return
+                    try:
+                        subprocess.Popen(
+                            ['/charm/bin/pebble', 'notify', 'canonical.com/paas-charm/gunicorn-reload'],
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL,
+                        )
+                    except OSError:
+                        pass
+
+
+                def on_starting(server):
+                    # Remove the markers of the workers and the rolling reload of a previous arbiter.
+                    os.makedirs('/tmp/flask/state/gunicorn-workers', exist_ok=True)
+                    for marker in os.listdir('/tmp/flask/state/gunicorn-workers'):
+                        os.remove(os.path.join('/tmp/flask/state/gunicorn-workers', marker))
+
+
+                def post_worker_init(worker):
+                    # Mark the worker as booted for the rolling reload of the charm.
+                    open(os.path.join('/tmp/flask/state/gunicorn-workers', str(worker.pid)), 'w').close()
+                    _notify_charm()
+
+
+                def child_exit(server, worker):
+                    try:
+                        os.remove(os.path.join('/tmp/flask/state/gunicorn-workers', str(worker.pid)))
+                    except FileNotFoundError:
+                        pass
+                    _notify_charm()
+
+
+                def on_reload(server):
+                    # Spawn a first batch of new workers next to the booted ones, the charm replaces the other
+                    # workers in batches with TTIN and TTOU. Workers not marked as booted are replaced at once.
+                    if any(marker.isdigit() for marker in os.listdir('/tmp/flask/state/gunicorn-workers')):
+                        server.cfg.set('workers', 2)
+                        server.num_workers += 2
+                """),
         id="workers=10",
     ),
     pytest.param(
@@ -72,6 +138,69 @@ GUNICORN_CONFIG_TEST_PARAMS = [
                 """),
         id="with-tracing",
     ),
+    pytest.param(
+        {"worker_class": WorkerClassEnum.UVICORN},
+        False,
+        textwrap.dedent("""\
+                bind = ['0.0.0.0:8000']
+                chdir = '/flask/app'
+                accesslog = '/var/log/flask/access.log'
+                errorlog = '/var/log/flask/error.log'
+                statsd_host = 'localhost:9125'
+
+                def post_fork(server, worker):
+                    from asgiref.wsgi import WsgiToAsgi
+
+                    _wsgi_app = worker.app.wsgi
+
+                    def _asgi_app():
+                        return WsgiToAsgi(_wsgi_app())
+
+                    worker.app.wsgi = _asgi_app
+                """),
+        id="uvicorn",
+    ),
+    pytest.param(
+        {"preload_app": True},
+        False,
+        textwrap.dedent("""\
+                import gc
+
+                # Avoid the collections leaving holes in the memory pages of the preloaded application while
+                # it loads, when_ready and on_reload enable them again in the arbiter.
+                gc.disable()
+
+                bind = ['0.0.0.0:8000']
+                chdir = '/flask/app'
+                accesslog = '/var/log/flask/access.log'
+                errorlog = '/var/log/flask/error.log'
+                statsd_host = 'localhost:9125'
+                preload_app = True
+
+
+                def when_ready(server):
+                    # The application is loaded, collect again in the arbiter without touching its objects.
+                    gc.freeze()
+                    gc.enable()
+
+
+                def pre_fork(server, worker):
+                    # Keep the collector of the workers off the objects shared with the arbiter.
+                    gc.freeze()
+
+
+                def post_fork(server, worker):
+                    gc.set_threshold(10000, 50, 100)
+                    gc.enable()
+
+
+                def on_reload(server):
+                    # Gunicorn runs this file again on reload, which disabled the collector of the arbiter.
+                    gc.freeze()
+                    gc.enable()
+                """),
+        id="preload",
+    ),
 ]
 
 
@@ -130,44 +259,326 @@ def test_gunicorn_config(
     assert container.pull("/flask/gunicorn.conf.py").read() == config_file
 
 
+@pytest.mark.parametrize(
+    "cpus, memory_limit, worker_class, expected",
+    [
+        pytest.param(2, None, WorkerClassEnum.SYNC, (5, None), id="sync"),
+        pytest.param(2, None, WorkerClassEnum.GEVENT, (3, None), id="gevent"),
+        pytest.param(2, None, WorkerClassEnum.UVICORN, (3, None), id="uvicorn"),
+        pytest.param(4, 400 * 2**20, WorkerClassEnum.SYNC, (2, 4), id="sync-memory-capped"),
+        pytest.param(4, 400 * 2**20, WorkerClassEnum.GEVENT, (2, None), id="gevent-memory-capped"),
+        pytest.param(4, 2**20, WorkerClassEnum.SYNC, (1, 4), id="at-least-one-worker"),
+    ],
+)
+def test_size_workers(cpus, memory_limit, worker_class, expected) -> None:
+    """
+    arrange: none.
+    act: size the gunicorn workers for the CPUs, the memory limit and the worker class.
+    assert: the workers and threads should match the expected ones.
+    """
+    assert (
+        size_workers(
+            cpus=cpus,
+            memory_limit=memory_limit,
+            worker_memory=128 * 2**20,
+            worker_class=worker_class,
+        )
+        == expected
+    )
+
+
+def test_gunicorn_config_preload_reload(harness: Harness) -> None:
+    """
+    arrange: render the gunicorn configuration with the application preloaded.
+    act: run the configuration and its when_ready hook like the Gunicorn arbiter starting, then
+        run the configuration again and its on_reload hook like the arbiter reloading it.
+    assert: the garbage collector of the arbiter should be enabled again after the reload.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+    webserver = GunicornWebserver(
+        webserver_config=WebserverConfig(preload_app=True),
+        workload_config=workload_config,
+        container=container,
+    )
+    config = compile(webserver._config, "gunicorn.conf.py", "exec")
+
+    try:
+        config_namespace: dict = {}
+        exec(config, config_namespace)  # nosec: B102  # pylint: disable=exec-used
+        config_namespace["when_ready"](unittest.mock.MagicMock())
+        assert gc.isenabled()
+        reloaded_config_namespace: dict = {}
+        exec(config, reloaded_config_namespace)  # nosec: B102  # pylint: disable=exec-used
+        assert not gc.isenabled()
+        reloaded_config_namespace["on_reload"](unittest.mock.MagicMock())
+        assert gc.isenabled()
+    finally:
+        gc.unfreeze()
+        gc.enable()
+
+
+def test_gunicorn_config_uvicorn_json_logging(caplog, harness: Harness) -> None:
+    """
+    arrange: create the Gunicorn webserver object with the uvicorn worker class and the JSON
+        logging enabled.
+    act: render the gunicorn configuration.
+    assert: the configuration should keep the JSON logger without the span middleware of the
+        access logs, and a warning should be logged.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+    workload_config.logging_format = LoggingFormat.JSON
+    webserver = GunicornWebserver(
+        webserver_config=WebserverConfig(worker_class=WorkerClassEnum.UVICORN),
+        workload_config=workload_config,
+        container=container,
+    )
+
+    with caplog.at_level(logging.WARNING):
+        config = webserver._config
+
+    assert "logger_class = GunicornJsonLogger" in config
+    assert "OtelSpanMiddleware(_original_wsgi())" not in config
+    assert "worker.app.wsgi = _asgi_app" in config
+    assert "uvicorn workers do not add" in caplog.text
+
+
+def test_gunicorn_config_auto_workers(harness: Harness, database_migration_mock) -> None:
+    """
+    arrange: give the flask container a CPU quota of 1.5 CPUs and a memory limit of 1 GiB.
+    act: restart the flask application with webserver-workers set to auto.
+    assert: the gunicorn configuration should have 5 workers, sized from the CPU quota.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    cgroup_dir = harness.get_filesystem_root(FLASK_CONTAINER_NAME) / "sys/fs/cgroup"
+    cgroup_dir.mkdir(parents=True)
+    (cgroup_dir / "cpu.max").write_text("150000 100000", encoding="utf-8")
+    (cgroup_dir / "memory.max").write_text(str(2**30), encoding="utf-8")
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+    webserver = GunicornWebserver(
+        webserver_config=WebserverConfig.from_charm_config({"webserver-workers": "auto"}),
+        workload_config=workload_config,
+        container=container,
+    )
+    WsgiApp(
+        container=container,
+        charm_state=CharmState(framework="flask", secret_key="", is_secret_storage_ready=True),
+        workload_config=workload_config,
+        webserver=webserver,
+        database_migration=database_migration_mock,
+    ).restart()
+
+    assert "workers = 5" in container.pull("/flask/gunicorn.conf.py").read().splitlines()
+
+
+@pytest.mark.parametrize(
+    "config, expected_lines",
+    [
+        pytest.param(
+            {"webserver-profile": "throughput"},
+            [
+                "backlog = 4096",
+                "worker_connections = 2000",
+                "graceful_timeout = 30",
+                "max_requests = 10000",
+                "max_requests_jitter = 1000",
+                "reuse_port = True",
+                "sendfile = True",
+                "worker_tmp_dir = '/dev/shm'",
+            ],
+            id="throughput",
+        ),
+        pytest.param(
+            {
+                "webserver-profile": "low-memory",
+                "webserver-max-requests": 500,
+                "webserver-sendfile": False,
+                "webserver-limit-request-line": 2048,
+            },
+            [
+                "backlog = 512",
+                "max_requests = 500",
+                "max_requests_jitter = 100",
+                "reuse_port = False",
+                "sendfile = False",
+                "limit_request_line = 2048",
+                "preload_app = True",
+            ],
+            id="low-memory-overridden",
+        ),
+        pytest.param(
+            {"webserver-profile": "custom", "webserver-backlog": 100},
+            ["backlog = 100"],
+            id="custom",
+        ),
+    ],
+)
+def test_gunicorn_config_profile(
+    harness: Harness, database_migration_mock, config, expected_lines
+) -> None:
+    """
+    arrange: create the Gunicorn webserver object from the webserver-profile options.
+    act: restart the flask application.
+    assert: the gunicorn configuration should have the settings of the profile, overridden by
+        the options configured individually.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+    webserver = GunicornWebserver(
+        webserver_config=WebserverConfig.from_charm_config(config),
+        workload_config=workload_config,
+        container=container,
+    )
+    WsgiApp(
+        container=container,
+        charm_state=CharmState(framework="flask", secret_key="", is_secret_storage_ready=True),
+        workload_config=workload_config,
+        webserver=webserver,
+        database_migration=database_migration_mock,
+    ).restart()
+
+    config_lines = container.pull("/flask/gunicorn.conf.py").read().splitlines()
+    assert set(expected_lines) <= set(config_lines)
+    if config["webserver-profile"] == "custom":
+        assert "sendfile = True" not in config_lines
+
+
+@pytest.mark.parametrize(
+    "threads, expected_environment",
+    [
+        pytest.param(4, {"MALLOC_ARENA_MAX": "2"}, id="threaded"),
+        pytest.param(None, {}, id="not threaded"),
+    ],
+)
+def test_malloc_arena_max(
+    harness: Harness, database_migration_mock, threads, expected_environment
+) -> None:
+    """
+    arrange: create the Gunicorn webserver object with webserver-malloc-arena-max set.
+    act: generate the pebble layer of the flask application.
+    assert: MALLOC_ARENA_MAX should be in the web service environment only for threaded
+        workers.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+    webserver = GunicornWebserver(
+        webserver_config=WebserverConfig(threads=threads, malloc_arena_max=2),
+        workload_config=workload_config,
+        container=container,
+    )
+    flask_app = WsgiApp(
+        container=container,
+        charm_state=CharmState(framework="flask", secret_key="", is_secret_storage_ready=True),
+        workload_config=workload_config,
+        webserver=webserver,
+        database_migration=database_migration_mock,
+    )
+
+    environment = flask_app._app_layer()["services"]["flask"]["environment"]
+    assert {
+        key: value for key, value in environment.items() if key == "MALLOC_ARENA_MAX"
+    } == expected_environment
+
+
+@pytest.mark.parametrize(
+    "workers, expected",
+    [
+        pytest.param(4, 4, id="int"),
+        pytest.param("4", 4, id="string"),
+        pytest.param("auto", "auto", id="auto"),
+    ],
+)
+def test_webserver_config_workers(workers, expected) -> None:
+    """
+    arrange: none.
+    act: create the webserver configuration from webserver-workers declared as an int, as in
+        the charmcraft extensions, or as a string, as in the examples.
+    assert: the workers should be parsed from both types.
+    """
+    assert WebserverConfig.from_charm_config({"webserver-workers": workers}).workers == expected
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        pytest.param({"webserver-profile": "fastest"}, id="unknown profile"),
+        pytest.param({"webserver-backlog": -1}, id="negative backlog"),
+        pytest.param({"webserver-max-requests-jitter": 10}, id="jitter without max requests"),
+        pytest.param(
+            {"webserver-profile": "throughput", "webserver-max-requests": 100},
+            id="jitter not lower than max requests",
+        ),
+        pytest.param({"webserver-worker-tmp-dir": "shm"}, id="relative worker tmp dir"),
+    ],
+)
+def test_webserver_config_profile_invalid(config) -> None:
+    """
+    arrange: none.
+    act: create the webserver configuration from invalid webserver options.
+    assert: CharmConfigInvalidError is raised.
+    """
+    with pytest.raises(CharmConfigInvalidError):
+        WebserverConfig.from_charm_config(config)
+
+
 @pytest.mark.parametrize("is_running", [True, False])
 def test_webserver_reload(monkeypatch, harness: Harness, is_running, database_migration_mock):
     """
-    arrange: put an empty file in the Flask container and create a webserver object with default
-        charm state.
-    act: run the update_config method of the webserver object with different server running status.
+    arrange: restart the flask application with the default webserver configuration.
+    act: run the update_config method of a webserver object with a different configuration
+        and different server running status.
     assert: webserver object should send signal to the Gunicorn server based on the running status.
     """
     harness.begin()
     container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
     harness.set_can_connect(container, True)
     container.add_layer("default", DEFAULT_LAYER)
-
-    container.push("/flask/gunicorn.conf.py", "")
     charm_state = CharmState(
         framework="flask",
         secret_key="",
         is_secret_storage_ready=True,
     )
-    webserver_config = WebserverConfig()
     workload_config = create_workload_config(
         framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
     )
-    webserver = GunicornWebserver(
-        webserver_config=webserver_config,
-        workload_config=workload_config,
-        container=container,
-    )
     flask_app = WsgiApp(
         container=container,
         charm_state=charm_state,
         workload_config=workload_config,
-        webserver=webserver,
+        webserver=GunicornWebserver(
+            webserver_config=WebserverConfig(),
+            workload_config=workload_config,
+            container=container,
+        ),
         database_migration=database_migration_mock,
     )
     flask_app.restart()
     send_signal_mock = unittest.mock.MagicMock()
     monkeypatch.setattr(container, "send_signal", send_signal_mock)
+    webserver = GunicornWebserver(
+        webserver_config=WebserverConfig(workers=2),
+        workload_config=workload_config,
+        container=container,
+    )
     webserver.update_config(
         is_webserver_running=is_running,
         environment=flask_app.gen_environment(),
@@ -176,6 +587,230 @@ def test_webserver_reload(monkeypatch, harness: Harness, is_running, database_mi
     assert send_signal_mock.call_count == (1 if is_running else 0)
 
 
+@pytest.mark.parametrize(
+    "webserver_config, command_suffix, extra_environment, expected_calls",
+    [
+        pytest.param(WebserverConfig(), "", {}, (0, 0, 0), id="unchanged"),
+        pytest.param(WebserverConfig(workers=2), "", {}, (1, 1, 1), id="config changed"),
+        pytest.param(WebserverConfig(workers=2), " --reload", {}, (1, 1, 1), id="command changed"),
+        pytest.param(
+            WebserverConfig(), "", {"FLASK_DEBUG": "true"}, (0, 1, 0), id="environment changed"
+        ),
+    ],
+)
+def test_webserver_update_config_skipped(
+    monkeypatch,
+    harness: Harness,
+    database_migration_mock,
+    webserver_config,
+    command_suffix,
+    extra_environment,
+    expected_calls,
+):
+    """
+    arrange: restart the flask application with the default webserver configuration.
+    act: run the update_config method of a webserver object.
+    assert: the configuration is pushed and applied only if it changed, and checked with
+        gunicorn if the configuration, the environment or the command changed.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+    flask_app = WsgiApp(
+        container=container,
+        charm_state=CharmState(framework="flask", secret_key="", is_secret_storage_ready=True),
+        workload_config=workload_config,
+        webserver=GunicornWebserver(
+            webserver_config=WebserverConfig(),
+            workload_config=workload_config,
+            container=container,
+        ),
+        database_migration=database_migration_mock,
+    )
+    flask_app.restart()
+    harness.handle_exec(container.name, ["/bin/python3"], result=0)
+    push_mock = unittest.mock.MagicMock(wraps=container.push)
+    exec_mock = unittest.mock.MagicMock(wraps=container.exec)
+    send_signal_mock = unittest.mock.MagicMock()
+    monkeypatch.setattr(container, "push", push_mock)
+    monkeypatch.setattr(container, "exec", exec_mock)
+    monkeypatch.setattr(container, "send_signal", send_signal_mock)
+
+    GunicornWebserver(
+        webserver_config=webserver_config,
+        workload_config=workload_config,
+        container=container,
+    ).update_config(
+        is_webserver_running=True,
+        environment={**flask_app.gen_environment(), **extra_environment},
+        command=DEFAULT_LAYER["services"]["flask"]["command"] + command_suffix,
+    )
+
+    config_pushes = [
+        call for call in push_mock.call_args_list if str(call.args[0]) == "/flask/gunicorn.conf.py"
+    ]
+    assert (len(config_pushes), exec_mock.call_count, send_signal_mock.call_count) == (
+        expected_calls
+    )
+
+
+@pytest.mark.parametrize(
+    "webserver_config, expected_batch",
+    [
+        pytest.param(WebserverConfig(), 0, id="default workers"),
+        pytest.param(WebserverConfig(workers=2), 0, id="2 workers"),
+        pytest.param(WebserverConfig(workers=3), 1, id="3 workers"),
+        pytest.param(WebserverConfig(workers=9), 2, id="9 workers"),
+        pytest.param(WebserverConfig(workers=9, reload_batch=0), 0, id="disabled"),
+        pytest.param(WebserverConfig(workers=2, reload_batch=1), 1, id="configured"),
+    ],
+)
+def test_reload_batch(harness: Harness, webserver_config, expected_batch) -> None:
+    """
+    arrange: none.
+    act: create the Gunicorn webserver object.
+    assert: the workers are replaced in batches from 3 workers, unless configured.
+    """
+    harness.begin()
+    webserver = GunicornWebserver(
+        webserver_config=webserver_config,
+        workload_config=create_workload_config(
+            framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+        ),
+        container=harness.model.unit.get_container(FLASK_CONTAINER_NAME),
+    )
+    assert webserver.reload_batch == expected_batch
+
+
+@pytest.mark.parametrize(
+    "old_workers, workers, reload_batch",
+    [
+        pytest.param(5, 5, 2, id="same workers"),
+        pytest.param(4, 6, 1, id="more workers"),
+        pytest.param(6, 3, 1, id="fewer workers"),
+        pytest.param(3, 3, 5, id="batch larger than workers"),
+        pytest.param(12, 12, 6, id="more signals than queued"),
+    ],
+)
+def test_rolling_reload(monkeypatch, harness: Harness, old_workers, workers, reload_batch) -> None:
+    """
+    arrange: simulate a Gunicorn arbiter running booted workers and the reload hooks.
+    act: reload the Gunicorn webserver, then run a step of the rolling reload per hook.
+    assert: the reload returns without waiting for the workers, and the steps replace all the
+        workers, with at most a batch of extra workers and at least as many running workers
+        as configured minus a batch.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    container.start("flask")
+    workload_config = create_workload_config(
+        framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+    )
+    webserver = GunicornWebserver(
+        webserver_config=WebserverConfig(workers=workers, reload_batch=reload_batch),
+        workload_config=workload_config,
+        container=container,
+    )
+    arbiter = {"num_workers": old_workers, "workers": list(range(old_workers)), "next_pid": 100}
+    running_workers = []
+
+    def manage_workers():
+        """Spawn or stop the oldest workers like the Gunicorn arbiter."""
+        while len(arbiter["workers"]) < arbiter["num_workers"]:
+            arbiter["workers"].append(arbiter["next_pid"])
+            arbiter["next_pid"] += 1
+        while len(arbiter["workers"]) > arbiter["num_workers"]:
+            arbiter["workers"].pop(0)
+        running_workers.append(len(arbiter["workers"]))
+
+    def send_signal(sig, _):
+        """Handle the signals like the Gunicorn arbiter with the reload hooks."""
+        if sig == signal.SIGHUP:
+            arbiter["num_workers"] = workers + reload_batch
+            arbiter["workers"].extend(
+                range(arbiter["next_pid"], arbiter["next_pid"] + reload_batch)
+            )
+            arbiter["next_pid"] += reload_batch
+        if sig == signal.SIGTTIN:
+            arbiter["num_workers"] += 1
+        if sig == signal.SIGTTOU:
+            arbiter["num_workers"] -= 1
+        manage_workers()
+
+    monkeypatch.setattr(container, "send_signal", send_signal)
+    monkeypatch.setattr(
+        RollingReload, "booted_workers", lambda _: {str(pid) for pid in arbiter["workers"]}
+    )
+    monkeypatch.setattr(time, "sleep", unittest.mock.MagicMock(side_effect=AssertionError))
+    rolling_reload = RollingReload(container, workload_config)
+
+    webserver.reload()
+    for _ in range(2 * workers + 2):
+        if not container.exists(rolling_reload.state_path):
+            break
+        rolling_reload.step()
+
+    assert not container.exists(rolling_reload.state_path)
+    assert arbiter["num_workers"] == workers
+    assert all(pid >= 100 for pid in arbiter["workers"])
+    assert max(running_workers) <= workers + reload_batch
+    assert min(running_workers) >= min(workers, old_workers) - reload_batch
+
+
+@pytest.mark.parametrize(
+    "service_running, expected_restarts",
+    [
+        pytest.param(True, 1, id="running"),
+        pytest.param(False, 0, id="stopped"),
+    ],
+)
+def test_rolling_reload_interrupted(
+    monkeypatch, harness: Harness, service_running, expected_restarts
+) -> None:
+    """
+    arrange: record a rolling reload whose first batch of workers never boots.
+    act: run a step of the rolling reload after its deadline.
+    assert: Gunicorn is restarted to restore the configured workers if it runs, and the
+        rolling reload is forgotten.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    if service_running:
+        container.start("flask")
+    rolling_reload = RollingReload(
+        container,
+        create_workload_config(
+            framework_name="flask", unit_name="flask/0", state_dir=harness.charm._state_dir
+        ),
+    )
+    monkeypatch.setattr(RollingReload, "booted_workers", lambda _: {"1", "2", "3"})
+    restart_mock = unittest.mock.MagicMock()
+    monkeypatch.setattr(container, "restart", restart_mock)
+    rolling_reload.start({"1", "2", "3"}, workers=3, batch=1)
+    monkeypatch.setattr(time, "time", lambda: 1e12)
+
+    rolling_reload.step()
+
+    assert restart_mock.call_count == expected_restarts
+    assert not container.exists(rolling_reload.state_path)
+
+
+def test_validate_gunicorn_config() -> None:
+    """
+    arrange: none.
+    act: validate a Gunicorn configuration that is not valid Python.
+    assert: CharmConfigInvalidError is raised.
+    """
+    validate_gunicorn_config("workers = 2\n", "gunicorn.conf.py")
+    with pytest.raises(CharmConfigInvalidError):
+        validate_gunicorn_config("workers = \n", "gunicorn.conf.py")
+
+
 def test_enable_pebble_log_forwarding(monkeypatch):
     """
     arrange: set JUJU_VERSION environment variable to different versions.
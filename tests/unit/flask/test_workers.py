@@ -3,10 +3,14 @@
 
 """Unit tests for worker services."""
 
+import json
+
 import ops
 import pytest
 from ops.testing import ExecResult, Harness
 
+from paas_charm.utils import build_k8s_unit_fqdn
+
 from .constants import DEFAULT_LAYER, FLASK_CONTAINER_NAME, LAYER_WITH_WORKER
 
 
@@ -27,10 +31,15 @@ def test_worker(harness: Harness):
     assert "FLASK_SECRET_KEY" in services["flask"].environment
     assert services["flask"].environment == services["real-worker"].environment
     assert services["flask"].environment == services["Another-Real-WorkeR"].environment
+    scheduler_environment = {
+        **services["flask"].environment,
+        "SCHEDULER_SHARD_INDEX": "0",
+        "SCHEDULER_SHARD_COUNT": "1",
+    }
     assert services["real-scheduler"].startup == "enabled"
-    assert services["flask"].environment == services["real-scheduler"].environment
+    assert services["real-scheduler"].environment == scheduler_environment
     assert services["ANOTHER-REAL-SCHEDULER"].startup == "enabled"
-    assert services["flask"].environment == services["ANOTHER-REAL-SCHEDULER"].environment
+    assert services["ANOTHER-REAL-SCHEDULER"].environment == scheduler_environment
     assert "FLASK_SECRET_KEY" not in services["not-worker-service"].environment
 
 
@@ -40,7 +49,7 @@ def test_worker(harness: Harness):
         (
             "eventlet",
             "blocked",
-            "Only 'gevent' and 'sync' are allowed. https://bit.ly/flask-async-doc",
+            "Only 'gevent', 'sync' and 'uvicorn' are allowed. https://bit.ly/flask-async-doc",
             1,
         ),
         ("gevent", "active", "", 0),
@@ -79,7 +88,7 @@ def test_async_workers_config(
             DEFAULT_LAYER,
             "eventlet",
             "blocked",
-            "Only 'gevent' and 'sync' are allowed. https://bit.ly/flask-async-doc",
+            "Only 'gevent', 'sync' and 'uvicorn' are allowed. https://bit.ly/flask-async-doc",
             1,
             id="fail-eventlet",
         ),
@@ -185,3 +194,140 @@ def test_worker_multiple_units(harness: Harness):
     assert services["real-scheduler"].startup == "disabled"
     assert "FLASK_SECRET_KEY" not in services["real-scheduler"].environment
     assert "FLASK_SECRET_KEY" not in services["not-worker-service"].environment
+
+
+def test_unit_roles_allocation(harness: Harness):
+    """
+    arrange: Prepare the leader unit with workers and schedulers and two peer units.
+    act: Request one worker unit and one scheduler unit with the app-unit-roles option.
+    assert: The leader should allocate the dedicated roles to the other units and only run
+            the web service itself.
+    """
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", LAYER_WITH_WORKER)
+    harness.begin_with_initial_hooks()
+    relation_id = harness.model.get_relation("secret-storage").id
+    harness.add_relation_unit(relation_id, "flask-k8s/1")
+    harness.add_relation_unit(relation_id, "flask-k8s/2")
+
+    harness.update_config({"app-unit-roles": "worker=1,scheduler=1"})
+
+    assert json.loads(harness.get_relation_data(relation_id, "flask-k8s")["unit-roles"]) == {
+        "flask-k8s/0": "web",
+        "flask-k8s/1": "worker",
+        "flask-k8s/2": "scheduler",
+    }
+    assert harness.model.unit.status == ops.ActiveStatus("web unit")
+    services = container.get_plan().services
+    assert services["flask"].startup == "enabled"
+    assert services["real-worker"].startup == "disabled"
+    assert services["real-scheduler"].startup == "disabled"
+    assert services["not-worker-service"].startup == "enabled"
+
+
+def test_worker_unit(harness: Harness):
+    """
+    arrange: Prepare a non leader unit with workers and schedulers, allocated the worker role
+            in the peer relation data and published to the ingress.
+    act: Run initial hooks.
+    assert: The unit should run the workers, and the schedulers as unit 0 without scheduler
+            units, but not Gunicorn, and publish the address of the web unit to the ingress.
+    """
+    harness.set_leader(False)
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", LAYER_WITH_WORKER)
+    harness.add_relation(
+        "secret-storage",
+        "flask-k8s",
+        app_data={
+            "flask_secret_key": "test",
+            "unit-roles": json.dumps({"flask-k8s/0": "worker", "flask-k8s/1": "web"}),
+        },
+    )
+    ingress_relation_id = harness.add_relation("ingress", "traefik")
+    harness.update_relation_data(ingress_relation_id, "flask-k8s/0", {"host": '"flask-k8s-0"'})
+    harness.update_config({"app-unit-roles": "worker=1"})
+
+    harness.begin_with_initial_hooks()
+
+    assert harness.model.unit.status == ops.ActiveStatus("worker unit")
+    services = container.get_plan().services
+    assert services["flask"].startup == "disabled"
+    assert services["real-worker"].startup == "enabled"
+    assert "FLASK_SECRET_KEY" in services["real-worker"].environment
+    assert services["real-scheduler"].startup == "enabled"
+    assert not container.exists("/flask/gunicorn.conf.py")
+    ingress_unit_data = harness.get_relation_data(ingress_relation_id, "flask-k8s/0")
+    assert json.loads(ingress_unit_data["host"]) == build_k8s_unit_fqdn(
+        "flask-k8s", "flask-k8s/1", harness.model.name
+    )
+
+
+def test_leader_worker_unit(harness: Harness):
+    """
+    arrange: Prepare the leader unit with workers and schedulers, allocated the worker role
+            in the peer relation data, and a web peer unit.
+    act: Run initial hooks.
+    assert: The leader should give its worker role to the peer unit, run the web service and
+            publish the application data of the ingress.
+    """
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", LAYER_WITH_WORKER)
+    relation_id = harness.add_relation(
+        "secret-storage",
+        "flask-k8s",
+        app_data={
+            "flask_secret_key": "test",
+            "unit-roles": json.dumps({"flask-k8s/0": "worker", "flask-k8s/1": "web"}),
+        },
+    )
+    harness.add_relation_unit(relation_id, "flask-k8s/1")
+    ingress_relation_id = harness.add_relation("ingress", "traefik")
+    harness.update_config({"app-unit-roles": "worker=1"})
+
+    harness.begin_with_initial_hooks()
+
+    assert json.loads(harness.get_relation_data(relation_id, "flask-k8s")["unit-roles"]) == {
+        "flask-k8s/0": "web",
+        "flask-k8s/1": "worker",
+    }
+    assert harness.model.unit.status == ops.ActiveStatus("web unit")
+    services = container.get_plan().services
+    assert services["flask"].startup == "enabled"
+    assert services["real-worker"].startup == "disabled"
+    ingress_app_data = harness.get_relation_data(ingress_relation_id, "flask-k8s")
+    assert json.loads(ingress_app_data["port"]) == 8000
+
+
+def test_scheduler_shards(harness: Harness):
+    """
+    arrange: Prepare a non leader unit with workers and schedulers, allocated the second
+            shard of two scheduler units in the peer relation data.
+    act: Run initial hooks.
+    assert: The schedulers should get the shard index and count of the unit.
+    """
+    harness.set_leader(False)
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", LAYER_WITH_WORKER)
+    harness.add_relation(
+        "secret-storage",
+        "flask-k8s",
+        app_data={
+            "flask_secret_key": "test",
+            "unit-roles": json.dumps(
+                {"flask-k8s/0": "scheduler", "flask-k8s/1": "web", "flask-k8s/2": "scheduler"}
+            ),
+            "scheduler-shards": json.dumps({"flask-k8s/2": 0, "flask-k8s/0": 1}),
+        },
+    )
+    harness.update_config({"app-unit-roles": "scheduler=2"})
+
+    harness.begin_with_initial_hooks()
+
+    assert harness.model.unit.status == ops.ActiveStatus("scheduler unit")
+    services = container.get_plan().services
+    assert services["flask"].startup == "disabled"
+    assert services["real-worker"].startup == "disabled"
+    assert services["real-scheduler"].startup == "enabled"
+    assert services["real-scheduler"].environment["SCHEDULER_SHARD_INDEX"] == "1"
+    assert services["real-scheduler"].environment["SCHEDULER_SHARD_COUNT"] == "2"
@@ -0,0 +1,315 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Benchmark the framework charms through a representative sequence of events.
+
+Every event of the sequence records its wall time, the Pebble API calls and the Juju model
+reads of the charm. The test fails when the Pebble API calls or the Juju model reads of an
+event exceed the budget recorded in ``benchmark_budgets.json``. The wall time is only
+reported, it depends too much on the machine running the tests to be asserted.
+
+The calls made by the charm libraries fetched in ``lib/charms`` are only reported, they depend
+on the versions of the libraries and not on paas-charm. The state directory of the workload
+container persists across the events like in a real container, so the config-changed event
+finds the restart fingerprint stored by the pebble-ready event and skips the restart.
+
+After an intended change of the counts, record the budgets again with::
+
+    PAAS_CHARM_RECORD_BENCHMARK_BUDGETS=1 tox -e unit -- tests/unit/general/test_benchmark.py
+"""
+
+import collections
+import dataclasses
+import functools
+import inspect
+import json
+import logging
+import os
+import pathlib
+import time
+import typing
+
+import ops
+import pytest
+from ops import testing
+
+from examples.django.charm.src.charm import DjangoCharm
+from examples.expressjs.charm.src.charm import ExpressJSCharm
+from examples.fastapi.charm.src.charm import FastAPICharm
+from examples.flask.charm.src.charm import FlaskCharm
+from examples.go.charm.src.charm import GoCharm
+from examples.springboot.charm.src.charm import SpringBootCharm
+
+logger = logging.getLogger(__name__)
+
+BUDGETS_FILE = pathlib.Path(__file__).parent / "benchmark_budgets.json"
+RECORD_BUDGETS_ENV = "PAAS_CHARM_RECORD_BENCHMARK_BUDGETS"
+
+PEBBLE_OPERATIONS = (
+    "add_layer",
+    "can_connect",
+    "exec",
+    "exists",
+    "get_plan",
+    "get_service",
+    "get_services",
+    "isdir",
+    "list_files",
+    "make_dir",
+    "pull",
+    "push",
+    "remove_path",
+    "replan",
+    "restart",
+    "send_signal",
+    "start",
+    "stop",
+)
+MODEL_READS = (
+    "config_get",
+    "is_leader",
+    "network_get",
+    "planned_units",
+    "relation_get",
+    "relation_ids",
+    "relation_list",
+    "relation_model_get",
+    "relation_remote_app_name",
+    "resource_get",
+    "secret_get",
+    "secret_info_get",
+    "status_get",
+)
+MODEL_READS_KEY = "model_reads"
+CHARM_LIBS_PACKAGE = "charms."
+
+EVENTS: dict[str, typing.Callable[[testing.Context, testing.State], testing.CharmEvents]] = {
+    "install": lambda context, _: context.on.install(),
+    "pebble-ready": lambda context, state: context.on.pebble_ready(next(iter(state.containers))),
+    "relation-joined": lambda context, state: context.on.relation_joined(
+        state.get_relations("secret-storage")[0], remote_unit=1
+    ),
+    "config-changed": lambda context, _: context.on.config_changed(),
+    "update-status": lambda context, _: context.on.update_status(),
+}
+
+
+def _called_from_charm_lib() -> bool:
+    """Check if the current call comes from a charm library.
+
+    Returns:
+        True if a module of the charm libraries is in the call stack.
+    """
+    frame = inspect.currentframe()
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith(CHARM_LIBS_PACKAGE):
+            return True
+        frame = frame.f_back
+    return False
+
+
+class _CallCounter:
+    """Count the calls of the methods of a class, without the calls nested in another one.
+
+    Attributes:
+        counts: the number of calls by method name, without the calls of the charm libraries.
+        charm_lib_counts: the number of calls of the charm libraries by method name.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the _CallCounter."""
+        self.counts: collections.Counter[str] = collections.Counter()
+        self.charm_lib_counts: collections.Counter[str] = collections.Counter()
+        self._depth = 0
+
+    def patch(self, monkeypatch: pytest.MonkeyPatch, target: type, names: tuple[str, ...]):
+        """Count the calls of the given methods of a class.
+
+        Args:
+            monkeypatch: the pytest monkeypatch fixture.
+            target: the class of the methods.
+            names: the names of the methods.
+        """
+        for name in names:
+            monkeypatch.setattr(target, name, self._wrap(name, getattr(target, name)))
+
+    def patch_model_backend(self, monkeypatch: pytest.MonkeyPatch, names: tuple[str, ...]):
+        """Count the calls of the given methods of the Juju model backend of the charms.
+
+        The methods are wrapped on the backend instance given to every ``ops.Model``, so the
+        counts do not depend on how the testing framework implements the backend.
+
+        Args:
+            monkeypatch: the pytest monkeypatch fixture.
+            names: the names of the methods.
+        """
+        original_init = ops.Model.__init__
+
+        @functools.wraps(original_init)
+        def init(model, meta, backend, *args, **kwargs):
+            """Wrap the methods of the backend and initialize the model.
+
+            Args:
+                model: the model being initialized.
+                meta: the charm metadata.
+                backend: the Juju model backend.
+                args: the other positional arguments of the model.
+                kwargs: the keyword arguments of the model.
+            """
+            for name in names:
+                setattr(backend, name, self._wrap(name, getattr(backend, name)))
+            original_init(model, meta, backend, *args, **kwargs)
+
+        monkeypatch.setattr(ops.Model, "__init__", init)
+
+    def _wrap(self, name: str, method: typing.Callable) -> typing.Callable:
+        """Wrap a method to count its calls.
+
+        Args:
+            name: the name of the method.
+            method: the method.
+
+        Returns:
+            The wrapped method.
+        """
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            """Count the call and call the method.
+
+            Args:
+                args: the positional arguments of the method.
+                kwargs: the keyword arguments of the method.
+
+            Returns:
+                The return value of the method.
+            """
+            if self._depth == 0:
+                if _called_from_charm_lib():
+                    self.charm_lib_counts[name] += 1
+                else:
+                    self.counts[name] += 1
+            self._depth += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._depth -= 1
+
+        return wrapper
+
+    def pop(self) -> tuple[collections.Counter[str], collections.Counter[str]]:
+        """Get the calls counted so far and reset them.
+
+        Returns:
+            The number of calls by method name, without and with only the charm libraries.
+        """
+        counts, charm_lib_counts = self.counts, self.charm_lib_counts
+        self.counts = collections.Counter()
+        self.charm_lib_counts = collections.Counter()
+        return counts, charm_lib_counts
+
+
+@pytest.mark.parametrize(
+    "base_state, charm, config, state_dir",
+    [
+        pytest.param("flask_base_state", FlaskCharm, {}, "/tmp/flask/state", id="flask"),
+        pytest.param("django_base_state", DjangoCharm, {}, "/tmp/django/state", id="django"),
+        pytest.param(
+            "fastapi_base_state",
+            FastAPICharm,
+            {
+                "non-optional-string": "test",
+            },
+            "/tmp/fastapi/state",
+            id="fastapi",
+        ),
+        pytest.param("go_base_state", GoCharm, {}, "/tmp/go/state", id="go"),
+        pytest.param("expressjs_base_state", ExpressJSCharm, {}, "/app/state", id="expressjs"),
+        pytest.param(
+            "spring_boot_base_state", SpringBootCharm, {}, "/app/state", id="spring-boot"
+        ),
+    ],
+)
+def test_event_sequence_budget(
+    base_state: str,
+    charm: type[ops.CharmBase],
+    config: dict,
+    state_dir: str,
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+    record_property: typing.Callable[[str, object], None],
+    tmp_path: pathlib.Path,
+) -> None:
+    """
+    arrange: count the Pebble API calls and the Juju model reads of the charm, and keep the
+        state directory of the workload container across the events.
+    act: run install, pebble-ready, relation-joined, config-changed and update-status.
+    assert: the counts of every event are within the recorded budget and the unchanged
+        config-changed event does not replan the workload.
+    """
+    framework = request.node.callspec.id
+    state_args = request.getfixturevalue(base_state)
+    state_args["config"] = config
+    state_args["relations"] = [
+        (
+            dataclasses.replace(relation, peers_data={1: {}})
+            if isinstance(relation, testing.PeerRelation)
+            else relation
+        )
+        for relation in state_args["relations"]
+    ]
+    state_args["containers"] = {
+        dataclasses.replace(
+            container,
+            mounts={
+                **container.mounts,
+                "state": testing.Mount(location=state_dir, source=tmp_path),
+            },
+        )
+        for container in state_args["containers"]
+    }
+    state = testing.State(**state_args)
+    context = testing.Context(charm_type=charm)
+    pebble_counter = _CallCounter()
+    pebble_counter.patch(monkeypatch, ops.Container, PEBBLE_OPERATIONS)
+    model_counter = _CallCounter()
+    model_counter.patch_model_backend(monkeypatch, MODEL_READS)
+
+    measured: dict[str, dict[str, int]] = {}
+    for event_name, event in EVENTS.items():
+        start = time.perf_counter()
+        state = context.run(event(context, state), state)
+        wall_time = time.perf_counter() - start
+        pebble_calls, charm_lib_pebble_calls = pebble_counter.pop()
+        model_reads, charm_lib_model_reads = model_counter.pop()
+        counts = dict(sorted(pebble_calls.items()))
+        counts[MODEL_READS_KEY] = sum(model_reads.values())
+        charm_lib_counts = dict(sorted(charm_lib_pebble_calls.items()))
+        charm_lib_counts[MODEL_READS_KEY] = sum(charm_lib_model_reads.values())
+        measured[event_name] = counts
+        record_property(f"{event_name}_wall_time_ms", round(wall_time * 1000, 3))
+        logger.info(
+            "%s %s: %.3f ms, %s, charm libraries %s",
+            framework,
+            event_name,
+            wall_time * 1000,
+            counts,
+            charm_lib_counts,
+        )
+
+    assert "replan" not in measured["config-changed"]
+
+    budgets = json.loads(BUDGETS_FILE.read_text(encoding="utf-8"))
+    if os.environ.get(RECORD_BUDGETS_ENV):
+        budgets[framework] = measured
+        BUDGETS_FILE.write_text(
+            json.dumps(budgets, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        return
+    over_budget = {
+        f"{event_name} {name}": f"{count} > {budgets[framework][event_name].get(name, 0)}"
+        for event_name, counts in measured.items()
+        for name, count in counts.items()
+        if count > budgets[framework][event_name].get(name, 0)
+    }
+    assert not over_budget, f"over the budgets of {BUDGETS_FILE.name}: {over_budget}"
@@ -0,0 +1,231 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Cgroup unit tests."""
+
+import io
+import pathlib
+import unittest.mock
+
+import ops
+import pytest
+from ops.pebble import APIError, PathError
+
+from paas_charm.cgroup import (
+    DEFAULT_WORKER_MEMORY,
+    parse_cpu_list,
+    read_cpu_count,
+    read_recorded_worker_memory,
+    read_worker_memory,
+    record_worker_memory,
+)
+
+GUNICORN_COMMAND = "/bin/python3 -m gunicorn -c /flask/gunicorn.conf.py app:app -k [ sync ]"
+GUNICORN_ARGS = "/bin/python3\0-m\0gunicorn\0-c\0/flask/gunicorn.conf.py\0app:app\0-k\0sync\0"
+
+
+def _container(files: dict[str, str]) -> unittest.mock.MagicMock:
+    """Build a container mock serving the given files.
+
+    Args:
+        files: The content of the files of the container by path.
+
+    Returns:
+        The container mock.
+    """
+    container = unittest.mock.MagicMock(spec=ops.Container)
+
+    def pull(path: str | pathlib.PurePath) -> io.StringIO:
+        """Read a file of the container.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            The content of the file.
+
+        Raises:
+            PathError: if the file does not exist.
+        """
+        if str(path) not in files:
+            raise PathError("not-found", str(path))
+        return io.StringIO(files[str(path)])
+
+    container.pull.side_effect = pull
+    return container
+
+
+def _status(ppid: int, rss_kb: int) -> str:
+    """Build the content of the status of a process.
+
+    Args:
+        ppid: The ID of the parent process.
+        rss_kb: The resident memory of the process in kB.
+
+    Returns:
+        The content of the status file.
+    """
+    return f"Name:\tpython3\nPPid:\t{ppid}\nVmRSS:\t  {rss_kb} kB\n"
+
+
+@pytest.mark.parametrize(
+    "cpu_list, expected",
+    [
+        pytest.param("0", 1, id="one"),
+        pytest.param("0-3\n", 4, id="range"),
+        pytest.param("0-3,6,8-9", 7, id="ranges"),
+    ],
+)
+def test_parse_cpu_list(cpu_list, expected):
+    """
+    arrange: none.
+    act: count the CPUs of the cpuset list.
+    assert: every CPU of the ranges should be counted.
+    """
+    assert parse_cpu_list(cpu_list) == expected
+
+
+def test_read_cpu_count_cpuset():
+    """
+    arrange: prepare a container with an effective cpuset.
+    act: count the CPUs of the container.
+    assert: the CPUs of the cpuset should be counted without running nproc.
+    """
+    container = _container({"/sys/fs/cgroup/cpuset.cpus.effective": "0-1\n"})
+
+    assert read_cpu_count(container) == 2
+    container.exec.assert_not_called()
+
+
+def test_read_cpu_count_nproc():
+    """
+    arrange: prepare a container without cpuset, where nproc prints 6.
+    act: count the CPUs of the container.
+    assert: the CPUs should be counted by nproc in the container.
+    """
+    container = _container({})
+    container.exec.return_value.wait_output.return_value = ("6\n", "")
+
+    assert read_cpu_count(container) == 6
+    container.exec.assert_called_once_with(["nproc"])
+
+
+def test_read_cpu_count_fallback(monkeypatch):
+    """
+    arrange: prepare a container without cpuset nor nproc.
+    act: count the CPUs of the container.
+    assert: the CPUs of the charm container should be counted.
+    """
+    monkeypatch.setattr("os.cpu_count", lambda: 3)
+    container = _container({})
+    container.exec.side_effect = APIError({}, 500, "error", "nproc not found")
+
+    assert read_cpu_count(container) == 3
+
+
+def test_read_worker_memory_workers():
+    """
+    arrange: prepare a container running Pebble, a Gunicorn arbiter with two workers and
+        another service with a child process.
+    act: measure the memory of the workers of the Gunicorn service.
+    assert: the average resident memory of the Gunicorn workers only should be measured.
+    """
+    container = _container(
+        {
+            "/sys/fs/cgroup/cgroup.procs": "1\n10\n11\n12\n20\n21\n",
+            "/proc/1/status": _status(0, 20000),
+            "/proc/10/status": _status(1, 50000),
+            "/proc/10/cmdline": GUNICORN_ARGS,
+            "/proc/11/status": _status(10, 100000),
+            "/proc/12/status": _status(10, 200000),
+            "/proc/20/status": _status(1, 50000),
+            "/proc/20/cmdline": "celery\0worker\0",
+            "/proc/21/status": _status(20, 900000),
+        }
+    )
+
+    assert read_worker_memory(container, GUNICORN_COMMAND) == 150000 * 1024
+
+
+def test_read_worker_memory_single_process():
+    """
+    arrange: prepare a container running the service in a single process.
+    act: measure the memory of the workers of the service.
+    assert: the resident memory of the main process should be measured.
+    """
+    container = _container(
+        {
+            "/sys/fs/cgroup/cgroup.procs": "1\n10\n",
+            "/proc/1/status": _status(0, 20000),
+            "/proc/10/status": _status(1, 80000),
+            "/proc/10/cmdline": GUNICORN_ARGS,
+        }
+    )
+
+    assert read_worker_memory(container, GUNICORN_COMMAND) == 80000 * 1024
+
+
+def test_read_worker_memory_not_running():
+    """
+    arrange: prepare a container where the service does not run.
+    act: measure the memory of the workers of the service.
+    assert: the memory should not be measured.
+    """
+    container = _container(
+        {"/sys/fs/cgroup/cgroup.procs": "1\n", "/proc/1/status": _status(0, 20000)}
+    )
+
+    assert read_worker_memory(container, GUNICORN_COMMAND) is None
+
+
+@pytest.mark.parametrize(
+    "recorded_memory, expected_changed",
+    [
+        pytest.param(None, True, id="not recorded"),
+        pytest.param(str(192 * 1024 * 1024), True, id="changed"),
+        pytest.param(str(256 * 1024 * 1024), False, id="unchanged"),
+    ],
+)
+def test_record_worker_memory(recorded_memory, expected_changed):
+    """
+    arrange: prepare a container running Gunicorn with a worker of 200 MB, with a recorded
+        worker memory or not.
+    act: record the memory of the workers of the Gunicorn service.
+    assert: the measured memory, rounded up to 256 MiB, should only be recorded if it changed.
+    """
+    files = {
+        "/sys/fs/cgroup/cgroup.procs": "1\n10\n11\n",
+        "/proc/1/status": _status(0, 20000),
+        "/proc/10/status": _status(1, 50000),
+        "/proc/10/cmdline": GUNICORN_ARGS,
+        "/proc/11/status": _status(10, 200000),
+    }
+    if recorded_memory is not None:
+        files["/tmp/state/worker-memory"] = recorded_memory
+    container = _container(files)
+    container.get_services.return_value = {
+        "flask": unittest.mock.MagicMock(is_running=lambda: True)
+    }
+    container.get_plan.return_value = ops.pebble.Plan(
+        {"services": {"flask": {"override": "replace", "command": GUNICORN_COMMAND}}}
+    )
+    state_dir = pathlib.Path("/tmp/state")  # nosec: B108
+
+    assert record_worker_memory(container, state_dir, "flask") is expected_changed
+    if expected_changed:
+        container.push.assert_called_once_with(
+            state_dir / "worker-memory", str(256 * 1024 * 1024), make_dirs=True
+        )
+    else:
+        container.push.assert_not_called()
+
+
+def test_read_recorded_worker_memory_default():
+    """
+    arrange: prepare a container without recorded worker memory.
+    act: read the recorded memory of a worker.
+    assert: the default memory of a worker should be returned.
+    """
+    state_dir = pathlib.Path("/tmp/state")  # nosec: B108
+
+    assert read_recorded_worker_memory(_container({}), state_dir) == DEFAULT_WORKER_MEMORY
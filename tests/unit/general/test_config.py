@@ -3,6 +3,7 @@
 
 """Utils unit tests."""
 
+import json
 import os
 import pathlib
 import unittest
@@ -11,7 +12,7 @@ import ops
 import pytest
 import yaml
 from ops.testing import Harness
-from pydantic import Field
+from pydantic import Field, ValidationError
 
 import paas_charm
 from paas_charm.charm_state import _create_config_attribute
@@ -435,6 +436,93 @@ def test_app_config_class_factory(
     )
 
 
+def test_app_config_validator_cache(tmp_path: pathlib.Path, monkeypatch):
+    """
+    arrange: Provide mock config yaml with optional and non optional config options.
+    act: Get the AppConfig validator twice with a cache directory.
+    assert: The second validator should be loaded from the cache without creating the model
+        and should validate the configuration as the dynamically created model.
+    """
+    mock_yaml, _ = _test_app_config_class_factory_parameters()[0].values
+    monkeypatch.setattr(
+        "paas_charm.charm_state.config_metadata",
+        unittest.mock.MagicMock(return_value=mock_yaml),
+    )
+    cache_dir = tmp_path / "cache"
+
+    created_validator = paas_charm.charm_state.get_app_config_validator(
+        tmp_path, "flask", cache_dir
+    )
+    monkeypatch.setattr(
+        "paas_charm.charm_state.app_config_class_factory",
+        unittest.mock.MagicMock(side_effect=AssertionError("model should not be created")),
+    )
+    cached_validator = paas_charm.charm_state.get_app_config_validator(
+        tmp_path, "flask", cache_dir
+    )
+
+    assert len(list(cache_dir.iterdir())) == 1
+    invalid_config = {"bool": "not-a-bool", "optional_int": 1}
+    with pytest.raises(ValidationError) as created_exc:
+        created_validator.validate_python(invalid_config)
+    with pytest.raises(ValidationError) as cached_exc:
+        cached_validator.validate_python(invalid_config)
+    assert cached_exc.value.errors() == created_exc.value.errors()
+
+
+def test_app_config_validator_invalid_cache(tmp_path: pathlib.Path, monkeypatch):
+    """
+    arrange: Provide mock config yaml and corrupt the cached AppConfig schema.
+    act: Get the AppConfig validator.
+    assert: The validator should be created dynamically and the cache should be rewritten.
+    """
+    mock_yaml, _ = _test_app_config_class_factory_parameters()[0].values
+    monkeypatch.setattr(
+        "paas_charm.charm_state.config_metadata",
+        unittest.mock.MagicMock(return_value=mock_yaml),
+    )
+    cache_dir = tmp_path / "cache"
+    paas_charm.charm_state.get_app_config_validator(tmp_path, "flask", cache_dir)
+    (cache_file,) = cache_dir.iterdir()
+    cache_file.write_text("{invalid", encoding="utf-8")
+
+    validator = paas_charm.charm_state.get_app_config_validator(tmp_path, "flask", cache_dir)
+
+    with pytest.raises(ValidationError):
+        validator.validate_python({})
+    assert json.loads(cache_file.read_text(encoding="utf-8"))["type"] == "model-fields"
+
+
+def test_app_config_validator_stale_cache_pruned(tmp_path: pathlib.Path, monkeypatch):
+    """
+    arrange: Cache the AppConfig schema of a configuration and change the configuration options.
+    act: Get the AppConfig validator.
+    assert: Only the schema of the current configuration options should stay in the cache.
+    """
+    mock_yaml, _ = _test_app_config_class_factory_parameters()[0].values
+    monkeypatch.setattr(
+        "paas_charm.charm_state.config_metadata",
+        unittest.mock.MagicMock(return_value=mock_yaml),
+    )
+    cache_dir = tmp_path / "cache"
+    paas_charm.charm_state.get_app_config_validator(tmp_path, "flask", cache_dir)
+    (stale_cache_file,) = cache_dir.iterdir()
+    unrelated_file = cache_dir / "unrelated"
+    unrelated_file.touch()
+    changed_yaml = {"options": {**mock_yaml["options"], "new-option": {"type": "string"}}}
+    monkeypatch.setattr(
+        "paas_charm.charm_state.config_metadata",
+        unittest.mock.MagicMock(return_value=changed_yaml),
+    )
+
+    paas_charm.charm_state.get_app_config_validator(tmp_path, "flask", cache_dir)
+
+    cache_files = set(cache_dir.iterdir())
+    assert len(cache_files) == 2
+    assert stale_cache_file not in cache_files
+    assert unrelated_file in cache_files
+
+
 @pytest.mark.parametrize(
     "app_harness, framework, container_name, app_prefix",
     [
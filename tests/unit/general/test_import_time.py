@@ -0,0 +1,78 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the modules imported when a charm starts."""
+
+import os
+import subprocess  # nosec B404
+import sys
+
+import pytest
+
+FRAMEWORK_MODULES = [
+    "paas_charm.django",
+    "paas_charm.expressjs",
+    "paas_charm.fastapi",
+    "paas_charm.flask",
+    "paas_charm.go",
+    "paas_charm.springboot",
+]
+
+# Integration modules that should only be imported if the charm requires the integration.
+INTEGRATION_MODULES = [
+    "charms.hydra.v0.oauth",
+    "charms.openfga_k8s.v1.openfga",
+    "charms.saml_integrator.v0.saml",
+    "charms.smtp_integrator.v0.smtp",
+    "charms.squid_forward_proxy.v0.http_proxy",
+    "charms.tempo_coordinator_k8s.v0.tracing",
+    "paas_charm.http_proxy",
+    "paas_charm.oauth",
+    "paas_charm.rabbitmq",
+    "paas_charm.redis",
+    "paas_charm.s3",
+    "paas_charm.saml",
+    "paas_charm.tracing",
+]
+
+# Maximum cumulative import time of a framework module, in microseconds.
+IMPORT_TIME_CAP_US = 1_500_000
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Import a module in a new Python process and get the import times.
+
+    Args:
+        module: the module to import.
+
+    Returns:
+        The cumulative import time in microseconds of every imported module.
+    """
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        text=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+@pytest.mark.parametrize("module", FRAMEWORK_MODULES)
+def test_framework_module_imports(module: str):
+    """
+    arrange: none.
+    act: import the framework module with -X importtime in a new Python process.
+    assert: no integration module or jinja2 is imported and the import time is under the cap.
+    """
+    import_times = _import_times(module)
+
+    assert not [name for name in INTEGRATION_MODULES if name in import_times]
+    assert "jinja2" not in import_times
+    assert import_times[module] < IMPORT_TIME_CAP_US
@@ -220,3 +220,22 @@ class TestBuildPrometheusJobs:
             "app-0.app-endpoints.model.svc.cluster.local:8081",
             "localhost:9090",
         ]
+
+
+class TestSchedulerShards:
+    """Tests for the @scheduler placeholder with several scheduler units."""
+
+    def test_scheduler_placeholder_expands_to_all_units(self):
+        """Test @scheduler placeholder expands to one target per scheduler unit."""
+        jobs = build_prometheus_jobs(
+            "@scheduler:8081",
+            "/metrics",
+            None,
+            "flask-app",
+            "my-model",
+            scheduler_units=["flask-app/2", "flask-app/5"],
+        )
+        assert jobs[0]["static_configs"][0]["targets"] == [
+            "flask-app-2.flask-app-endpoints.my-model.svc.cluster.local:8081",
+            "flask-app-5.flask-app-endpoints.my-model.svc.cluster.local:8081",
+        ]
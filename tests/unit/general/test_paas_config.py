@@ -18,6 +18,7 @@ from paas_charm.paas_config import (
     PaasConfig,
     PrometheusConfig,
     ScrapeConfig,
+    ServiceRole,
     StaticConfig,
     read_paas_config,
 )
@@ -51,6 +52,48 @@ class TestPaasConfig:
         config = PaasConfig(framework_logging_format="json")
         assert config.framework_logging_format == LoggingFormat.JSON
 
+    def test_valid_services(self):
+        """Test that services declare their role, integrations and configuration options."""
+        config = PaasConfig(
+            services={
+                "flask-worker": {"integrations": ["redis", "peer-fqdns"], "config": []},
+                "celery": {"role": "worker", "replicas": "auto"},
+            }
+        )
+        assert config.services["flask-worker"].role is None
+        assert config.services["flask-worker"].integrations == ["redis", "peer-fqdns"]
+        assert config.services["flask-worker"].config == []
+        assert config.services["celery"].role == ServiceRole.WORKER
+        assert config.services["celery"].integrations is None
+        assert config.services["celery"].replicas == "auto"
+
+    @pytest.mark.parametrize("replicas", [0, "many"])
+    def test_invalid_service_replicas_rejected(self, replicas):
+        """Test that the replicas of a service are a positive number or auto."""
+        with pytest.raises(ValidationError):
+            PaasConfig(services={"flask-worker": {"replicas": replicas}})
+
+    def test_unknown_service_integration_rejected(self):
+        """Test that a service cannot declare an unknown integration."""
+        with pytest.raises(ValidationError) as exc_info:
+            PaasConfig(services={"flask-worker": {"integrations": ["ingress"]}})
+        assert "Unknown integrations ingress" in str(exc_info.value)
+
+    def test_valid_peer_fqdns_file(self):
+        """Test the peer FQDNs file with a signal."""
+        config = PaasConfig(peer_fqdns_file=True, peer_fqdns_signal="SIGUSR1")
+        assert config.peer_fqdns_file
+        assert config.peer_fqdns_signal == "SIGUSR1"
+
+    @pytest.mark.parametrize(
+        "peer_fqdns_file, peer_fqdns_signal",
+        [pytest.param(True, "SIGNOPE", id="unknown"), pytest.param(False, "SIGHUP", id="no file")],
+    )
+    def test_invalid_peer_fqdns_signal_rejected(self, peer_fqdns_file, peer_fqdns_signal):
+        """Test that the peer FQDNs signal is a signal name and requires the file."""
+        with pytest.raises(ValidationError):
+            PaasConfig(peer_fqdns_file=peer_fqdns_file, peer_fqdns_signal=peer_fqdns_signal)
+
     def test_invalid_logging_format_rejected(self):
         """Test that an unsupported logging format value is rejected."""
         with pytest.raises(ValidationError) as exc_info:
@@ -179,6 +222,28 @@ class TestReadPaasConfig:
         config = read_paas_config(tmp_path)
         assert config.prometheus is not None
 
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        """Test that reading an unchanged config file does not parse it again."""
+        config_path = tmp_path / CONFIG_FILE_NAME
+        config_path.write_text("framework_logging_format: json\n", encoding="utf-8")
+
+        with patch("paas_charm.paas_config.yaml.safe_load", wraps=yaml.safe_load) as safe_load:
+            first_config = read_paas_config(tmp_path)
+            second_config = read_paas_config(tmp_path)
+
+        assert first_config is second_config
+        assert safe_load.call_count == 1
+
+    def test_changed_file_is_parsed_again(self, tmp_path):
+        """Test that a modified config file is parsed again."""
+        config_path = tmp_path / CONFIG_FILE_NAME
+        config_path.write_text("framework_logging_format: json\n", encoding="utf-8")
+        assert read_paas_config(tmp_path).framework_logging_format == LoggingFormat.JSON
+
+        config_path.write_text("framework_logging_format: none\n", encoding="utf-8")
+
+        assert read_paas_config(tmp_path).framework_logging_format == LoggingFormat.NONE
+
 
 class TestStaticConfig:
     """Tests for StaticConfig Pydantic model."""
@@ -0,0 +1,80 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Rolling restart unit tests."""
+
+import time
+import unittest.mock
+
+import ops
+import pytest
+
+from paas_charm.rolling_restart import parse_duration, ready_checks_succeeded_since
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        pytest.param(None, None, id="none"),
+        pytest.param("", None, id="empty"),
+        pytest.param("10s", 10.0, id="seconds"),
+        pytest.param("1m30s", 90.0, id="minutes and seconds"),
+        pytest.param("1.5h", 5400.0, id="fractional hours"),
+        pytest.param("500ms", 0.5, id="milliseconds"),
+        pytest.param("10", None, id="no unit"),
+        pytest.param("10s foo", None, id="trailing garbage"),
+    ],
+)
+def test_parse_duration(value, expected):
+    """
+    arrange: none.
+    act: parse the Pebble duration.
+    assert: the duration should be converted to seconds, or None if empty or invalid.
+    """
+    assert parse_duration(value) == expected
+
+
+def _container(checks: dict[str, tuple[ops.pebble.CheckStatus, int]], period: str | None):
+    """Build a container mock with readiness checks.
+
+    Args:
+        checks: The status and the number of failures of each check.
+        period: The period of the checks in the plan.
+
+    Returns:
+        The container mock.
+    """
+    container = unittest.mock.MagicMock(spec=ops.Container)
+    container.get_checks.return_value = {
+        name: unittest.mock.MagicMock(status=status, failures=failures)
+        for name, (status, failures) in checks.items()
+    }
+    container.get_plan.return_value = ops.pebble.Plan(
+        {"checks": {name: {"override": "replace", "period": period} for name in checks}}
+    )
+    return container
+
+
+@pytest.mark.parametrize(
+    "checks, period, elapsed, expected",
+    [
+        pytest.param({}, None, 60, None, id="no checks"),
+        pytest.param({"web": (ops.pebble.CheckStatus.UP, 0)}, None, 14, True, id="default"),
+        pytest.param(
+            {"web": (ops.pebble.CheckStatus.UP, 0)}, None, 5, False, id="default not run"
+        ),
+        pytest.param({"web": (ops.pebble.CheckStatus.UP, 0)}, "1s", 5, True, id="short period"),
+        pytest.param({"web": (ops.pebble.CheckStatus.UP, 1)}, "1s", 5, False, id="failures"),
+        pytest.param({"web": (ops.pebble.CheckStatus.DOWN, 3)}, "1s", 5, False, id="down"),
+    ],
+)
+def test_ready_checks_succeeded_since(checks, period, elapsed, expected):
+    """
+    arrange: prepare a container with readiness checks.
+    act: check if the readiness checks succeeded since a restart some seconds ago.
+    assert: the checks should have succeeded only if they are up without failures and ran
+        since the restart.
+    """
+    container = _container(checks, period)
+
+    assert ready_checks_succeeded_since(container, time.time() - elapsed) is expected
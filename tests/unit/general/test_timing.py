@@ -0,0 +1,102 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the timing module."""
+
+import json
+import logging
+import unittest.mock
+
+import ops
+import pytest
+
+from paas_charm import timing
+from paas_charm.timing import (
+    log_phase_summary,
+    pop_phase_summary,
+    set_tracing_destination,
+    timed_phase,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_phases():
+    """Start every test without timed phases."""
+    pop_phase_summary()
+
+
+def test_phase_summary():
+    """
+    arrange: time a phase twice as a context manager and once as a decorator.
+    act: get the phase summary.
+    assert: the summary should count each phase and be reset afterwards.
+    """
+
+    @timed_phase("decorated")
+    def decorated():
+        """Do nothing in a timed phase."""
+
+    for _ in range(2):
+        with timed_phase("context"):
+            pass
+    decorated()
+
+    summary = pop_phase_summary()
+
+    assert summary.keys() == {"context", "decorated"}
+    assert summary["context"]["count"] == 2
+    assert summary["decorated"]["count"] == 1
+    assert summary["context"]["total_ms"] >= 0
+    assert not pop_phase_summary()
+
+
+def test_phase_timed_on_error():
+    """
+    arrange: none.
+    act: raise an exception in a timed phase.
+    assert: the phase should be timed and the exception propagated.
+    """
+    with pytest.raises(ValueError):
+        with timed_phase("failing"):
+            raise ValueError()
+
+    assert pop_phase_summary()["failing"]["count"] == 1
+
+
+def test_log_phase_summary(caplog):
+    """
+    arrange: time a phase.
+    act: log the phase summary.
+    assert: the summary should be logged as JSON.
+    """
+    with timed_phase("phase"):
+        pass
+
+    with caplog.at_level(logging.INFO, logger=timing.__name__):
+        log_phase_summary()
+
+    message = caplog.records[-1].getMessage()
+    assert message.startswith("hook phases: ")
+    assert json.loads(message.removeprefix("hook phases: "))["phase"]["count"] == 1
+
+
+@pytest.mark.parametrize(
+    "endpoint, url",
+    [
+        pytest.param("http://tempo:4318", "http://tempo:4318/v1/traces", id="endpoint"),
+        pytest.param("http://tempo:4318/", "http://tempo:4318/v1/traces", id="trailing slash"),
+        pytest.param(None, None, id="no endpoint"),
+    ],
+)
+def test_set_tracing_destination(monkeypatch, endpoint, url):
+    """
+    arrange: provide an ops tracing module.
+    act: set the tracing destination.
+    assert: the OTLP HTTP traces URL should be set as ops tracing destination.
+    """
+    ops_tracing = unittest.mock.MagicMock()
+    monkeypatch.setattr(ops, "tracing", ops_tracing, raising=False)
+
+    set_tracing_destination(endpoint)
+
+    ops_tracing.set_destination.assert_called_once_with(url=url, ca=None)
@@ -0,0 +1,149 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit roles unit tests."""
+
+import pytest
+
+from paas_charm.exceptions import CharmConfigInvalidError
+from paas_charm.paas_config import ServiceRole
+from paas_charm.unit_roles import (
+    allocate_unit_roles,
+    assign_scheduler_shards,
+    parse_unit_roles,
+)
+
+WEB = ServiceRole.WEB
+WORKER = ServiceRole.WORKER
+SCHEDULER = ServiceRole.SCHEDULER
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        pytest.param("", {}, id="empty"),
+        pytest.param("worker=2", {WORKER: 2}, id="worker"),
+        pytest.param(" worker = 2 , scheduler=1,", {WORKER: 2, SCHEDULER: 1}, id="spaces"),
+    ],
+)
+def test_parse_unit_roles(value, expected):
+    """
+    arrange: none.
+    act: parse the value of the app-unit-roles option.
+    assert: the number of units of each dedicated role is returned.
+    """
+    assert parse_unit_roles(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        pytest.param("worker", id="no count"),
+        pytest.param("worker=two", id="invalid count"),
+        pytest.param("worker=-1", id="negative count"),
+        pytest.param("web=1", id="web role"),
+        pytest.param("cron=1", id="unknown role"),
+    ],
+)
+def test_parse_unit_roles_invalid(value):
+    """
+    arrange: none.
+    act: parse an invalid value of the app-unit-roles option.
+    assert: CharmConfigInvalidError is raised.
+    """
+    with pytest.raises(CharmConfigInvalidError):
+        parse_unit_roles(value)
+
+
+@pytest.mark.parametrize(
+    "unit_names, requested_units, current_allocation, leader_name, expected",
+    [
+        pytest.param(
+            ["app/0", "app/1", "app/2"],
+            {WORKER: 1, SCHEDULER: 1},
+            {},
+            "app/0",
+            {"app/0": WEB, "app/1": WORKER, "app/2": SCHEDULER},
+            id="new allocation",
+        ),
+        pytest.param(
+            ["app/0"],
+            {WORKER: 1},
+            {},
+            "app/0",
+            {"app/0": WEB},
+            id="one web unit kept",
+        ),
+        pytest.param(
+            ["app/0", "app/1", "app/2", "app/10"],
+            {WORKER: 2},
+            {"app/0": WEB, "app/1": WORKER, "app/2": WEB},
+            "app/0",
+            {"app/0": WEB, "app/1": WORKER, "app/2": WEB, "app/10": WORKER},
+            id="scale up",
+        ),
+        pytest.param(
+            ["app/0", "app/1", "app/2"],
+            {WORKER: 1},
+            {"app/0": WEB, "app/1": WORKER, "app/2": WORKER},
+            "app/0",
+            {"app/0": WEB, "app/1": WORKER, "app/2": WEB},
+            id="fewer workers",
+        ),
+        pytest.param(
+            ["app/0", "app/1", "app/2"],
+            {WORKER: 1},
+            {"app/0": WEB, "app/1": WEB, "app/2": WORKER},
+            "app/2",
+            {"app/0": WEB, "app/1": WORKER, "app/2": WEB},
+            id="worker leader",
+        ),
+        pytest.param(
+            ["app/0", "app/1"],
+            {WORKER: 1},
+            {},
+            "app/1",
+            {"app/0": WORKER, "app/1": WEB},
+            id="all other units dedicated",
+        ),
+    ],
+)
+def test_allocate_unit_roles(
+    unit_names, requested_units, current_allocation, leader_name, expected
+):
+    """
+    arrange: none.
+    act: allocate the roles to the units.
+    assert: the units keep their role if possible and the leader is a web unit.
+    """
+    assert (
+        allocate_unit_roles(unit_names, requested_units, current_allocation, leader_name)
+        == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "unit_names, current_shards, expected",
+    [
+        pytest.param(["app/3", "app/1"], {}, {"app/1": 0, "app/3": 1}, id="new assignment"),
+        pytest.param(
+            ["app/1", "app/3", "app/4"],
+            {"app/1": 0, "app/2": 1, "app/3": 2},
+            {"app/1": 0, "app/4": 1, "app/3": 2},
+            id="replaced unit",
+        ),
+        pytest.param(
+            ["app/1", "app/3"],
+            {"app/1": 0, "app/2": 1, "app/3": 2},
+            {"app/1": 0, "app/3": 1},
+            id="fewer shards",
+        ),
+    ],
+)
+def test_assign_scheduler_shards(unit_names, current_shards, expected):
+    """
+    arrange: none.
+    act: assign the shards to the scheduler units.
+    assert: the units keep their shard if it is still in range and the shards are contiguous.
+    """
+    assert assign_scheduler_shards(unit_names, current_shards) == expected